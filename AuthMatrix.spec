@@ -15,10 +15,28 @@ a = Analysis(
     binaries=[],
     datas=[
         ('UI', 'UI'),  # Include the entire UI package
+        ('core', 'core'),  # Include the headless engine package
         ('THIRD_PARTY_LICENSES.md', '.'),  # Include third-party licenses
         ('LICENSE-NOTICES.txt', '.'),  # Include license notices for distribution
     ],
     hiddenimports=[
+        'core',
+        'core.AccessAnalysis',
+        'core.AsyncRunner',
+        'core.EndpointIndex',
+        'core.Executor',
+        'core.ImportProgress',
+        'core.PostmanConvert',
+        'core.PostmanStream',
+        'core.RequestTemplates',
+        'core.ResultBatch',
+        'core.Sessions',
+        'core.SharedSpec',
+        'core.SpecCache',
+        'core.SpecDocument',
+        'core.SpecModel',
+        'core.Worker',
+        'core.WorkerPool',
         'UI',
         'UI.UI',
         'UI.components',
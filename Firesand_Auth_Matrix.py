@@ -1,13 +1,19 @@
-import json, sys, time, requests
+import json, sys
+# UI defers PySide6 until start_ui is called, and the HTTP engines are
+# imported where they are used, so headless runs only load the Qt-free core
 from UI import start_ui
+from core.PostmanConvert import collection_base_url, collection_endpoints, collection_to_spec
+from core.PostmanStream import convert_collection
+from core.SpecDocument import AUTHMATRIX_SHEBANG
 
 __version__ = "1.0.0"
 __author__ = "Firesands Auth Matrix Team"
 
-AUTHMATRIX_SHEBANG = "#!AUTHMATRIX"
-
 def show_help():
     """Show command line help"""
+    from core.Executor import DEFAULT_CONCURRENCY, DEFAULT_PER_HOST_LIMIT
+    from core.AsyncRunner import DEFAULT_ASYNC_CONCURRENCY, DEFAULT_ASYNC_PER_HOST_LIMIT
+
     print("Firesands Auth Matrix v" + __version__)
     print("A comprehensive tool for testing API authorization matrices")
     print()
@@ -17,6 +23,13 @@ def show_help():
     print("  python Firesand_Auth_Matrix.py --help          # Show this help")
     print("  python Firesand_Auth_Matrix.py --version       # Show version")
     print()
+    print("Run options:")
+    print("  --engine NAME      Execution engine: threads or asyncio (default: threads)")
+    print(f"  --concurrency N    Maximum requests in flight (default: {DEFAULT_CONCURRENCY}, asyncio: {DEFAULT_ASYNC_CONCURRENCY})")
+    print(f"  --per-host N       Maximum requests in flight per host (default: {DEFAULT_PER_HOST_LIMIT}, asyncio: {DEFAULT_ASYNC_PER_HOST_LIMIT})")
+    print("  --pool-size N      Keep-alive connections per role and host, per host for asyncio (default: same as --per-host)")
+    print("  --dedupe           Send identical GET/HEAD/OPTIONS requests of different roles only once")
+    print()
     print("Supported file formats:")
     print("  - AuthMatrix format (with #!AUTHMATRIX shebang)")
     print("  - Postman collection JSON")
@@ -31,7 +44,8 @@ def detect_file_type(file_path):
     """Detect if file is authmatrix format (has shebang) or postman format"""
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            first_line = f.readline().strip()
+            # Bounded, as minified collections are a single huge line
+            first_line = f.readline(len(AUTHMATRIX_SHEBANG) + 8).strip()
             return "authmatrix" if first_line == AUTHMATRIX_SHEBANG else "postman"
     except Exception:
         return "unknown"
@@ -40,6 +54,13 @@ def load_and_convert_spec(file_path):
     """Load spec and convert from postman to authmatrix format if needed"""
     file_type = detect_file_type(file_path)
     
+    if file_type == "postman":
+        # Stream the collection so request bodies and saved responses are
+        # skipped instead of loaded
+        with open(file_path, "rb") as f:
+            spec, _ = convert_collection(f)
+        return spec
+
     with open(file_path, "r", encoding="utf-8") as f:
         content = f.read()
     
@@ -48,10 +69,6 @@ def load_and_convert_spec(file_path):
         lines = content.splitlines()
         json_content = "\n".join(lines[1:]) if lines[0].strip() == AUTHMATRIX_SHEBANG else content
         return json.loads(json_content)
-    elif file_type == "postman":
-        # Convert postman collection to authmatrix format
-        postman_data = json.loads(content)
-        return convert_postman_to_authmatrix(postman_data)
     else:
         # Try to parse as JSON and guess format
         data = json.loads(content)
@@ -62,153 +79,41 @@ def load_and_convert_spec(file_path):
 
 def convert_postman_to_authmatrix(postman_data):
     """Convert a Postman collection to AuthMatrix format"""
-    authmatrix_spec = {
-        "base_url": extract_base_url_from_postman(postman_data),
-        "default_headers": {"Accept": "application/json"},
-        "roles": {
-            "guest": {"auth": {"type": "none"}}
-        },
-        "endpoints": []
-    }
-    
-    # Extract auth from collection level
-    if "auth" in postman_data:
-        auth_config = postman_data["auth"]
-        if auth_config.get("type") == "bearer":
-            bearer_info = next((item for item in auth_config.get("bearer", []) if item.get("key") == "token"), None)
-            if bearer_info:
-                authmatrix_spec["roles"]["admin"] = {
-                    "auth": {"type": "bearer", "token": bearer_info.get("value", "")}
-                }
-    
-    # Extract endpoints
-    authmatrix_spec["endpoints"] = extract_requests_from_postman(postman_data)
-    
-    return authmatrix_spec
+    return collection_to_spec(postman_data)
 
 def extract_base_url_from_postman(postman_data):
     """Extract base URL from postman collection"""
-    if "item" not in postman_data:
-        return ""
-    
-    # Try to find first request with a URL
-    for item in postman_data["item"]:
-        if "request" in item and "url" in item["request"]:
-            url_info = item["request"]["url"]
-            if isinstance(url_info, str):
-                # Simple string URL
-                try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url_info)
-                    return f"{parsed.scheme}://{parsed.netloc}"
-                except:
-                    pass
-            elif isinstance(url_info, dict) and "host" in url_info:
-                # Object format URL
-                host_parts = url_info.get("host", [])
-                if host_parts:
-                    protocol = url_info.get("protocol", "https")
-                    port = url_info.get("port", "")
-                    host = ".".join(host_parts)
-                    if port:
-                        return f"{protocol}://{host}:{port}"
-                    else:
-                        return f"{protocol}://{host}"
-        
-        # Check nested items
-        if "item" in item:
-            nested_result = extract_base_url_from_postman({"item": item["item"]})
-            if nested_result:
-                return nested_result
-    
-    return ""
+    return collection_base_url(postman_data)
 
 def extract_requests_from_postman(postman_data, path_prefix=""):
     """Extract requests from postman collection recursively"""
-    requests = []
-    
-    for item in postman_data.get("item", []):
-        if "request" in item:
-            # This is a request item
-            request = item["request"]
-            method = request.get("method", "GET")
-            
-            # Extract path from URL
-            url_info = request.get("url", {})
-            path = "/"
-            
-            if isinstance(url_info, str):
-                try:
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url_info)
-                    path = parsed.path or "/"
-                except:
-                    path = "/"
-            elif isinstance(url_info, dict):
-                path_parts = url_info.get("path", [])
-                if path_parts:
-                    path = "/" + "/".join(str(p) for p in path_parts)
-                else:
-                    path = "/"
-            
-            # Use item name or generate from path
-            name = item.get("name", f"{method} {path}")
-            
-            requests.append({
-                "name": name,
-                "method": method,
-                "path": path,
-                "expect": {}  # Will be configured by user later
-            })
-        
-        elif "item" in item:
-            # This is a folder with nested items
-            folder_name = item.get("name", "")
-            nested_prefix = f"{path_prefix}/{folder_name}" if folder_name else path_prefix
-            nested_requests = extract_requests_from_postman(item, nested_prefix)
-            requests.extend(nested_requests)
-    
-    return requests
-
-def run_spec(spec):
-    results = {}
-    for ep in spec["endpoints"]:
-        name = ep.get("name") or ep["path"]
-        results[name] = {}
-        for role, roleSpec in spec["roles"].items():
-            expect = ep.get("expect", {}).get(role)
-            if not expect:
-                results[name][role] = {"status": "SKIP"}
-                continue
-
-            # Build request
-            url = spec["base_url"].rstrip("/") + ep["path"]
-            headers = dict(spec.get("default_headers", {}))
-            auth = roleSpec.get("auth", {})
-            if auth.get("type") == "bearer":
-                headers["Authorization"] = f"Bearer {auth.get('token')}"
-
-            # Run request
-            start = time.time()
-            try:
-                r = requests.request(ep.get("method", "GET"), url, headers=headers)
-                latency = int((time.time() - start) * 1000)
-            except Exception as e:
-                results[name][role] = {"status": "FAIL", "error": str(e)}
-                continue
-
-            # Check
-            allowed = expect.get("status")
-            if isinstance(allowed, list):
-                ok = r.status_code in allowed
-            else:
-                ok = r.status_code == allowed
-
-            if not ok:
-                results[name][role] = {"status": "FAIL", "http": r.status_code}
-            else:
-                results[name][role] = {"status": "PASS", "http": r.status_code, "latency_ms": latency}
-    return results
+    return collection_endpoints(postman_data, path_prefix)
+
+ENGINES = ("threads", "asyncio")
+
+def run_spec(spec, concurrency=None, per_host_limit=None, engine="threads", pool_size=None, dedupe=False):
+    """Run every (endpoint, role) cell of the spec concurrently"""
+    if engine == "asyncio":
+        from core.AsyncRunner import run_spec_asyncio, DEFAULT_ASYNC_CONCURRENCY, DEFAULT_ASYNC_PER_HOST_LIMIT
+
+        return run_spec_asyncio(
+            spec,
+            concurrency=concurrency or DEFAULT_ASYNC_CONCURRENCY,
+            per_host_limit=per_host_limit or DEFAULT_ASYNC_PER_HOST_LIMIT,
+            dedupe=dedupe,
+            pool_size=pool_size,
+        )
+    if engine != "threads":
+        raise ValueError(f"Unknown engine '{engine}'")
+    from core.Executor import MatrixExecutor, DEFAULT_CONCURRENCY, DEFAULT_PER_HOST_LIMIT
+
+    executor = MatrixExecutor(
+        concurrency=concurrency or DEFAULT_CONCURRENCY,
+        per_host_limit=per_host_limit or DEFAULT_PER_HOST_LIMIT,
+        pool_size=pool_size,
+        dedupe=dedupe,
+    )
+    return executor.run(spec)
 
 def print_matrix(results):
     # preserve role order from first endpoint
@@ -235,13 +140,74 @@ def print_matrix(results):
             row += " " + cell
         print(row)
 
+def print_dedupe_summary(results):
+    """Report how many requests a dedupe run saved"""
+    from core.Executor import count_coalesced
+
+    checked = sum(1 for row in results.values() for res in row.values() if res["status"] != "SKIP")
+    saved = count_coalesced(results)
+    print()
+    print(f"Dedupe: sent {checked - saved} requests for {checked} checks ({saved} saved)")
+
+RUN_OPTIONS = {
+    "--concurrency": "concurrency",
+    "--per-host": "per_host_limit",
+    "--engine": "engine",
+    "--pool-size": "pool_size",
+}
+
+# Options that take no value
+RUN_FLAGS = {
+    "--dedupe": "dedupe",
+}
+
+def parse_run_options(argv):
+    """Split command line arguments into positional arguments and run options"""
+    positional = []
+    options = {}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        flag, _, value = arg.partition("=")
+        if arg in RUN_FLAGS:
+            options[RUN_FLAGS[arg]] = True
+        elif flag in RUN_OPTIONS:
+            if not value:
+                i += 1
+                if i >= len(argv):
+                    raise ValueError(f"Option {flag} requires a value")
+                value = argv[i]
+            if flag == "--engine":
+                if value not in ENGINES:
+                    raise ValueError(f"Option {flag} must be one of: {', '.join(ENGINES)}")
+                options[RUN_OPTIONS[flag]] = value
+            else:
+                try:
+                    number = int(value)
+                except ValueError:
+                    raise ValueError(f"Option {flag} expects a number, got '{value}'")
+                if number < 1:
+                    raise ValueError(f"Option {flag} must be at least 1")
+                options[RUN_OPTIONS[flag]] = number
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, options
+
 def main():
     """Main entry point for the application"""
-    if len(sys.argv) == 1:
+    try:
+        args, options = parse_run_options(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Use --help for usage information.")
+        sys.exit(1)
+
+    if len(args) == 0:
         # No arguments - launch GUI
         start_ui(runner=run_spec)
-    elif len(sys.argv) == 2:
-        arg = sys.argv[1]
+    elif len(args) == 1:
+        arg = args[0]
         if arg in ['--help', '-h']:
             show_help()
         elif arg in ['--version', '-v']:
@@ -250,8 +216,10 @@ def main():
             # Assume it's a spec file
             try:
                 spec = load_and_convert_spec(arg)
-                results = run_spec(spec)
+                results = run_spec(spec, **options)
                 print_matrix(results)
+                if options.get("dedupe"):
+                    print_dedupe_summary(results)
             except FileNotFoundError:
                 print(f"Error: File '{arg}' not found.")
                 sys.exit(1)
@@ -1,9 +1,8 @@
 from __future__ import annotations
-import json, sys, time, multiprocessing, pickle, os
+import io, json, sys, time, multiprocessing, pickle, os, queue, threading
 from functools import partial
 from typing import Dict, Any, Optional, Callable, List
 from functools import partial
-import requests
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from .views.SpecStore import SpecStore
@@ -12,62 +11,207 @@ from .views.Theme import primary, secondary, background, text, border, lines, bg
 from .views.ModernStyles import get_main_stylesheet, apply_animation_properties
 from .views.ModernStyles import get_main_stylesheet, apply_animation_properties
 from .components import LogoHeader, multiline_input, show_text, TabsComponent
+from core.AccessAnalysis import AccessAnalysis
+from core.EndpointIndex import EndpointIndex
+from core.ImportProgress import ImportCancelled, ImportProgress, ProgressReader
+from core.PostmanConvert import auth_config, read_requests
+from core.PostmanStream import PostmanCollectionStream
+from core.SpecModel import SpecModel
+from core.Executor import count_cells, split_cell_ranges
+from core.ResultBatch import result_keys, unpack_results
+from core.Worker import warm_up, worker_context
+from core.WorkerPool import WorkerPool
 
 
-def streaming_worker_function(spec, result_queue, error_queue, stop_event):
-    """Worker function that streams results as they complete."""
-    try:
-        for ep in spec["endpoints"]:
-            # Check if we should stop
-            if stop_event.is_set():
-                result_queue.put(("STOPPED", None, None, None))
-                return
+# Worker processes used for a GUI run; each one gets a contiguous slice of cells
+MAX_WORKER_PROCESSES = min(4, os.cpu_count() or 1)
+# Small matrices are not worth the start-up cost of another process
+MIN_CELLS_PER_WORKER = 64
 
-            name = ep.get("name") or ep["path"]
 
-            for role, roleSpec in spec["roles"].items():
-                # Check if we should stop
-                if stop_event.is_set():
-                    result_queue.put(("STOPPED", None, None, None))
-                    return
+def worker_process_count(total_cells: int) -> int:
+    """Number of streaming worker processes to start for a matrix"""
+    return max(1, min(MAX_WORKER_PROCESSES, total_cells // MIN_CELLS_PER_WORKER))
 
-                expect = ep.get("expect", {}).get(role)
-                if not expect:
-                    result_queue.put(("RESULT", name, role, {"status": "SKIP"}))
-                    continue
 
-                # Build request
-                url = spec["base_url"].rstrip("/") + ep["path"]
-                headers = dict(spec.get("default_headers", {}))
-                auth = roleSpec.get("auth", {})
-                if auth.get("type") == "bearer":
-                    headers["Authorization"] = f"Bearer {auth.get('token')}"
+class ResultBridge(QtCore.QObject):
+    """Delivers worker messages to the GUI thread as soon as they arrive.
 
-                # Run request
-                start = time.time()
-                try:
-                    r = requests.request(ep.get("method", "GET"), url, headers=headers, timeout=30)
-                    latency = int((time.time() - start) * 1000)
-                except Exception as e:
-                    result_queue.put(("RESULT", name, role, {"status": "FAIL", "error": str(e)}))
+    A background thread blocks on the result queue and re-emits every
+    message as a Qt signal, which Qt queues onto the GUI thread, so the
+    event loop only wakes up when there is something to show. While the
+    queue is quiet the thread checks the error queue and whether the worker
+    processes are still alive.
+
+    A worker that dies takes its unfinished slice with it, so a process
+    exiting with a non-zero exit code fails the run through ``workerFailed``
+    even while the other workers carry on.
+
+    With a ``job_id``, both queues carry ``(job_id, item)`` pairs, as the
+    shared queues of core.WorkerPool do, and items of other jobs are dropped.
+    """
+
+    messageReceived = QtCore.Signal(object)
+    workerFailed = QtCore.Signal(str)
+    workersExited = QtCore.Signal()
+
+    # How long a blocking read waits before checking worker health
+    IDLE_CHECK_INTERVAL = 0.5
+
+    def __init__(self, result_queue, error_queue, processes, parent=None, job_id=None):
+        super().__init__(parent)
+        self.result_queue = result_queue
+        self.error_queue = error_queue
+        self.processes = list(processes)
+        self.job_id = job_id
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._pump, name="result-bridge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop delivering messages and wait for the bridge thread to exit"""
+        self._stopping.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _pump(self):
+        next_check = time.monotonic() + self.IDLE_CHECK_INTERVAL
+        while not self._stopping.is_set():
+            try:
+                msg = self.result_queue.get(timeout=self.IDLE_CHECK_INTERVAL)
+            except queue.Empty:
+                pass
+            except (EOFError, OSError):
+                # The queue was closed underneath us during cleanup
+                return
+            else:
+                msg = self._own(msg)
+                if msg is not None:
+                    self.messageReceived.emit(msg)
+                # Busy queues are still checked now and then, or a crash
+                # would go unnoticed while other workers keep streaming
+                if time.monotonic() < next_check:
                     continue
+            next_check = time.monotonic() + self.IDLE_CHECK_INTERVAL
+            if not self._check_workers():
+                return
 
-                # Check
-                allowed = expect.get("status")
-                if isinstance(allowed, list):
-                    ok = r.status_code in allowed
-                else:
-                    ok = r.status_code == allowed
+    def _check_workers(self) -> bool:
+        """Report errors and exited workers; False once delivery should end"""
+        while not self.error_queue.empty():
+            error = self._own(self.error_queue.get())
+            if error is not None:
+                self.workerFailed.emit(error)
+                return False
+        for process in self.processes:
+            if process.exitcode:
+                self.workerFailed.emit(f"Worker process {process.pid} exited unexpectedly (exit code {process.exitcode})")
+                return False
+        if not any(process.is_alive() for process in self.processes) and self.result_queue.empty():
+            self.workersExited.emit()
+            return False
+        return True
+
+    def _own(self, item):
+        """The item if it belongs to this bridge's job, else None"""
+        if self.job_id is None:
+            return item
+        job_id, item = item
+        return item if job_id == self.job_id else None
+
+
+class BackgroundTask(QtCore.QObject):
+    """Runs ``fn(*args, progress)`` on a worker thread.
+
+    ``fn`` gets an ImportProgress to report through and to check for
+    cancellation. The outcome arrives on the GUI thread as ``succeeded``
+    (with the result), ``failed`` (with the exception) or ``cancelled``.
+    """
+
+    progressChanged = QtCore.Signal(int)  # percent
+    succeeded = QtCore.Signal(object)
+    failed = QtCore.Signal(object)
+    cancelled = QtCore.Signal()
+
+    # Emitted from the worker thread; queued to the slots below
+    _progressed = QtCore.Signal(int)
+    _finished = QtCore.Signal(str, object)
+
+    def __init__(self, fn: Callable, *args, parent=None):
+        super().__init__(parent)
+        self._fn = fn
+        self._args = args
+        self.progress = ImportProgress(self._progressed.emit)
+        self._thread: Optional[threading.Thread] = None
+        self._progressed.connect(self._on_progressed)
+        self._finished.connect(self._on_finished)
 
-                if not ok:
-                    result_queue.put(("RESULT", name, role, {"status": "FAIL", "http": r.status_code}))
-                else:
-                    result_queue.put(("RESULT", name, role, {"status": "PASS", "http": r.status_code, "latency_ms": latency}))
+    def start(self):
+        self._thread = threading.Thread(target=self._work, name="background-task", daemon=True)
+        self._thread.start()
 
-        # Signal completion
-        result_queue.put(("DONE", None, None, None))
-    except Exception as e:
-        error_queue.put(str(e))
+    def cancel(self):
+        self.progress.cancel()
+
+    def _work(self):
+        try:
+            result = self._fn(*self._args, self.progress)
+        except ImportCancelled:
+            self._finished.emit("cancelled", None)
+        except Exception as e:
+            self._finished.emit("failed", e)
+        else:
+            self._finished.emit("succeeded", result)
+
+    @QtCore.Slot(int)
+    def _on_progressed(self, percent: int):
+        self.progressChanged.emit(percent)
+
+    @QtCore.Slot(str, object)
+    def _on_finished(self, outcome: str, value):
+        if outcome == "succeeded":
+            self.succeeded.emit(value)
+        elif outcome == "failed":
+            self.failed.emit(value)
+        else:
+            self.cancelled.emit()
+
+    def run_with_progress(self, parent: QtWidgets.QWidget, label: str):
+        """Run the task behind a cancellable progress dialog and return its result.
+
+        The event loop keeps running meanwhile, so the window stays
+        responsive. Raises ImportCancelled if the user cancels, or the
+        task's own exception if it fails.
+        """
+        outcome = {}
+        loop = QtCore.QEventLoop()
+
+        def finish(key, value=None):
+            outcome[key] = value
+            loop.quit()
+
+        dialog = QtWidgets.QProgressDialog(label, "Cancel", 0, 100, parent)
+        dialog.setWindowModality(QtCore.Qt.WindowModal)
+        dialog.setMinimumDuration(300)  # quick imports never show it
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(self.cancel)
+        self.progressChanged.connect(dialog.setValue)
+        self.succeeded.connect(lambda result: finish("result", result))
+        self.failed.connect(lambda error: finish("error", error))
+        self.cancelled.connect(lambda: finish("error", ImportCancelled()))
+
+        self.start()
+        loop.exec()
+        dialog.close()
+        dialog.deleteLater()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
 
 
 def worker_process_function(runner_func, spec, result_queue, error_queue):
@@ -112,14 +256,23 @@ class MainWindow(QtWidgets.QMainWindow):
         self.results: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None
 
         # Multiprocessing attributes for streaming
-        self.process: Optional[multiprocessing.Process] = None
-        self.result_queue: Optional[multiprocessing.Queue] = None
-        self.error_queue: Optional[multiprocessing.Queue] = None
-        self.stop_event: Optional[multiprocessing.Event] = None
-        self.poll_timer: Optional[QtCore.QTimer] = None
+        self.worker_context = worker_context()
+        self.worker_pool: Optional[WorkerPool] = None  # started by the first run
+        self.job_id: Optional[int] = None  # pool job of the current run
+        self.spec_model: Optional[SpecModel] = None  # what workers run; reset on edits
+        self.workers_pending = 0
+        self.stop_requested = False
+        self.result_bridge: Optional[ResultBridge] = None
+
+        # Start-up timing of the current run, in seconds
+        self.run_started = 0.0
+        self.worker_startup: Optional[float] = None  # slowest READY report
+        self.first_result_after: Optional[float] = None
 
         # Track streaming results
         self.streaming_results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # (endpoint names, roles) used to decode batched results
+        self.result_keys: tuple = ([], [])
 
         # Apply modern stylesheet
         self.setStyleSheet(get_main_stylesheet())
@@ -196,7 +349,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.header.stopRequested.connect(self._stop_run)
 
         # Connect to spec changes to update UI
-        self.store.specChanged.connect(self._on_spec_changed)
+        self.store.baseUrlChanged.connect(self._on_spec_changed)
+        self.store.specReset.connect(self._on_spec_changed)
+        self.store.specChanged.connect(self._on_spec_edited)
 
         # Initialize UI with current spec values
         self._on_spec_changed()
@@ -209,6 +364,10 @@ class MainWindow(QtWidgets.QMainWindow):
         # Install event filter for responsive behavior
         self.installEventFilter(self)
 
+        # Start the worker fork server once the window is up, so the first
+        # run does not wait for it
+        QtCore.QTimer.singleShot(0, partial(warm_up, self.worker_context))
+
     def eventFilter(self, obj, event):
         """Event filter for handling responsive UI behavior."""
         if obj == self and event.type() == QtCore.QEvent.Resize:
@@ -310,6 +469,10 @@ class MainWindow(QtWidgets.QMainWindow):
             self.baseUrlEdit.setText(base_url)
             self.baseUrlEdit.textChanged.connect(self.store.set_base_url)
 
+    def _on_spec_edited(self):
+        """Drop the worker copy of the spec; the next run rebuilds it"""
+        self.spec_model = None
+
     # Theme application (apply static colors from Theme.py)
     def _apply_theme(self, color: QtGui.QColor):
         self.themeColor = color
@@ -391,92 +554,112 @@ class MainWindow(QtWidgets.QMainWindow):
             for role in self.store.spec.get("roles", {}).keys():
                 self.streaming_results[name][role] = {"status": "⏳"}  # Pending
 
+        self.result_keys = result_keys(self.store.spec)
+
         # Initialize results table with empty/pending state
         self.resultsView.render(self.streaming_results)
 
         # Switch to Results tab
         self.tabs.setCurrentIndex(3)  # Results tab is typically index 3
 
-        # Create multiprocessing resources
-        self.result_queue = multiprocessing.Queue()
-        self.error_queue = multiprocessing.Queue()
-        self.stop_event = multiprocessing.Event()
-
-        # Create and start worker process
-        self.process = multiprocessing.Process(
-            target=streaming_worker_function,
-            args=(self.store.spec, self.result_queue, self.error_queue, self.stop_event),
+        # Workers and their connections are kept between runs
+        if self.worker_pool is None:
+            self.worker_pool = WorkerPool(MAX_WORKER_PROCESSES, self.worker_context)
+
+        # Workers get the compact read-only model: it pickles much smaller
+        # than the nested dicts and shares identical expectations. It is
+        # kept until the spec changes, so the pool can reuse its shared copy
+        if self.spec_model is None:
+            self.spec_model = SpecModel.from_dict(self.store.spec)
+        spec = self.spec_model
+
+        # Submit the run as one job, one contiguous slice of cells per worker
+        total_cells = count_cells(spec)
+        cell_ranges = split_cell_ranges(total_cells, worker_process_count(total_cells)) or [None]
+        self.workers_pending = len(cell_ranges)
+        self.stop_requested = False
+        self.run_started = time.perf_counter()
+        self.worker_startup = None
+        self.first_result_after = None
+        pool = self.worker_pool
+        self.job_id = pool.submit(spec, cell_ranges)
+
+        # Push results to the GUI thread as they arrive
+        self.result_bridge = ResultBridge(
+            pool.result_queue, pool.error_queue, pool.processes, self, job_id=self.job_id
         )
-        self.process.start()
-
-        # Set up timer to poll for streaming results
-        self.poll_timer = QtCore.QTimer()
-        self.poll_timer.timeout.connect(self._poll_streaming_results)
-        self.poll_timer.start(100)  # Poll every 100ms
+        self.result_bridge.messageReceived.connect(self._on_streaming_message)
+        self.result_bridge.workerFailed.connect(self._on_streaming_failed)
+        self.result_bridge.workersExited.connect(self._on_streaming_exited)
+        self.result_bridge.start()
 
     def _stop_run(self):
         """Stop the currently running tests"""
-        if self.stop_event:
-            self.stop_event.set()
+        if self.job_id is not None:
+            self.worker_pool.cancel(self.job_id)
         self.statusBar().showMessage("Stopping tests...", 2000)
 
-    def _poll_streaming_results(self):
-        """Poll for streaming results from the worker process"""
-        if not self.process:
+    def _on_streaming_message(self, msg):
+        """Apply one message delivered by the result bridge"""
+        if self.result_bridge is None or self.sender() is not self.result_bridge:
+            # Late delivery from a run that has already been cleaned up
             return
 
-        # Process all available results in the queue
-        while not self.result_queue.empty():
-            try:
-                msg_type, endpoint_name, role, result = self.result_queue.get_nowait()
-
-                if msg_type == "RESULT":
-                    # Update the specific result
-                    if endpoint_name in self.streaming_results:
-                        self.streaming_results[endpoint_name][role] = result
-                        self.resultsView.update_result(endpoint_name, role, result)
+        msg_type, endpoint_name, role, result = msg
 
-                elif msg_type == "DONE":
-                    # All tests completed
-                    self._on_streaming_finished()
-                    return
+        if msg_type == "READY":
+            # result is how long the worker took to start, in seconds
+            if result is not None:
+                self.worker_startup = max(self.worker_startup or 0.0, result)
+            return
 
-                elif msg_type == "STOPPED":
-                    # Tests were stopped
+        if self.first_result_after is None and msg_type in ("BATCH", "RESULT"):
+            self.first_result_after = time.perf_counter() - self.run_started
+
+        if msg_type == "BATCH":
+            # Apply a whole batch of results in one table update pass
+            updates = unpack_results(result, *self.result_keys)
+            for name, role_name, cell in updates:
+                self.streaming_results[name][role_name] = cell
+            self.resultsView.update_results(updates)
+
+        elif msg_type == "RESULT":
+            # Update the specific result
+            if endpoint_name in self.streaming_results:
+                self.streaming_results[endpoint_name][role] = result
+                self.resultsView.update_result(endpoint_name, role, result)
+
+        elif msg_type in ("DONE", "STOPPED"):
+            # One worker finished its slice; the run ends with the last one
+            self.stop_requested |= msg_type == "STOPPED"
+            self.workers_pending -= 1
+            if self.workers_pending <= 0:
+                if self.stop_requested:
                     self._on_streaming_stopped()
-                    return
-
-            except Exception as e:
-                print(f"Error processing result: {e}")
-                continue
+                else:
+                    self._on_streaming_finished()
 
-        # Check for errors
-        if not self.error_queue.empty():
-            error_msg = self.error_queue.get()
-            self._on_streaming_failed(error_msg)
+    def _on_streaming_exited(self):
+        """Handle worker processes exiting without reporting DONE or STOPPED"""
+        if self.result_bridge is None or self.sender() is not self.result_bridge:
             return
-
-        # Check if process has died unexpectedly
-        if not self.process.is_alive():
-            # Process finished, but we didn't get DONE or STOPPED message
-            # Process remaining messages in queue
-            while not self.result_queue.empty():
-                try:
-                    msg_type, endpoint_name, role, result = self.result_queue.get_nowait()
-                    if msg_type == "RESULT" and endpoint_name in self.streaming_results:
-                        self.streaming_results[endpoint_name][role] = result
-                        self.resultsView.update_result(endpoint_name, role, result)
-                except:
-                    break
-
-            self._on_streaming_finished()
+        self._on_streaming_finished()
 
     def _on_streaming_finished(self):
         """Handle completion of streaming tests"""
         self._cleanup_streaming()
         self.header.set_running_state(False)
         self.results = self.streaming_results
-        self.statusBar().showMessage("Tests completed", 3000)
+        self.statusBar().showMessage(f"Tests completed{self._run_timing_text()}", 3000)
+
+    def _run_timing_text(self) -> str:
+        """Worker start-up and first-result latency of the last run"""
+        timings = []
+        if self.worker_startup is not None:
+            timings.append(f"workers started in {self.worker_startup * 1000:.0f} ms")
+        if self.first_result_after is not None:
+            timings.append(f"first result after {self.first_result_after * 1000:.0f} ms")
+        return f" ({', '.join(timings)})" if timings else ""
 
     def _on_streaming_stopped(self):
         """Handle user-requested stop"""
@@ -486,37 +669,43 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_streaming_failed(self, msg: str):
         """Handle streaming test failure"""
+        sender = self.sender()
+        if isinstance(sender, ResultBridge) and sender is not self.result_bridge:
+            return
         self._cleanup_streaming()
+        if self.worker_pool is not None and not all(process.is_alive() for process in self.worker_pool.processes):
+            # A killed worker can leave the shared queues locked; start afresh next run
+            self.worker_pool.close()
+            self.worker_pool = None
         self.header.set_running_state(False)
         QtWidgets.QMessageBox.critical(self, "Test Failed", msg)
         self.statusBar().clearMessage()
 
     def _cleanup_streaming(self):
         """Clean up streaming resources"""
-        if self.poll_timer:
-            self.poll_timer.stop()
-            self.poll_timer = None
+        if self.result_bridge:
+            self.result_bridge.stop()
+            self.result_bridge = None
 
-        if self.process and self.process.is_alive():
-            self.process.join(timeout=1.0)
-            if self.process.is_alive():
-                self.process.terminate()
-                self.process.join()
+        # Cells the run never reached stop spinning, and stop ticking the clock
+        self.resultsView.stop_pending()
 
-        self.process = None
-        self.result_queue = None
-        self.error_queue = None
-        self.stop_event = None
+        # The pool stays up for the next run; only this run's job is stopped
+        if self.job_id is not None:
+            self.worker_pool.cancel(self.job_id)
+            self.job_id = None
+        self.workers_pending = 0
 
     def closeEvent(self, event):
         """Clean up multiprocessing resources when window is closed."""
         # Stop any running tests
-        if self.stop_event:
-            self.stop_event.set()
-
-        # Clean up streaming resources
         self._cleanup_streaming()
 
+        # Shut the worker pool down
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+            self.worker_pool = None
+
         # Reset header button state
         if hasattr(self, 'header'):
             self.header.set_running_state(False)
@@ -725,6 +914,7 @@ class PostmanConfigDialog(QtWidgets.QDialog):
         admin_patterns = ["/admin"]
         user_patterns = ["/user", "/profile", "/settings"]
 
+        expectations = []
         for i, endpoint in enumerate(self.store.spec.get("endpoints", [])):
             path = endpoint.get("path", "").lower()
 
@@ -748,7 +938,9 @@ class PostmanConfigDialog(QtWidgets.QDialog):
                     # Default - 200 for admin, 403 for others
                     status = 200 if role_name == "admin" else 403
 
-                self.store.set_endpoint_expectation(i, role_name, status=status)
+                expectations.append((i, role_name, {"status": status}))
+
+        self.store.set_expectations(expectations)
 
 
 class AddRoleDialog(QtWidgets.QDialog):
@@ -1184,6 +1376,7 @@ class ImportDialog(QtWidgets.QDialog):
 
         # Store for multi-collection import
         self.imported_collections = {}
+        self.access_analysis = AccessAnalysis()
         
         # Size and center the dialog
         self._size_dialog_to_parent(0.7, 0.7)
@@ -1320,6 +1513,10 @@ class ImportDialog(QtWidgets.QDialog):
         add_text_btn.clicked.connect(self._add_collection_text)
         btn_layout.addWidget(add_text_btn)
 
+        remove_btn = QtWidgets.QPushButton("Remove Selected")
+        remove_btn.clicked.connect(self._remove_selected_collection)
+        btn_layout.addWidget(remove_btn)
+
         clear_btn = QtWidgets.QPushButton("Clear All")
         clear_btn.clicked.connect(self._clear_collections)
         btn_layout.addWidget(clear_btn)
@@ -1331,15 +1528,13 @@ class ImportDialog(QtWidgets.QDialog):
         self.collections_list = QtWidgets.QListWidget()
         collections_layout.addWidget(self.collections_list)
 
-        # Analysis preview
-        self.analysis_text = QtWidgets.QTextEdit()
-        self.analysis_text.setReadOnly(True)
-        self.analysis_text.setMaximumHeight(100)
-        self.analysis_text.setPlaceholderText(
-            "Authorization pattern analysis will appear here..."
-        )
+        # Analysis preview; endpoint paths are only listed when a pattern is expanded
+        self.analysis_tree = QtWidgets.QTreeWidget()
+        self.analysis_tree.setHeaderHidden(True)
+        self.analysis_tree.setMinimumHeight(160)
+        self.analysis_tree.itemExpanded.connect(self._expand_analysis_item)
         collections_layout.addWidget(QtWidgets.QLabel("Authorization Pattern Preview:"))
-        collections_layout.addWidget(self.analysis_text)
+        collections_layout.addWidget(self.analysis_tree)
 
         layout.addWidget(collections_group)
 
@@ -1355,17 +1550,29 @@ class ImportDialog(QtWidgets.QDialog):
             return
 
         try:
-            import json
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                collection_data = json.load(f)
-
-            self._process_collection_data(collection_data, file_path)
-
+            collection = self._run_task(
+                "Reading collection...", self._read_collection_file, file_path
+            )
+        except ImportCancelled:
+            return
         except Exception as e:
             QtWidgets.QMessageBox.critical(
                 self, "Import Error", f"Failed to load collection file:\n{str(e)}"
             )
+            return
+
+        self._process_collection(collection, file_path)
+
+    def _run_task(self, label, fn, *args):
+        """Run fn(*args, progress) on a worker thread behind a progress dialog"""
+        return BackgroundTask(fn, *args, parent=self).run_with_progress(self, label)
+
+    def _read_collection_file(self, file_path, progress=None):
+        """Parse a collection file; runs on a worker thread"""
+        # Streamed, so only the parts of each request we use are kept
+        with open(file_path, "rb") as f:
+            stream = ProgressReader(f, progress) if progress is not None else f
+            return self._parse_postman_collection(stream)
 
     def _add_collection_text(self):
         """Add a collection from pasted text"""
@@ -1376,10 +1583,8 @@ class ImportDialog(QtWidgets.QDialog):
             return
 
         try:
-            import json
-
-            collection_data = json.loads(text)
-            self._process_collection_data(collection_data, "pasted_content")
+            collection = self._parse_postman_collection(io.StringIO(text))
+            self._process_collection(collection, "pasted_content")
 
         except json.JSONDecodeError as e:
             QtWidgets.QMessageBox.critical(
@@ -1390,17 +1595,11 @@ class ImportDialog(QtWidgets.QDialog):
                 self, "Import Error", f"Failed to process collection:\n{str(e)}"
             )
 
-    def _process_collection_data(self, collection_data, source_path):
-        """Process and add a collection to the import list"""
-        # Extract collection info
-        collection_name = collection_data.get("info", {}).get(
-            "name", "Unknown Collection"
-        )
-
-        # Parse collection first to get auth config
-        endpoints, auth_config = self._parse_postman_collection(collection_data)
+    def _process_collection(self, collection, source_path):
+        """Add a parsed collection to the import list"""
+        collection_name = collection["collection_name"]
 
-        if not endpoints:
+        if not collection["endpoints"]:
             QtWidgets.QMessageBox.warning(
                 self,
                 "No Endpoints Found",
@@ -1410,7 +1609,10 @@ class ImportDialog(QtWidgets.QDialog):
 
         # Let user specify the role name and modify auth config
         dialog = RoleAuthConfigDialog(
-            self, collection_name, self._suggest_role_name(collection_name), auth_config
+            self,
+            collection_name,
+            self._suggest_role_name(collection_name),
+            collection["auth_config"],
         )
 
         if dialog.exec() != QtWidgets.QDialog.Accepted:
@@ -1420,12 +1622,13 @@ class ImportDialog(QtWidgets.QDialog):
 
         # Store collection data
         self.imported_collections[role_name] = {
-            "collection_name": collection_name,
+            **collection,
             "source_path": source_path,
-            "endpoints": endpoints,
             "auth_config": updated_auth_config,
-            "collection_data": collection_data,
         }
+        self.access_analysis.add_collection(
+            role_name, collection["endpoints"], updated_auth_config.get("type", "none")
+        )
 
         # Update UI
         self._update_collections_display()
@@ -1446,97 +1649,26 @@ class ImportDialog(QtWidgets.QDialog):
             words = collection_name.split()
             return words[0].lower() if words else "role"
 
-    def _parse_postman_collection(self, collection_data):
-        """Parse Postman collection to extract endpoints and auth config"""
-        endpoints = []
-        auth_config = {}
+    def _parse_postman_collection(self, stream):
+        """Read a Postman collection's name, base URL, endpoints and auth config"""
+        collection = PostmanCollectionStream(stream)
+        base_url, endpoints = read_requests(collection.requests())
 
         # Extract auth from collection level
-        collection_auth = collection_data.get("auth", {})
-        if collection_auth:
-            auth_config = self._extract_auth_config(collection_auth)
-
-        # Recursively extract requests
-        def extract_requests(items, folder_path=""):
-            for item in items:
-                if "request" in item:
-                    # This is a request
-                    request = item["request"]
-                    method = request.get("method", "GET")
-
-                    # Extract URL path
-                    url_data = request.get("url", {})
-                    path = "/"
-
-                    if isinstance(url_data, str):
-                        path = self._extract_path_from_url(url_data)
-                    elif isinstance(url_data, dict):
-                        if "path" in url_data:
-                            path_segments = url_data["path"]
-                            if isinstance(path_segments, list):
-                                path = "/" + "/".join(
-                                    str(seg) for seg in path_segments if seg
-                                )
-                        elif "raw" in url_data:
-                            path = self._extract_path_from_url(url_data["raw"])
-
-                    # Ensure path starts with /
-                    if not path.startswith("/"):
-                        path = "/" + path
-
-                    endpoints.append(
-                        {
-                            "name": item.get("name", f"{method} {path}"),
-                            "method": method,
-                            "path": path,
-                            "folder": folder_path,
-                        }
-                    )
-
-                elif "item" in item:
-                    # This is a folder
-                    folder_name = item.get("name", "")
-                    new_folder_path = (
-                        f"{folder_path}/{folder_name}" if folder_path else folder_name
-                    )
-                    extract_requests(item["item"], new_folder_path)
-
-        # Extract from collection items
-        if "item" in collection_data:
-            extract_requests(collection_data["item"])
-
-        return endpoints, auth_config
+        role_auth = {}
+        if collection.auth:
+            role_auth = self._extract_auth_config(collection.auth)
 
-    def _extract_path_from_url(self, url_string):
-        """Extract path from a URL string"""
-        try:
-            from urllib.parse import urlparse
-
-            parsed = urlparse(url_string)
-            path = parsed.path or "/"
-            # Remove query parameters
-            if "?" in path:
-                path = path.split("?")[0]
-            return path
-        except:
-            return "/"
+        return {
+            "collection_name": collection.info.get("name", "Unknown Collection"),
+            "base_url": base_url,
+            "endpoints": endpoints,
+            "auth_config": role_auth,
+        }
 
     def _extract_auth_config(self, auth_data):
         """Extract authentication configuration from Postman auth"""
-        auth_config = {"type": "none"}
-
-        auth_type = auth_data.get("type", "")
-
-        if auth_type == "bearer":
-            bearer_data = auth_data.get("bearer", [])
-            token = ""
-            for item in bearer_data:
-                if item.get("key") == "token":
-                    token = item.get("value", "")
-                    break
-            auth_config = {"type": "bearer", "token": token}
-
-        return auth_config
+        return auth_config(auth_data)
 
     def _update_collections_display(self):
         """Update collections list and analysis"""
@@ -1548,80 +1680,83 @@ class ImportDialog(QtWidgets.QDialog):
             auth_type = data["auth_config"].get("type", "none")
 
             item_text = f"{role_name}: {collection_name} ({endpoint_count} endpoints, auth: {auth_type})"
-            self.collections_list.addItem(item_text)
+            item = QtWidgets.QListWidgetItem(item_text)
+            item.setData(QtCore.Qt.UserRole, role_name)
+            self.collections_list.addItem(item)
 
         # Update analysis
         self._update_analysis()
 
     def _update_analysis(self):
-        """Update the authorization pattern analysis"""
-        if not self.imported_collections:
-            self.analysis_text.clear()
+        """Show the authorization pattern summary from the incremental analysis"""
+        tree = self.analysis_tree
+        expanded = set()
+        for i in range(tree.topLevelItemCount()):
+            section = tree.topLevelItem(i)
+            for j in range(section.childCount()):
+                child = section.child(j)
+                if child.isExpanded():
+                    expanded.add(child.data(0, QtCore.Qt.UserRole))
+        tree.clear()
+
+        analysis = self.access_analysis
+        if not analysis.roles():
             return
 
-        # Analyze endpoint access patterns
-        endpoint_access = {}  # {endpoint_path: set(roles)}
-
-        for role_name, data in self.imported_collections.items():
-            for endpoint in data["endpoints"]:
-                path = endpoint["path"]
-                if path not in endpoint_access:
-                    endpoint_access[path] = set()
-                endpoint_access[path].add(role_name)
-
-        # Generate analysis text
-        analysis_lines = []
-        analysis_lines.append("=== AUTHORIZATION PATTERN ANALYSIS ===\n")
-
-        # Show role summary
-        analysis_lines.append("Roles found:")
-        for role_name, data in self.imported_collections.items():
-            endpoint_count = len(data["endpoints"])
-            auth_type = data["auth_config"].get("type", "none")
-            analysis_lines.append(
-                f"  • {role_name}: {endpoint_count} endpoints (auth: {auth_type})"
+        roles_item = QtWidgets.QTreeWidgetItem(tree, ["Roles found:"])
+        for role_name, endpoint_count, auth_type in analysis.roles():
+            QtWidgets.QTreeWidgetItem(
+                roles_item, [f"{role_name}: {endpoint_count} endpoints (auth: {auth_type})"]
             )
+        roles_item.setExpanded(True)
 
-        analysis_lines.append("")
-
-        # Show access patterns
-        analysis_lines.append("Access patterns that will be configured:")
-
-        # Group by access pattern
-        access_patterns = {}  # {frozenset(roles): [endpoints]}
-        for endpoint, roles in endpoint_access.items():
-            role_key = frozenset(roles)
-            if role_key not in access_patterns:
-                access_patterns[role_key] = []
-            access_patterns[role_key].append(endpoint)
-
-        for roles, endpoints in access_patterns.items():
-            roles_list = sorted(list(roles))
-            analysis_lines.append(f"  • Accessible to {', '.join(roles_list)}:")
-            for endpoint in sorted(endpoints):
-                analysis_lines.append(f"    - {endpoint}")
+        patterns_item = QtWidgets.QTreeWidgetItem(
+            tree, [f"Access patterns that will be configured ({len(analysis)} endpoints):"]
+        )
+        for roles, path_count in analysis.patterns():
+            item = QtWidgets.QTreeWidgetItem(
+                patterns_item,
+                [f"Accessible to {', '.join(roles)} ({path_count} endpoints)"],
+            )
+            item.setData(0, QtCore.Qt.UserRole, roles)
+            item.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+            if roles in expanded:
+                item.setExpanded(True)
+        patterns_item.setExpanded(True)
 
         # Show what will happen with guest role
-        analysis_lines.append("")
-        analysis_lines.append("Additional configuration:")
-        analysis_lines.append(
-            "  • 'guest' role will be added for unauthorized access testing"
-        )
-        analysis_lines.append(
-            "  • All endpoints will return 403 for guest role by default"
-        )
-        analysis_lines.append(
-            "  • Roles with bearer tokens will get 200 for their endpoints"
-        )
-        analysis_lines.append(
-            "  • Roles without bearer tokens will get 403 for restricted endpoints"
+        config_item = QtWidgets.QTreeWidgetItem(tree, ["Additional configuration:"])
+        for note in (
+            "'guest' role will be added for unauthorized access testing",
+            "All endpoints will return 403 for guest role by default",
+            "Roles with bearer tokens will get 200 for their endpoints",
+            "Roles without bearer tokens will get 403 for restricted endpoints",
+        ):
+            QtWidgets.QTreeWidgetItem(config_item, [note])
+
+    def _expand_analysis_item(self, item):
+        """List an access pattern's endpoint paths the first time it is expanded"""
+        roles = item.data(0, QtCore.Qt.UserRole)
+        if roles is None or item.childCount():
+            return
+        item.addChildren(
+            [QtWidgets.QTreeWidgetItem([path]) for path in self.access_analysis.paths(roles)]
         )
 
-        self.analysis_text.setPlainText("\n".join(analysis_lines))
+    def _remove_selected_collection(self):
+        """Remove the selected collection from the import list"""
+        item = self.collections_list.currentItem()
+        if item is None:
+            return
+        role_name = item.data(QtCore.Qt.UserRole)
+        self.imported_collections.pop(role_name, None)
+        self.access_analysis.remove_collection(role_name)
+        self._update_collections_display()
 
     def _clear_collections(self):
         """Clear all imported collections"""
         self.imported_collections.clear()
+        self.access_analysis.clear()
         self._update_collections_display()
 
     def _import_authmatrix_from_file(self):
@@ -1636,21 +1771,26 @@ class ImportDialog(QtWidgets.QDialog):
         if not file_path:
             return
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            if self.store.load_spec_from_content(content):
-                self.accept()
-            else:
-                QtWidgets.QMessageBox.critical(
-                    self, "Import Error", "Invalid AuthMatrix format"
-                )
+        if self._load_spec_file(file_path, "Invalid AuthMatrix format"):
+            self.accept()
 
+    def _load_spec_file(self, file_path, error_message):
+        """Read a spec file in the background, then load it into the store"""
+        try:
+            is_collection, spec = self._run_task(
+                "Loading specification...", self.store.read_spec_file, file_path
+            )
+        except ImportCancelled:
+            return False
         except Exception as e:
             QtWidgets.QMessageBox.critical(
-                self, "Import Error", f"Failed to load file:\n{str(e)}"
+                self, "Import Error", f"{error_message}:\n{str(e)}"
             )
+            return False
+
+        # Handed over in one step on the GUI thread
+        self.store.load_spec(spec, postman_path=file_path if is_collection else None)
+        return True
 
     def _import_single_postman_from_file(self):
         """Import single Postman collection from file browser"""
@@ -1664,33 +1804,20 @@ class ImportDialog(QtWidgets.QDialog):
         if not file_path:
             return
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            if self.store.load_spec_from_content(content):
-                # Show configuration dialog for single import
-                if (
-                    self.store._original_postman_data
-                    and not self._has_configured_expectations()
-                ):
-                    dialog = PostmanConfigDialog(self.store, self)
-                    if dialog.exec() == QtWidgets.QDialog.Accepted:
-                        self.accept()
-                    else:
-                        # User cancelled configuration but import was successful
-                        self.accept()
+        if self._load_spec_file(file_path, "Invalid Postman collection format"):
+            # Show configuration dialog for single import
+            if (
+                self.store.has_postman_source()
+                and not self._has_configured_expectations()
+            ):
+                dialog = PostmanConfigDialog(self.store, self)
+                if dialog.exec() == QtWidgets.QDialog.Accepted:
+                    self.accept()
                 else:
+                    # User cancelled configuration but import was successful
                     self.accept()
             else:
-                QtWidgets.QMessageBox.critical(
-                    self, "Import Error", "Invalid Postman collection format"
-                )
-
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(
-                self, "Import Error", f"Failed to load file:\n{str(e)}"
-            )
+                self.accept()
 
     def _handle_import(self):
         """Handle the import based on selected type"""
@@ -1729,7 +1856,7 @@ class ImportDialog(QtWidgets.QDialog):
         if self.store.load_spec_from_content(content):
             # Show configuration dialog for single import
             if (
-                self.store._original_postman_data
+                self.store.has_postman_source()
                 and not self._has_configured_expectations()
             ):
                 dialog = PostmanConfigDialog(self.store, self)
@@ -1756,21 +1883,29 @@ class ImportDialog(QtWidgets.QDialog):
             return
 
         # Merge all collections into a single AuthMatrix spec
-        merged_spec = self._merge_collections_to_authmatrix()
-
-        # Load the merged spec
-        import json
-
-        spec_json = json.dumps(merged_spec)
-        if self.store.load_spec_from_content(spec_json):
-            self.accept()
-        else:
+        try:
+            merged_spec = self._run_task(
+                "Merging collections...",
+                self._merge_collections_to_authmatrix,
+                dict(self.imported_collections),
+            )
+        except ImportCancelled:
+            return
+        except Exception as e:
             QtWidgets.QMessageBox.critical(
-                self, "Import Error", "Failed to process merged collections"
+                self, "Import Error", f"Failed to merge collections:\n{str(e)}"
             )
+            return
+
+        # Load the merged spec as one reset, without a JSON round-trip
+        self.store.load_spec(merged_spec)
+        self.accept()
 
-    def _merge_collections_to_authmatrix(self):
+    def _merge_collections_to_authmatrix(self, collections=None, progress=None):
         """Merge multiple collections into a single AuthMatrix specification"""
+        if collections is None:
+            collections = self.imported_collections
+
         # Start with base spec
         merged_spec = {
             "base_url": "",
@@ -1779,59 +1914,54 @@ class ImportDialog(QtWidgets.QDialog):
             "endpoints": [],
         }
 
-        # Extract base URL from first collection
-        if self.imported_collections:
-            first_collection = next(iter(self.imported_collections.values()))
-            merged_spec["base_url"] = self._extract_base_url_from_collection(
-                first_collection["collection_data"]
-            )
+        # Base URL from first collection
+        if collections:
+            first_collection = next(iter(collections.values()))
+            merged_spec["base_url"] = first_collection["base_url"]
 
         # Add roles from collections
-        for role_name, data in self.imported_collections.items():
+        for role_name, data in collections.items():
             auth_config = data["auth_config"]
             merged_spec["roles"][role_name] = {"auth": auth_config}
 
-        # Collect all unique endpoints
-        all_endpoints = {}  # {(method, path): {endpoint_data, access_roles}}
+        # Collect all unique endpoints, matched by method and normalized path
+        endpoints = merged_spec["endpoints"]
+        index = EndpointIndex(endpoints)
+        access_roles = []  # per endpoint row: roles whose collection has it
+        total = sum(len(data["endpoints"]) for data in collections.values())
+        done = 0
 
-        for role_name, data in self.imported_collections.items():
+        for role_name, data in collections.items():
             for endpoint in data["endpoints"]:
-                key = (endpoint["method"], endpoint["path"])
-                if key not in all_endpoints:
-                    all_endpoints[key] = {"endpoint": endpoint, "access_roles": set()}
-                all_endpoints[key]["access_roles"].add(role_name)
-
-        # Create endpoints with expectations
-        for (method, path), endpoint_data in all_endpoints.items():
-            endpoint = endpoint_data["endpoint"]
-            access_roles = endpoint_data["access_roles"]
-
-            # Create expectations for all roles
-            expectations = {}
-            for role_name in merged_spec["roles"]:
-                if role_name in access_roles:
-                    # This role should have access
-                    expectations[role_name] = {"status": 200}
-                else:
-                    # This role should be denied
-                    expectations[role_name] = {"status": 403}
-
-            merged_spec["endpoints"].append(
-                {
-                    "name": endpoint["name"],
-                    "method": endpoint["method"],
-                    "path": endpoint["path"],
-                    "expect": expectations,
-                }
-            )
+                done += 1
+                if progress is not None:
+                    progress.report(done, total)
+                row = index.find(endpoint["method"], endpoint["path"])
+                if row is None:
+                    endpoints.append(
+                        {
+                            "name": endpoint["name"],
+                            "method": endpoint["method"],
+                            "path": endpoint["path"],
+                        }
+                    )
+                    if endpoint.get("folder"):
+                        endpoints[-1]["folder"] = endpoint["folder"]
+                    row = len(endpoints) - 1
+                    index.add(row)
+                    access_roles.append(set())
+                access_roles[row].add(role_name)
+
+        # Create expectations for all roles: access for the collection's
+        # roles, denied for everyone else
+        for endpoint, roles in zip(endpoints, access_roles):
+            endpoint["expect"] = {
+                role_name: {"status": 200 if role_name in roles else 403}
+                for role_name in merged_spec["roles"]
+            }
 
         return merged_spec
 
-    def _extract_base_url_from_collection(self, collection_data):
-        """Extract base URL from a Postman collection"""
-        # This reuses the logic from SpecStore
-        return self.store.extract_base_url_from_postman(collection_data)
-
     def _has_configured_expectations(self):
         """Check if any endpoints have configured expectations"""
         for endpoint in self.store.spec.get("endpoints", []):
@@ -1,8 +1,130 @@
 """
 Reusable spinner widget for loading indicators
 """
+from typing import Callable, Dict, Tuple
 from PySide6 import QtCore, QtGui, QtWidgets
 
+# One animation frame per 10 degrees of rotation, 20 frames per second
+FRAME_COUNT = 36
+FRAME_INTERVAL_MS = 50
+
+SPINNER_COLOR = "#CE2929"
+
+# Pre-rendered frame atlases keyed by (size, color name)
+_atlases: Dict[Tuple[int, str], QtGui.QPixmap] = {}
+
+
+def _draw_spinner_arc(painter: QtGui.QPainter, x: float, size: int, color: QtGui.QColor, angle: int):
+    """Draw one spinner frame (a 270 degree arc) at horizontal offset x"""
+    pen = QtGui.QPen(color)
+    pen.setWidth(2)
+    pen.setCapStyle(QtCore.Qt.RoundCap)
+    painter.setPen(pen)
+
+    margin = 2
+    rect = QtCore.QRectF(x + margin, margin, size - 2*margin, size - 2*margin)
+    painter.drawArc(rect, angle * 16, 270 * 16)
+
+
+def spinner_atlas(size: int = 16, color: QtGui.QColor = None) -> QtGui.QPixmap:
+    """Get a horizontal strip holding every spinner frame, rendered once per size and color"""
+    color = QtGui.QColor(color or SPINNER_COLOR)
+    key = (size, color.name(QtGui.QColor.HexArgb))
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = QtGui.QPixmap(size * FRAME_COUNT, size)
+        atlas.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(atlas)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        for frame in range(FRAME_COUNT):
+            _draw_spinner_arc(painter, frame * size, size, color, frame * 360 // FRAME_COUNT)
+        painter.end()
+        _atlases[key] = atlas
+    return atlas
+
+
+class SpinnerClock(QtCore.QObject):
+    """Single animation timer shared by every spinner delegate.
+
+    The timer only runs while at least one view is subscribed, so an idle
+    window does not wake up to animate nothing.
+    """
+
+    tick = QtCore.Signal(int)
+
+    _shared = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = 0
+        self._subscribers = set()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(FRAME_INTERVAL_MS)
+        self._timer.timeout.connect(self._advance)
+
+    @classmethod
+    def shared(cls) -> "SpinnerClock":
+        """Get the application-wide clock"""
+        if cls._shared is None:
+            cls._shared = cls(QtCore.QCoreApplication.instance())
+        return cls._shared
+
+    def subscribe(self, callback: Callable[[int], None]):
+        """Call ``callback(frame)`` on every tick until unsubscribed"""
+        if callback not in self._subscribers:
+            self._subscribers.add(callback)
+            self.tick.connect(callback)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def unsubscribe(self, callback: Callable[[int], None]):
+        if callback in self._subscribers:
+            self._subscribers.discard(callback)
+            self.tick.disconnect(callback)
+        if not self._subscribers:
+            self._timer.stop()
+
+    def isRunning(self) -> bool:
+        return self._timer.isActive()
+
+    def _advance(self):
+        self.frame = (self.frame + 1) % FRAME_COUNT
+        self.tick.emit(self.frame)
+
+
+class SpinnerDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a spinner from the shared frame atlas in pending cells.
+
+    Args:
+        is_pending: Returns True for indexes that should show a spinner
+        size: Diameter of the spinner in pixels
+        clock: Clock whose current frame is painted (defaults to the shared one)
+    """
+
+    def __init__(self, is_pending: Callable[[QtCore.QModelIndex], bool], size: int = 16, clock: SpinnerClock = None, parent=None):
+        super().__init__(parent)
+        self.is_pending = is_pending
+        self.size = size
+        self.clock = clock or SpinnerClock.shared()
+
+    def paint(self, painter, option, index):
+        if not self.is_pending(index):
+            super().paint(painter, option, index)
+            return
+
+        # Draw the cell background (alternating rows etc.) without any text
+        opt = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        rect = option.rect
+        x = rect.x() + (rect.width() - self.size) // 2
+        y = rect.y() + (rect.height() - self.size) // 2
+        source = QtCore.QRect(self.clock.frame * self.size, 0, self.size, self.size)
+        painter.drawPixmap(QtCore.QRect(x, y, self.size, self.size), spinner_atlas(self.size), source)
+
 
 class SpinnerWidget(QtWidgets.QLabel):
     """
@@ -33,7 +155,7 @@ class SpinnerWidget(QtWidgets.QLabel):
         self._timer.timeout.connect(self._update_rotation)
         
         # Primary color for spinner (matches theme)
-        self._color = QtGui.QColor("#CE2929")
+        self._color = QtGui.QColor(SPINNER_COLOR)
         
         # Initial pixmap
         self._update_pixmap()
@@ -72,18 +194,7 @@ class SpinnerWidget(QtWidgets.QLabel):
         
         painter = QtGui.QPainter(pixmap)
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        
-        # Draw circular arc
-        pen = QtGui.QPen(self._color)
-        pen.setWidth(2)
-        pen.setCapStyle(QtCore.Qt.RoundCap)
-        painter.setPen(pen)
-        
-        # Draw arc (270 degrees, leaving 90 degree gap)
-        margin = 2
-        rect = QtCore.QRectF(margin, margin, self.size - 2*margin, self.size - 2*margin)
-        painter.drawArc(rect, self._rotation_angle * 16, 270 * 16)
-        
+        _draw_spinner_arc(painter, 0, self.size, self._color, self._rotation_angle)
         painter.end()
         return pixmap
     
@@ -3,6 +3,6 @@
 from .LogoHeader import LogoHeader
 from .DialogUtils import multiline_input, show_text
 from .TabsComponent import TabsComponent
-from .SpinnerWidget import SpinnerWidget
+from .SpinnerWidget import SpinnerWidget, SpinnerClock, SpinnerDelegate
 
-__all__ = ['LogoHeader', 'multiline_input', 'show_text', 'TabsComponent', 'SpinnerWidget']
+__all__ = ['LogoHeader', 'multiline_input', 'show_text', 'TabsComponent', 'SpinnerWidget', 'SpinnerClock', 'SpinnerDelegate']
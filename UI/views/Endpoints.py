@@ -1,7 +1,241 @@
+from typing import Dict
 from PySide6 import QtWidgets, QtGui, QtCore
 from .SpecStore import SpecStore
 from . import Theme
 
+# Paths longer than this are truncated in the table (full path in the tooltip)
+PATH_DISPLAY_LIMIT = 40
+
+
+def behavior_key(behavior) -> str:
+    """Create a unique key for a behavior to group similar ones."""
+    status_key = str(behavior.get("status", ""))
+    contains_key = ",".join(sorted(behavior.get("contains", [])))
+    not_contains_key = ",".join(sorted(behavior.get("not_contains", [])))
+    return f"{status_key}|{contains_key}|{not_contains_key}"
+
+
+def behavior_summary(expectations) -> str:
+    """Summarize an endpoint's expectations, grouping roles that share a behavior."""
+    role_behaviors = {}
+    for role_name, exp in expectations.items():
+        key = behavior_key(exp)
+        if key not in role_behaviors:
+            role_behaviors[key] = {"behavior": exp, "roles": []}
+        role_behaviors[key]["roles"].append(role_name)
+
+    behavior_summaries = []
+    for behavior_data in role_behaviors.values():
+        behavior = behavior_data["behavior"]
+        desc_parts = []
+        if "status" in behavior:
+            status_val = behavior["status"]
+            if isinstance(status_val, list):
+                desc_parts.append(f"Status {','.join(map(str, status_val))}")
+            else:
+                desc_parts.append(f"Status {status_val}")
+        if "contains" in behavior:
+            desc_parts.append(f"Contains {','.join(behavior['contains'])}")
+        if "not_contains" in behavior:
+            desc_parts.append(f"Not Contains {','.join(behavior['not_contains'])}")
+
+        behavior_desc = " | ".join(desc_parts) if desc_parts else "No criteria"
+        behavior_summaries.append(f"{behavior_desc} [{', '.join(behavior_data['roles'])}]")
+
+    return " • ".join(behavior_summaries)
+
+
+class EndpointsModel(QtCore.QAbstractTableModel):
+    """Table model over the store's endpoint list.
+
+    Rows are read straight from ``store.spec`` and behavior summaries are
+    built the first time a row is painted, so a large spec only costs
+    something for the rows that are on screen. The model follows the
+    store's typed change signals and only touches the affected rows.
+    """
+
+    HEADERS = ["Name", "Method", "Path", "Behaviours", "Actions"]
+    NAME, METHOD, PATH, BEHAVIOURS, ACTIONS = range(5)
+
+    def __init__(self, store: SpecStore, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._summaries: Dict[int, str] = {}
+        self._rows = len(self._endpoints())
+
+        store.specReset.connect(self.reload)
+        store.endpointsReset.connect(self.reload)
+        store.endpointAdded.connect(self._on_endpoint_added)
+        store.endpointRemoved.connect(self._on_endpoint_removed)
+        store.endpointUpdated.connect(self._on_endpoint_changed)
+        store.expectationChanged.connect(self._on_endpoint_changed)
+
+    def _endpoints(self):
+        return self.store.spec.get("endpoints", [])
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        endpoints = self._endpoints()
+        if not index.isValid() or index.row() >= len(endpoints):
+            return None
+        ep = endpoints[index.row()]
+        col = index.column()
+
+        if col == self.NAME:
+            if role == QtCore.Qt.DisplayRole:
+                return ep.get("name", "")
+        elif col == self.METHOD:
+            if role == QtCore.Qt.DisplayRole:
+                return ep.get("method", "GET")
+            if role == QtCore.Qt.TextAlignmentRole:
+                return int(QtCore.Qt.AlignCenter)
+        elif col == self.PATH:
+            full_path = ep.get("path", "")
+            if role == QtCore.Qt.DisplayRole:
+                if len(full_path) > PATH_DISPLAY_LIMIT:
+                    return full_path[:PATH_DISPLAY_LIMIT - 3] + "..."
+                return full_path
+            if role == QtCore.Qt.ToolTipRole and len(full_path) > PATH_DISPLAY_LIMIT:
+                return full_path
+            if role == QtCore.Qt.ForegroundRole:
+                return QtGui.QColor(Theme.secondary)
+        elif col == self.BEHAVIOURS:
+            configured = bool(ep.get("expect"))
+            if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+                if not configured:
+                    return "Not configured" if role == QtCore.Qt.DisplayRole else None
+                return self._summary(index.row(), ep)
+            if role == QtCore.Qt.ForegroundRole and not configured:
+                return QtGui.QColor("#999")
+            if role == QtCore.Qt.FontRole and not configured:
+                font = QtGui.QFont()
+                font.setItalic(True)
+                return font
+        return None
+
+    def _summary(self, row: int, ep) -> str:
+        summary = self._summaries.get(row)
+        if summary is None:
+            summary = self._summaries[row] = behavior_summary(ep["expect"])
+        return summary
+
+    def reload(self):
+        """Re-read the whole endpoint list from the store"""
+        self.beginResetModel()
+        self._summaries.clear()
+        self._rows = len(self._endpoints())
+        self.endResetModel()
+
+    def _on_endpoint_added(self, row: int):
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._summaries = {r + (r >= row): s for r, s in self._summaries.items()}
+        self._rows += 1
+        self.endInsertRows()
+
+    def _on_endpoint_removed(self, row: int):
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self._summaries = {r - (r > row): s for r, s in self._summaries.items() if r != row}
+        self._rows -= 1
+        self.endRemoveRows()
+
+    def _on_endpoint_changed(self, row: int, role: str = None):
+        self._summaries.pop(row, None)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+
+class ActionsDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints Edit and Delete buttons in a cell and reports clicks on them."""
+
+    editRequested = QtCore.Signal(int)
+    deleteRequested = QtCore.Signal(int)
+
+    BUTTONS = (("Edit", 50), ("Delete", 60))
+    BUTTON_HEIGHT = 32
+    MARGIN = 2
+    SPACING = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = None  # (row, button index) under the mouse press
+
+    def _button_rects(self, cell: QtCore.QRect):
+        """Rects of the Edit and Delete buttons inside a cell"""
+        metrics = QtGui.QFontMetrics(QtWidgets.QApplication.font())
+        height = min(self.BUTTON_HEIGHT, cell.height() - 2 * self.MARGIN)
+        y = cell.y() + (cell.height() - height) // 2
+        x = cell.x() + self.MARGIN
+        rects = []
+        for label, min_width in self.BUTTONS:
+            width = max(min_width, metrics.horizontalAdvance(label) + 24)
+            rects.append(QtCore.QRect(x, y, width, height))
+            x += width + self.SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        # Draw the cell background without any text
+        opt = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        edit_rect, delete_rect = self._button_rects(option.rect)
+
+        button = QtWidgets.QStyleOptionButton()
+        button.rect = edit_rect
+        button.text = "Edit"
+        button.state = QtWidgets.QStyle.State_Enabled | QtWidgets.QStyle.State_Raised
+        if self._pressed == (index.row(), 0):
+            button.state |= QtWidgets.QStyle.State_Sunken
+        style.drawControl(QtWidgets.QStyle.CE_PushButton, button, painter, opt.widget)
+
+        # Delete keeps its red look from the old stylesheet
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        color = QtGui.QColor("#d32f2f")
+        if self._pressed == (index.row(), 1):
+            color = color.darker(120)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(delete_rect, 4, 4)
+        painter.setPen(QtGui.QColor("white"))
+        painter.drawText(delete_rect, QtCore.Qt.AlignCenter, "Delete")
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        rects = self._button_rects(QtCore.QRect(0, 0, 1000, self.BUTTON_HEIGHT + 2 * self.MARGIN))
+        return QtCore.QSize(rects[-1].right() + self.MARGIN, self.BUTTON_HEIGHT + 2 * self.MARGIN)
+
+    def editorEvent(self, event, model, option, index):
+        kind = event.type()
+        if kind not in (QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseButtonRelease):
+            return False
+        if event.button() != QtCore.Qt.LeftButton:
+            return False
+
+        pos = event.position().toPoint()
+        hit = next((i for i, rect in enumerate(self._button_rects(option.rect)) if rect.contains(pos)), None)
+        if kind == QtCore.QEvent.MouseButtonPress:
+            self._pressed = (index.row(), hit) if hit is not None else None
+            return hit is not None
+
+        pressed, self._pressed = self._pressed, None
+        if hit is None or pressed != (index.row(), hit):
+            return pressed is not None
+        (self.editRequested if hit == 0 else self.deleteRequested).emit(index.row())
+        return True
+
+
 class EndpointsSection(QtWidgets.QWidget):
     """Editable table for managing API endpoints."""
     def __init__(self, store: SpecStore, parent=None):
@@ -21,14 +255,19 @@ class EndpointsSection(QtWidgets.QWidget):
         
         buttonLayout.addStretch()
 
-        self.table = QtWidgets.QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Name", "Method", "Path", "Behaviours", "Actions"])
+        self.model = EndpointsModel(self.store, self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
+        self.table.setWordWrap(False)
+        self.table.setTextElideMode(QtCore.Qt.ElideRight)
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QtWidgets.QHeaderView.ResizeToContents)  # Name - fit content
         header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)  # Method - fit content  
         header.setSectionResizeMode(2, QtWidgets.QHeaderView.Interactive)       # Path - user resizable with reasonable default
         header.setSectionResizeMode(3, QtWidgets.QHeaderView.Stretch)           # Behaviours - take most available space
         header.setSectionResizeMode(4, QtWidgets.QHeaderView.Fixed)             # Actions - fixed width
+        # ResizeToContents would measure every row; sample a screenful instead
+        header.setResizeContentsPrecision(50)
         
         # Set initial column widths for better proportions
         self.table.setColumnWidth(2, 300)  # Path column - reasonable fixed width
@@ -36,6 +275,12 @@ class EndpointsSection(QtWidgets.QWidget):
         
         # Set default row height to ensure text is visible
         self.table.verticalHeader().setDefaultSectionSize(60)
+
+        # Edit/Delete buttons are painted by a delegate instead of per-row widgets
+        self.actions = ActionsDelegate(self.table)
+        self.actions.editRequested.connect(self._edit_endpoint_row)
+        self.actions.deleteRequested.connect(self._delete_endpoint)
+        self.table.setItemDelegateForColumn(EndpointsModel.ACTIONS, self.actions)
         
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
@@ -44,9 +289,6 @@ class EndpointsSection(QtWidgets.QWidget):
         layout.addLayout(buttonLayout)
         layout.addWidget(self.table)
 
-        self.store.specChanged.connect(self.refresh)
-        self.refresh()
-
     def add_endpoint(self):
         """Add a new endpoint by opening an empty edit form."""
         self._edit_endpoint_form("", "GET", "", is_new=True)
@@ -60,110 +302,11 @@ class EndpointsSection(QtWidgets.QWidget):
             )
             return
         
-        dialog = ConfigureAllEndpointsDialog(self.store, self)
-        if dialog.exec() == QtWidgets.QDialog.Accepted:
-            self.refresh()  # Refresh the table to show updated configurations
+        # The table follows the store's change signals while the dialog edits
+        ConfigureAllEndpointsDialog(self.store, self).exec()
 
     def refresh(self):
-        eps = self.store.spec.get("endpoints", [])
-        self.table.setRowCount(len(eps))
-        for i, ep in enumerate(eps):
-            # Name
-            self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(ep.get("name","")))
-            # Method (plain text)
-            method_item = QtWidgets.QTableWidgetItem(ep.get("method","GET"))
-            method_item.setTextAlignment(QtCore.Qt.AlignCenter)
-            self.table.setItem(i, 1, method_item)
-            # Path (text display with truncation and tooltip)
-            full_path = ep.get("path", "")
-            display_path = full_path
-            
-            # Truncate URL if longer than 40 characters (more generous since Path column stretches)
-            if len(full_path) > 40:
-                display_path = full_path[:37] + "..."
-            
-            path_item = QtWidgets.QTableWidgetItem(display_path)
-            path_item.setForeground(QtGui.QColor(Theme.secondary))
-            
-            # Add tooltip with full path if truncated
-            if len(full_path) > 40:
-                path_item.setToolTip(full_path)
-            
-            self.table.setItem(i, 2, path_item)
-            # Expectations summary
-            expectations = ep.get("expect", {})
-            if expectations:
-                # Create a detailed summary of configured behaviors
-                behavior_summaries = []
-                role_behaviors = {}
-                
-                # Group expectations by behavior to show unique behaviors
-                for role_name, exp in expectations.items():
-                    behavior_key = self._create_behavior_key(exp)
-                    if behavior_key not in role_behaviors:
-                        role_behaviors[behavior_key] = {"behavior": exp, "roles": []}
-                    role_behaviors[behavior_key]["roles"].append(role_name)
-                
-                # Create summary text for each unique behavior
-                for behavior_data in role_behaviors.values():
-                    behavior = behavior_data["behavior"]
-                    roles = behavior_data["roles"]
-                    
-                    # Build behavior description
-                    desc_parts = []
-                    if "status" in behavior:
-                        status_val = behavior["status"]
-                        if isinstance(status_val, list):
-                            desc_parts.append(f"Status {','.join(map(str, status_val))}")
-                        else:
-                            desc_parts.append(f"Status {status_val}")
-                    if "contains" in behavior:
-                        desc_parts.append(f"Contains {','.join(behavior['contains'])}")
-                    if "not_contains" in behavior:
-                        desc_parts.append(f"Not Contains {','.join(behavior['not_contains'])}")
-                    
-                    behavior_desc = " | ".join(desc_parts) if desc_parts else "No criteria"
-                    roles_desc = f"[{', '.join(roles)}]"
-                    
-                    behavior_summaries.append(f"{behavior_desc} {roles_desc}")
-                
-                # Join all behaviors and truncate if needed
-                full_summary = " • ".join(behavior_summaries)
-                
-                # Create label with tooltip for full content
-                exp_label = QtWidgets.QLabel(full_summary)
-                exp_label.setToolTip(full_summary)  # Show full content on hover
-                exp_label.setStyleSheet("QLabel { padding: 4px; }")
-            else:
-                exp_label = QtWidgets.QLabel("Not configured")
-                exp_label.setStyleSheet("QLabel { padding: 4px; color: #999; font-style: italic; }")
-            
-            # Ensure label doesn't wrap - use elision instead
-            exp_label.setWordWrap(False)
-            exp_label.setSizePolicy(QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Preferred)
-            
-            self.table.setCellWidget(i, 3, exp_label)
-            # Actions
-            actionsWidget = QtWidgets.QWidget()
-            actionsLayout = QtWidgets.QHBoxLayout(actionsWidget)
-            actionsLayout.setContentsMargins(2, 2, 2, 2)
-            
-            editBtn = QtWidgets.QPushButton("Edit")
-            editBtn.setMinimumHeight(32)
-            editBtn.setMinimumWidth(50)
-            editBtn.setStyleSheet("QPushButton { padding: 6px 12px; }")
-            editBtn.clicked.connect(lambda _=None, row=i: self._edit_endpoint_row(row))
-            deleteBtn = QtWidgets.QPushButton("Delete")
-            deleteBtn.setMinimumHeight(32)
-            deleteBtn.setMinimumWidth(60)
-            deleteBtn.setStyleSheet("QPushButton { padding: 6px 12px; background-color: #d32f2f; color: white; }")
-            deleteBtn.clicked.connect(lambda _=None, row=i: self._delete_endpoint(row))
-            
-            actionsLayout.addWidget(editBtn)
-            actionsLayout.addWidget(deleteBtn)
-            actionsLayout.addStretch()
-            
-            self.table.setCellWidget(i, 4, actionsWidget)
+        self.model.reload()
 
     def _delete_endpoint(self, row: int):
         """Delete an endpoint after confirmation."""
@@ -608,28 +751,16 @@ class EndpointsSection(QtWidgets.QWidget):
             
             if is_new:
                 # Create new endpoint with expectations
-                endpoint = {
-                    "name": endpoint_name,
-                    "method": endpoint_method, 
-                    "path": endpoint_path,
-                    "expect": expectations_data
-                }
-                self.store.spec["endpoints"].append(endpoint)
-                self.store.specChanged.emit()
+                self.store.add_endpoint(endpoint_name, endpoint_method, endpoint_path, expect=expectations_data)
             else:
-                # Update existing endpoint
-                self.store.update_endpoint_row(row, endpoint_name, endpoint_method, endpoint_path)
-                # Update expectations
-                if 0 <= row < len(self.store.spec["endpoints"]):
-                    self.store.spec["endpoints"][row]["expect"] = expectations_data
-                    self.store.specChanged.emit()
+                # Row and expectations change as one edit: one notification, one refresh
+                with self.store.batch():
+                    self.store.update_endpoint_row(row, endpoint_name, endpoint_method, endpoint_path)
+                    self.store.set_endpoint_expectations(row, expectations_data)
 
     def _create_behavior_key(self, behavior):
         """Create a unique key for a behavior to group similar ones."""
-        status_key = str(behavior.get("status", ""))
-        contains_key = ",".join(sorted(behavior.get("contains", [])))
-        not_contains_key = ",".join(sorted(behavior.get("not_contains", [])))
-        return f"{status_key}|{contains_key}|{not_contains_key}"
+        return behavior_key(behavior)
 
 
 class ConfigureAllEndpointsDialog(QtWidgets.QDialog):
@@ -803,7 +934,7 @@ class ConfigureAllEndpointsDialog(QtWidgets.QDialog):
         admin_patterns = ["/admin"]
         user_patterns = ["/user", "/profile", "/settings", "/account"]
         
-        configured_count = 0
+        expectations = []
         
         for i, endpoint in enumerate(self.store.spec.get("endpoints", [])):
             path = endpoint.get("path", "").lower()
@@ -828,8 +959,9 @@ class ConfigureAllEndpointsDialog(QtWidgets.QDialog):
                     # Default - 200 for admin, 403 for others
                     status = 200 if role_name == "admin" else 403
                 
-                self.store.set_endpoint_expectation(i, role_name, status=status)
-                configured_count += 1
+                expectations.append((i, role_name, {"status": status}))
+        
+        configured_count = self.store.set_expectations(expectations)
         
         QtWidgets.QMessageBox.information(
             self, "Auto-Configuration Complete", 
@@ -847,9 +979,7 @@ class ConfigureAllEndpointsDialog(QtWidgets.QDialog):
         )
         
         if reply == QtWidgets.QMessageBox.Yes:
-            for endpoint in self.store.spec.get("endpoints", []):
-                endpoint["expect"] = {}
-            self.store.specChanged.emit()
+            self.store.clear_all_expectations()
             QtWidgets.QMessageBox.information(
                 self, "Configurations Cleared", 
                 "All endpoint behavior configurations have been cleared."
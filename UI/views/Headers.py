@@ -44,7 +44,8 @@ class KVRow(QtWidgets.QWidget):
         layout.addLayout(top)
         layout.addWidget(self.list)
 
-        store.specChanged.connect(self.refresh)
+        store.headersChanged.connect(self.refresh)
+        store.specReset.connect(self.refresh)
         self.refresh()
 
     def _add(self):
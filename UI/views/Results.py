@@ -1,16 +1,187 @@
-from typing import Dict, Any
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from PySide6 import QtWidgets, QtCore
 
 
+# Compact status codes stored per cell by ResultsModel
+PENDING, PASS, FAIL, SKIP, EMPTY, STOPPED = range(6)
+_STATUS_CODES = {"⏳": PENDING, "PASS": PASS, "SKIP": SKIP, "": EMPTY, "STOPPED": STOPPED}
+
+
+def format_result(status: int, http: int, latency_ms: int) -> str:
+    """Format a cell the way the results matrix displays it"""
+    if status == PENDING:
+        return ""
+    if status == STOPPED:
+        return "⏹️"
+    badge = "✅" if status == PASS else ("⏭️" if status == SKIP else "❌")
+    text = f"{badge} {http}" if http else badge
+    if latency_ms >= 0:
+        text += f"  {latency_ms}ms"
+    return text
+
+
+class ResultsModel(QtCore.QAbstractTableModel):
+    """Endpoint-by-role results matrix backed by flat arrays.
+
+    Each cell costs a status byte plus two ints; display text is built on
+    demand, so only visible cells are ever formatted.
+    """
+
+    # Custom role returning the compact status code of a cell
+    StatusRole = QtCore.Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._endpoints: List[str] = []
+        self._roles: List[str] = []
+        self._row_index: Dict[str, int] = {}
+        self._col_index: Dict[str, int] = {}
+        self._status = array("B")
+        self._http = array("i")
+        self._latency = array("i")
+        self._errors: Dict[int, str] = {}
+        self.pending_count = 0
+
+    # Qt model interface
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._endpoints)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._roles) + 1
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return "Endpoint" if section == 0 else self._roles[section - 1]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == 0:
+            if role == QtCore.Qt.DisplayRole:
+                return self._endpoints[row]
+            if role == QtCore.Qt.TextAlignmentRole:
+                return int(QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft)
+            return None
+
+        cell = self._cell(row, col)
+        if role == QtCore.Qt.DisplayRole:
+            return format_result(self._status[cell], self._http[cell], self._latency[cell])
+        if role == QtCore.Qt.TextAlignmentRole:
+            return int(QtCore.Qt.AlignCenter)
+        if role == QtCore.Qt.ToolTipRole:
+            return self._errors.get(cell)
+        if role == self.StatusRole:
+            return self._status[cell]
+        return None
+
+    # Matrix API
+    def set_matrix(self, results: Dict[str, Dict[str, Dict[str, Any]]]):
+        """Replace the whole matrix"""
+        self.beginResetModel()
+        self._endpoints = list(results)
+        first_ep = next(iter(results.values()), {})
+        self._roles = list(first_ep.keys())
+        self._row_index = {name: r for r, name in enumerate(self._endpoints)}
+        self._col_index = {role: c for c, role in enumerate(self._roles, start=1)}
+
+        size = len(self._endpoints) * len(self._roles)
+        self._status = array("B", bytes([EMPTY]) * size)
+        self._http = array("i", [0]) * size
+        self._latency = array("i", [-1]) * size
+        self._errors = {}
+        self.pending_count = 0
+        for name, rmap in results.items():
+            row = self._row_index[name]
+            for role, res in rmap.items():
+                col = self._col_index.get(role)
+                if col is not None:
+                    self._store(self._cell(row, col), res)
+        self.endResetModel()
+
+    def locate(self, endpoint_name: str, role: str) -> Optional[Tuple[int, int]]:
+        """Get the (row, column) of a cell, or None if it is not in the matrix"""
+        row = self._row_index.get(endpoint_name)
+        col = self._col_index.get(role)
+        if row is None or col is None:
+            return None
+        return row, col
+
+    def set_result(self, row: int, col: int, result: Dict[str, Any]):
+        """Store one cell result and notify views about that cell only"""
+        self._store(self._cell(row, col), result)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index)
+
+    def set_results(self, cells: Iterable[Tuple[int, int, Dict[str, Any]]]):
+        """Store several (row, column, result) cells and notify views once.
+
+        Views get a single dataChanged over the bounding range of the cells.
+        """
+        top = left = None
+        for row, col, result in cells:
+            self._store(self._cell(row, col), result)
+            if top is None:
+                top, bottom, left, right = row, row, col, col
+            else:
+                top, bottom = min(top, row), max(bottom, row)
+                left, right = min(left, col), max(right, col)
+        if top is not None:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))
+
+    def stop_pending(self):
+        """Mark every pending cell as stopped, e.g. after the run ended early"""
+        if not self.pending_count:
+            return
+        for cell, status in enumerate(self._status):
+            if status == PENDING:
+                self._status[cell] = STOPPED
+        self.pending_count = 0
+        self.dataChanged.emit(self.index(0, 1), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def status_at(self, row: int, col: int) -> int:
+        return self._status[self._cell(row, col)]
+
+    def is_pending(self, index: QtCore.QModelIndex) -> bool:
+        return index.column() > 0 and self._status[self._cell(index.row(), index.column())] == PENDING
+
+    def _cell(self, row: int, col: int) -> int:
+        return row * len(self._roles) + col - 1
+
+    def _store(self, cell: int, result: Dict[str, Any]):
+        status = _STATUS_CODES.get(result.get("status", ""), FAIL)
+        self.pending_count += (status == PENDING) - (self._status[cell] == PENDING)
+        self._status[cell] = status
+        http = result.get("http")
+        self._http[cell] = http if isinstance(http, int) else 0
+        lat = result.get("latency_ms")
+        self._latency[cell] = lat if isinstance(lat, int) else -1
+        error = result.get("error")
+        if error:
+            self._errors[cell] = error
+        else:
+            self._errors.pop(cell, None)
+
+
 class ResultsSection(QtWidgets.QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self.table = QtWidgets.QTableWidget(0, 1)
-        self.table.setHorizontalHeaderLabels(["Endpoint"])
+        self.model = ResultsModel(self)
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
 
+        # Pending cells are painted by a delegate driven by the shared spinner clock
+        # (imported lazily to avoid a circular import through UI.components)
+        from ..components.SpinnerWidget import SpinnerClock, SpinnerDelegate
+        self._clock = SpinnerClock.shared()
+        self.table.setItemDelegate(SpinnerDelegate(self.model.is_pending, size=16, clock=self._clock, parent=self.table))
+        self._animating = False
+
         # Visual polish
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
@@ -24,146 +195,62 @@ class ResultsSection(QtWidgets.QWidget):
 
         layout = QtWidgets.QVBoxLayout(self)
         layout.addWidget(self.table)
-        
-        # Track spinner widgets by (row, col) to manage their lifecycle
-        self._spinners: Dict[tuple, QtWidgets.QWidget] = {}
-        
-        # Cache for SpinnerWidget class (lazy loaded to avoid circular import)
-        self._SpinnerWidget = None
 
     def render(self, results: Dict[str, Dict[str, Dict[str, Any]]]):
-        # Reset model (clear removes headers, so we re-apply them below)
-        self.table.clear()
-        
-        # Clean up any existing spinners
-        self._cleanup_spinners()
-
-        if not results:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(1)
-            self.table.setHorizontalHeaderLabels(["Endpoint"])
-            return
-
-        first_ep = next(iter(results.values()), {})
-        role_order = list(first_ep.keys())
-        headers = ["Endpoint"] + role_order
-
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(len(results))
-
-        # Ensure columns stretch after the column count changes
-        hdr = self.table.horizontalHeader()
-        for col in range(len(headers)):
-            hdr.setSectionResizeMode(col, QtWidgets.QHeaderView.Stretch)
-
-        for r, (ep_name, rmap) in enumerate(results.items()):
-            # Endpoint column (left-aligned)
-            ep_item = QtWidgets.QTableWidgetItem(ep_name)
-            ep_item.setTextAlignment(QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft)
-            self.table.setItem(r, 0, ep_item)
-
-            # Role columns (centered)
-            for c, rid in enumerate(role_order, start=1):
-                res = rmap.get(rid, {})
-                st = res.get("status", "")
-                
-                # Check if this is a pending status (hourglass emoji or "⏳")
-                if st == "⏳":
-                    # Create and show spinner widget
-                    self._set_cell_spinner(r, c)
-                else:
-                    # Show result text
-                    http = res.get("http", "")
-                    badge = "✅" if st == "PASS" else ("⏭️" if st == "SKIP" else "❌")
-                    text = f"{badge} {http}" if http else badge
-                    lat = res.get("latency_ms")
-                    if isinstance(lat, int):
-                        text += f"  {lat}ms"
-
-                    cell = QtWidgets.QTableWidgetItem(text)
-                    cell.setTextAlignment(QtCore.Qt.AlignCenter)
-                    self.table.setItem(r, c, cell)
+        self.model.set_matrix(results or {})
+        self._sync_animation()
 
     def update_result(self, endpoint_name: str, role: str, result: Dict[str, Any]):
         """Update a single result in the table (for streaming results)"""
-        # Find the row for this endpoint
-        row = -1
-        for r in range(self.table.rowCount()):
-            item = self.table.item(r, 0)
-            if item and item.text() == endpoint_name:
-                row = r
-                break
-
-        if row == -1:
-            # Endpoint not found, this shouldn't happen
+        cell = self.model.locate(endpoint_name, role)
+        if cell is None:
+            # Endpoint or role is not part of the rendered matrix
             return
 
-        # Find the column for this role
-        col = -1
-        for c in range(1, self.table.columnCount()):
-            header = self.table.horizontalHeaderItem(c)
-            if header and header.text() == role:
-                col = c
-                break
+        self.model.set_result(*cell, result)
+        self._sync_animation()
 
-        if col == -1:
-            # Role not found, this shouldn't happen
-            return
+    def update_results(self, updates: Iterable[Tuple[str, str, Dict[str, Any]]]):
+        """Apply a batch of (endpoint_name, role, result) updates with a single repaint"""
+        cells = []
+        for endpoint_name, role, result in updates:
+            cell = self.model.locate(endpoint_name, role)
+            if cell is not None:
+                cells.append((*cell, result))
+        self.model.set_results(cells)
+        self._sync_animation()
 
-        # Remove spinner if present
-        self._remove_cell_spinner(row, col)
+    def stop_pending(self):
+        """Stop the spinners of cells that will get no result"""
+        self.model.stop_pending()
+        self._sync_animation()
 
-        # Update the cell with result
-        st = result.get("status", "")
-        http = result.get("http", "")
-        badge = "✅" if st == "PASS" else ("⏭️" if st == "SKIP" else "❌")
-        text = f"{badge} {http}" if http else badge
-        lat = result.get("latency_ms")
-        if isinstance(lat, int):
-            text += f"  {lat}ms"
-
-        cell = QtWidgets.QTableWidgetItem(text)
-        cell.setTextAlignment(QtCore.Qt.AlignCenter)
-        self.table.setItem(row, col, cell)
-    
-    def _set_cell_spinner(self, row: int, col: int):
-        """Set a spinner widget in the specified cell"""
-        # Lazy import to avoid circular dependency (only imported once)
-        if self._SpinnerWidget is None:
-            from ..components.SpinnerWidget import SpinnerWidget
-            self._SpinnerWidget = SpinnerWidget
-        
-        # Create a container widget to center the spinner
-        container = QtWidgets.QWidget()
-        layout = QtWidgets.QHBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(QtCore.Qt.AlignCenter)
-        
-        # Create spinner
-        spinner = self._SpinnerWidget(size=16)
-        spinner.start()
-        layout.addWidget(spinner)
-        
-        # Set the container as cell widget
-        self.table.setCellWidget(row, col, container)
-        
-        # Track the spinner for cleanup
-        self._spinners[(row, col)] = spinner
-    
-    def _remove_cell_spinner(self, row: int, col: int):
-        """Remove spinner from the specified cell"""
-        key = (row, col)
-        if key in self._spinners:
-            spinner = self._spinners[key]
-            spinner.stop()
-            del self._spinners[key]
-        
-        # Remove cell widget to allow item to be set
-        self.table.removeCellWidget(row, col)
-    
-    def _cleanup_spinners(self):
-        """Clean up all spinner widgets"""
-        for spinner in self._spinners.values():
-            spinner.stop()
-        self._spinners.clear()
+    def is_animating(self) -> bool:
+        """Whether pending cells are subscribed to the spinner clock"""
+        return self._animating
+
+    def _sync_animation(self):
+        """Follow the shared clock only while there are pending cells"""
+        if self.model.pending_count and not self._animating:
+            self._clock.subscribe(self._repaint_pending)
+            self._animating = True
+        elif not self.model.pending_count and self._animating:
+            self._clock.unsubscribe(self._repaint_pending)
+            self._animating = False
+
+    def _repaint_pending(self, frame: int):
+        """Repaint the pending cells that are currently on screen"""
+        if not self.table.isVisible():
+            return
+        viewport = self.table.viewport()
+        first = self.table.rowAt(0)
+        if first < 0:
+            return
+        last = self.table.rowAt(viewport.height() - 1)
+        if last < 0:
+            last = self.model.rowCount() - 1
+        columns = range(1, self.model.columnCount())
+        for row in range(first, last + 1):
+            for col in columns:
+                if self.model.status_at(row, col) == PENDING:
+                    viewport.update(self.table.visualRect(self.model.index(row, col)))
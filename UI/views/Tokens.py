@@ -42,7 +42,8 @@ class TokensSection(QtWidgets.QWidget):
         layout.addLayout(top)
         layout.addWidget(self.table)
 
-        store.specChanged.connect(self.refresh)
+        store.roleChanged.connect(self.refresh)
+        store.specReset.connect(self.refresh)
         self.tokenEdit.setEnabled(False)
         self.refresh()
 
@@ -95,8 +96,7 @@ class TokensSection(QtWidgets.QWidget):
         
         if reply == QtWidgets.QMessageBox.Yes:
             # Delete all roles except guest
-            for role in deletable_roles:
-                self.store.remove_role(role)
+            self.store.remove_roles(deletable_roles)
 
     def refresh(self):
         roles = self.store.spec.get("roles", {})
@@ -0,0 +1,87 @@
+"""
+Incremental authorization-pattern analysis for multi-collection imports.
+
+Each imported collection stands for one role; an endpoint path is
+accessible to the roles whose collections contain it. ``AccessAnalysis``
+keeps both the path -> roles map and the grouping of paths by role set up
+to date as collections are added or removed, so a change costs the size of
+that collection instead of everything imported so far. Paths are compared
+in their normalized form (see core.EndpointIndex.normalize_path).
+"""
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from .EndpointIndex import normalize_path
+
+
+class AccessAnalysis:
+    """Which roles can reach which endpoint paths, grouped by role set"""
+
+    def __init__(self):
+        self._roles: Dict[str, Tuple[int, str]] = {}  # role -> (endpoints, auth type)
+        self._role_paths: Dict[str, Set[str]] = {}
+        self._path_roles: Dict[str, FrozenSet[str]] = {}
+        self._patterns: Dict[FrozenSet[str], Set[str]] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct endpoint paths"""
+        return len(self._path_roles)
+
+    def add_collection(self, role: str, endpoints: Iterable[dict], auth_type: str = "none"):
+        """Add a role's collection, replacing any earlier one for that role"""
+        if role in self._roles:
+            self.remove_collection(role)
+
+        paths = set()
+        count = 0
+        for endpoint in endpoints:
+            paths.add(normalize_path(endpoint["path"]))
+            count += 1
+
+        self._roles[role] = (count, auth_type)
+        self._role_paths[role] = paths
+        for path in paths:
+            roles = self._path_roles.get(path, frozenset())
+            self._move(path, roles, roles | {role})
+
+    def remove_collection(self, role: str):
+        """Remove a role's collection; unknown roles are ignored"""
+        if self._roles.pop(role, None) is None:
+            return
+        for path in self._role_paths.pop(role):
+            roles = self._path_roles[path]
+            self._move(path, roles, roles - {role})
+
+    def clear(self):
+        self._roles.clear()
+        self._role_paths.clear()
+        self._path_roles.clear()
+        self._patterns.clear()
+
+    def roles(self) -> List[Tuple[str, int, str]]:
+        """(role, endpoint count, auth type) in the order roles were added"""
+        return [(role, count, auth_type) for role, (count, auth_type) in self._roles.items()]
+
+    def roles_for(self, path: str) -> FrozenSet[str]:
+        return self._path_roles.get(normalize_path(path), frozenset())
+
+    def patterns(self) -> List[Tuple[Tuple[str, ...], int]]:
+        """(sorted roles, path count) per access pattern, widest access first"""
+        summary = [(tuple(sorted(roles)), len(paths)) for roles, paths in self._patterns.items()]
+        summary.sort(key=lambda item: (-len(item[0]), item[0]))
+        return summary
+
+    def paths(self, roles: Iterable[str]) -> List[str]:
+        """Sorted paths accessible to exactly ``roles``"""
+        return sorted(self._patterns.get(frozenset(roles), ()))
+
+    def _move(self, path: str, old: FrozenSet[str], new: FrozenSet[str]):
+        if old:
+            group = self._patterns[old]
+            group.discard(path)
+            if not group:
+                del self._patterns[old]
+        if new:
+            self._path_roles[path] = new
+            self._patterns.setdefault(new, set()).add(path)
+        else:
+            del self._path_roles[path]
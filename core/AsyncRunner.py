@@ -0,0 +1,301 @@
+"""
+asyncio-based matrix runner.
+
+Runs the whole matrix on a single event loop. A fixed number of worker
+coroutines pull cells from a shared iterator, so memory per in-flight cell
+stays constant no matter how large the spec is. aiohttp is used when it is
+installed; otherwise a small stdlib HTTP/1.1 client with keep-alive
+connection pooling is used.
+"""
+import asyncio
+import ssl
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .Executor import assemble_results, grade_cells
+from .RequestTemplates import CompiledSpec
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency
+    aiohttp = None
+
+DEFAULT_ASYNC_CONCURRENCY = 512
+DEFAULT_ASYNC_PER_HOST_LIMIT = 256
+
+# Bodies are drained in chunks of this size so large responses never sit in memory
+_READ_CHUNK = 64 * 1024
+
+# Methods requests sends without a Content-Length header when there is no body
+_NO_BODY_LENGTH_METHODS = frozenset({"GET", "HEAD"})
+
+# Methods that may be resent when a pooled connection turns out to be closed
+_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class HttpProtocolError(Exception):
+    """Raised when a server response cannot be parsed"""
+
+
+class _StaleConnection(Exception):
+    """A pooled connection failed before any response bytes arrived"""
+
+
+class StdlibHttpClient:
+    """Minimal asyncio HTTP/1.1 client with per-host keep-alive pooling.
+
+    Only the status code is returned; response bodies are drained and
+    discarded so connections can be reused. At most ``pool_size`` idle
+    connections are kept per host; None keeps every one.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self._idle: Dict[Tuple[str, str, int], List[tuple]] = {}
+        self._ssl_context = None
+        self.pool_size = pool_size
+
+    async def request(self, method: str, url: str, headers: Mapping[str, str]) -> int:
+        parts = urlsplit(url)
+        scheme = (parts.scheme or "http").lower()
+        if scheme not in ("http", "https"):
+            raise HttpProtocolError(f"Unsupported URL scheme: {scheme}")
+        host = parts.hostname
+        if not host:
+            raise HttpProtocolError(f"Invalid URL: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc.rsplit('@', 1)[-1]}"]
+        lines += [f"{k}: {v}" for k, v in headers.items() if k.lower() != "host"]
+        if method.upper() not in _NO_BODY_LENGTH_METHODS and not any(k.lower() == "content-length" for k in headers):
+            # requests announces the empty body too; some servers answer 411 without it
+            lines.append("Content-Length: 0")
+        lines.append("Connection: keep-alive")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        idle = self._idle.get(key)
+        if idle:
+            reader, writer = idle.pop()
+            try:
+                return await self._exchange(key, reader, writer, payload, method, reused=True)
+            except _StaleConnection as e:
+                # The server dropped the pooled connection without answering. It
+                # may still have seen the request, so only safe methods are resent.
+                if method.upper() not in _RETRY_METHODS:
+                    raise HttpProtocolError(str(e)) from None
+
+        reader, writer = await self._open(scheme, host, port)
+        return await self._exchange(key, reader, writer, payload, method)
+
+    async def _open(self, scheme: str, host: str, port: int):
+        context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            context = self._ssl_context
+        return await asyncio.open_connection(host, port, ssl=context)
+
+    async def _exchange(self, key, reader, writer, payload: bytes, method: str, reused: bool = False) -> int:
+        try:
+            try:
+                writer.write(payload)
+                await writer.drain()
+                status_line = await reader.readline()
+            except ConnectionError as e:
+                if reused:
+                    raise _StaleConnection(str(e) or type(e).__name__) from e
+                raise
+            if not status_line and reused:
+                raise _StaleConnection("Connection closed before response")
+            status, keep_alive = await self._read_response(reader, method, status_line)
+        except BaseException:
+            writer.close()
+            raise
+
+        idle = self._idle.setdefault(key, [])
+        if keep_alive and (self.pool_size is None or len(idle) < self.pool_size):
+            idle.append((reader, writer))
+        else:
+            writer.close()
+        return status
+
+    async def _read_response(self, reader, method: str, status_line: bytes) -> Tuple[int, bool]:
+        while True:
+            if not status_line:
+                raise HttpProtocolError("Connection closed before response")
+            parts = status_line.decode("latin-1").split(None, 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+                raise HttpProtocolError(f"Malformed status line: {status_line!r}")
+            version, status = parts[0], int(parts[1])
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            # Skip interim responses such as 100 Continue
+            if 100 <= status < 200 and status != 101:
+                status_line = await reader.readline()
+                continue
+            break
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, keep_alive
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            await self._drain_chunked(reader)
+        elif "content-length" in headers:
+            await self._drain(reader, int(headers["content-length"]))
+        else:
+            # Body runs until the server closes the connection
+            while await reader.read(_READ_CHUNK):
+                pass
+            keep_alive = False
+        return status, keep_alive
+
+    async def _drain(self, reader, length: int):
+        while length > 0:
+            chunk = await reader.read(min(length, _READ_CHUNK))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", length)
+            length -= len(chunk)
+
+    async def _drain_chunked(self, reader):
+        while True:
+            size_line = await reader.readline()
+            if not size_line:
+                raise asyncio.IncompleteReadError(b"", None)
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Trailer headers end with a blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            await self._drain(reader, size + 2)
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class AiohttpClient:
+    """HTTP client backed by aiohttp's pooled connector.
+
+    One session serves every role, so it keeps no cookies: a cookie set on
+    one role's cell must never be sent with another role's request. The
+    connector has no separate idle limit, so ``pool_size`` caps the
+    connections it opens per host.
+    """
+
+    def __init__(self, concurrency: int, per_host_limit: int, pool_size: Optional[int] = None):
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=pool_size or per_host_limit)
+        self._session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+
+    async def request(self, method: str, url: str, headers: Mapping[str, str]) -> int:
+        async with self._session.request(method, url, headers=headers) as response:
+            await response.read()
+            return response.status
+
+    async def close(self):
+        await self._session.close()
+
+
+def create_client(concurrency: int, per_host_limit: int, pool_size: Optional[int] = None):
+    """Create the best available async HTTP client"""
+    if aiohttp is not None:
+        return AiohttpClient(concurrency, per_host_limit, pool_size)
+    return StdlibHttpClient(pool_size or per_host_limit)
+
+
+async def run_spec_async(
+    spec: Dict[str, Any],
+    concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+    per_host_limit: int = DEFAULT_ASYNC_PER_HOST_LIMIT,
+    timeout: Optional[float] = None,
+    client=None,
+    dedupe: bool = False,
+    pool_size: Optional[int] = None,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Run the matrix on the current event loop and return {endpoint: {role: result}}.
+
+    ``dedupe`` coalesces identical requests as in MatrixExecutor.
+    ``pool_size`` is the keep-alive connections kept per host, shared by
+    every role; it defaults to ``per_host_limit``.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if per_host_limit < 1:
+        raise ValueError("per_host_limit must be at least 1")
+    if pool_size is not None and pool_size < 1:
+        raise ValueError("pool_size must be at least 1")
+
+    owns_client = client is None
+    if owns_client:
+        client = create_client(concurrency, per_host_limit, pool_size)
+
+    cell_results: Dict[tuple, Dict[str, Any]] = {}
+    host_slots: Dict[str, asyncio.Semaphore] = {}
+    requests = CompiledSpec(spec).requests(coalesce=dedupe)
+
+    async def send(template):
+        start = time.time()
+        try:
+            if timeout is None:
+                status = await client.request(template.method, template.url, template.headers)
+            else:
+                status = await asyncio.wait_for(client.request(template.method, template.url, template.headers), timeout)
+        except asyncio.TimeoutError:
+            return None, None, f"Request timed out after {timeout}s"
+        except Exception as e:
+            return None, None, str(e) or type(e).__name__
+        return status, int((time.time() - start) * 1000), None
+
+    async def worker():
+        # Workers share one iterator, so only `concurrency` requests exist at a time
+        for index, name, template, cells in requests:
+            checks = []
+            for role, expect in cells:
+                if expect:
+                    checks.append((role, expect))
+                else:
+                    cell_results[(index, role)] = {"status": "SKIP"}
+            if not checks:
+                continue
+            slot = host_slots.get(template.host)
+            if slot is None:
+                slot = host_slots[template.host] = asyncio.Semaphore(per_host_limit)
+            async with slot:
+                outcome = await send(template)
+            for role, result in grade_cells(checks, *outcome):
+                cell_results[(index, role)] = result
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        if owns_client:
+            await client.close()
+
+    return assemble_results(spec, cell_results)
+
+
+def run_spec_asyncio(
+    spec: Dict[str, Any],
+    concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+    per_host_limit: int = DEFAULT_ASYNC_PER_HOST_LIMIT,
+    timeout: Optional[float] = None,
+    dedupe: bool = False,
+    pool_size: Optional[int] = None,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Run the matrix on a fresh event loop (blocking)"""
+    return asyncio.run(run_spec_async(spec, concurrency, per_host_limit, timeout, dedupe=dedupe, pool_size=pool_size))
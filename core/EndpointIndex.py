@@ -0,0 +1,145 @@
+"""
+Lookup tables over a spec's endpoint list.
+
+Endpoints are stored as a plain list so their order matches the tables and
+result rows. ``EndpointIndex`` keeps row numbers keyed by (method,
+normalized path), by name and by folder next to that list, so duplicate
+checks and merges are dictionary lookups instead of scans.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+EndpointKey = Tuple[str, str]
+
+
+def normalize_path(path: str) -> str:
+    """Canonical form of an endpoint path for matching.
+
+    Query strings and fragments are dropped, empty segments collapsed and a
+    single leading slash enforced: ``users//1/?x=1`` becomes ``/users/1``.
+    """
+    path = (path or "").split("#", 1)[0].split("?", 1)[0].strip()
+    return "/" + "/".join(part for part in path.split("/") if part)
+
+
+def endpoint_key(method: str, path: str) -> EndpointKey:
+    """Key identifying an endpoint: (upper-case method, normalized path)"""
+    return (method or "GET").upper(), normalize_path(path)
+
+
+class EndpointIndex:
+    """Row indexes over a list of endpoint dicts.
+
+    The index refers to ``endpoints`` without copying it; callers that edit
+    the list report each change through ``add``, ``update`` and ``remove``.
+    ``is_current`` tells whether the index still describes a given list.
+    """
+
+    def __init__(self, endpoints: List[Dict[str, Any]]):
+        self.endpoints = endpoints
+        self._row_keys: List[Tuple[EndpointKey, str, str]] = [self._keys(ep) for ep in endpoints]
+        self._rebuild()
+
+    @staticmethod
+    def _keys(ep: Dict[str, Any]) -> Tuple[EndpointKey, str, str]:
+        return endpoint_key(ep.get("method", "GET"), ep.get("path", "")), ep.get("name", ""), ep.get("folder", "")
+
+    def _rebuild(self):
+        self._by_key: Dict[EndpointKey, List[int]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_folder: Dict[str, List[int]] = {}
+        for row, keys in enumerate(self._row_keys):
+            self._insert(row, keys)
+
+    def _insert(self, row: int, keys: Tuple[EndpointKey, str, str]):
+        key, name, folder = keys
+        self._by_key.setdefault(key, []).append(row)
+        self._by_name.setdefault(name, []).append(row)
+        self._by_folder.setdefault(folder, []).append(row)
+
+    def _discard(self, row: int, keys: Tuple[EndpointKey, str, str]):
+        for table, value in zip((self._by_key, self._by_name, self._by_folder), keys):
+            rows = table[value]
+            rows.remove(row)
+            if not rows:
+                del table[value]
+
+    def __len__(self) -> int:
+        return len(self._row_keys)
+
+    def is_current(self, endpoints: List[Dict[str, Any]]) -> bool:
+        """Whether this index was built for ``endpoints`` and has seen every row"""
+        return endpoints is self.endpoints and len(endpoints) == len(self._row_keys)
+
+    # Maintenance
+    def add(self, row: int):
+        """Index a row appended at the end of the list"""
+        if row != len(self._row_keys):
+            raise IndexError("rows can only be added at the end")
+        keys = self._keys(self.endpoints[row])
+        self._row_keys.append(keys)
+        self._insert(row, keys)
+
+    def update(self, row: int):
+        """Re-index a row whose method, path, name or folder changed"""
+        keys = self._keys(self.endpoints[row])
+        if keys != self._row_keys[row]:
+            self._discard(row, self._row_keys[row])
+            self._row_keys[row] = keys
+            for table, value in zip((self._by_key, self._by_name, self._by_folder), keys):
+                rows = table.setdefault(value, [])
+                rows.append(row)
+                rows.sort()
+
+    def remove(self, row: int):
+        """Forget a deleted row; later rows move up by one"""
+        del self._row_keys[row]
+        self._rebuild()
+
+    # Queries
+    def find(self, method: str, path: str) -> Optional[int]:
+        """First row with this (method, path), or None"""
+        rows = self._by_key.get(endpoint_key(method, path))
+        return rows[0] if rows else None
+
+    def rows(self, method: str, path: str) -> List[int]:
+        """Every row with this (method, path)"""
+        return list(self._by_key.get(endpoint_key(method, path), ()))
+
+    def named(self, name: str) -> List[int]:
+        """Rows whose endpoint has this name"""
+        return list(self._by_name.get(name, ()))
+
+    def in_folder(self, folder: str) -> List[int]:
+        """Rows imported from this collection folder ("" for top level)"""
+        return list(self._by_folder.get(folder, ()))
+
+    def folders(self) -> List[str]:
+        """Folders that hold at least one endpoint, in first-seen order"""
+        return [folder for folder in self._by_folder if folder]
+
+    def duplicates(self) -> Dict[EndpointKey, List[int]]:
+        """(method, path) keys that appear on more than one row"""
+        return {key: list(rows) for key, rows in self._by_key.items() if len(rows) > 1}
+
+
+def merge_endpoints(
+    endpoints: List[Dict[str, Any]], incoming: Iterable[Dict[str, Any]], index: Optional[EndpointIndex] = None
+) -> Tuple[List[int], List[int]]:
+    """Merge endpoint dicts into ``endpoints`` by (method, normalized path).
+
+    A known endpoint gets the incoming expectations layered over its own;
+    anything else is appended. Returns the (added, updated) row numbers.
+    """
+    index = index if index is not None else EndpointIndex(endpoints)
+    added: List[int] = []
+    updated: List[int] = []
+    for ep in incoming:
+        row = index.find(ep.get("method", "GET"), ep.get("path", ""))
+        if row is None:
+            endpoints.append({**ep, "expect": dict(ep.get("expect") or {})})
+            index.add(len(endpoints) - 1)
+            added.append(len(endpoints) - 1)
+        else:
+            endpoints[row].setdefault("expect", {}).update(ep.get("expect") or {})
+            updated.append(row)
+    return added, updated
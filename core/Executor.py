@@ -0,0 +1,302 @@
+"""
+Concurrent execution engine for the authorization matrix.
+
+A matrix run is made of cells, one per (endpoint, role) pair. The executor
+dispatches the cells that have an expectation onto a bounded thread pool and
+caps how many requests may be in flight against any single host.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from .RequestTemplates import CellCheck, CompiledSpec, RequestTemplate, build_template
+from .Sessions import SessionPool
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST_LIMIT = 8
+
+# Callback invoked for every finished cell: (endpoint_name, role, result)
+ResultCallback = Callable[[str, str, Dict[str, Any]], None]
+
+
+def status_matches(expect: Dict[str, Any], status_code: int) -> bool:
+    """Check a response status code against an expectation"""
+    allowed = expect.get("status")
+    if isinstance(allowed, list):
+        return status_code in allowed
+    return status_code == allowed
+
+
+def grade_response(expect: Dict[str, Any], status_code: int, latency_ms: int) -> Dict[str, Any]:
+    """Build the result dict for a response"""
+    if not status_matches(expect, status_code):
+        return {"status": "FAIL", "http": status_code}
+    return {"status": "PASS", "http": status_code, "latency_ms": latency_ms}
+
+
+def grade_cells(
+    cells: Sequence[CellCheck],
+    status_code: Optional[int],
+    latency_ms: Optional[int],
+    error: Optional[str] = None,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Grade one request's outcome for every (role, expect) cell that shares it.
+
+    Every result after the first is marked ``coalesced``: its request was
+    not sent again (see ``count_coalesced``).
+    """
+    results = []
+    for role, expect in cells:
+        if error is not None:
+            result = {"status": "FAIL", "error": error}
+        else:
+            result = grade_response(expect, status_code, latency_ms)
+        if results:
+            result["coalesced"] = True
+        results.append((role, result))
+    return results
+
+
+def count_coalesced(results: Dict[str, Dict[str, Dict[str, Any]]]) -> int:
+    """Number of cells in a run's results that reused another cell's request"""
+    return sum(1 for row in results.values() for result in row.values() if result.get("coalesced"))
+
+
+def build_request(spec: Dict[str, Any], ep: Dict[str, Any], role_spec: Dict[str, Any]):
+    """Build (method, url, headers) for one cell"""
+    template = build_template(spec, ep, role_spec)
+    return template.method, template.url, dict(template.headers)
+
+
+def iter_cells(spec: Dict[str, Any], cell_range: Optional[Tuple[int, int]] = None):
+    """Yield (index, name, endpoint, role, role_spec, expect) for every cell in spec order.
+
+    ``cell_range`` limits the walk to the cells in [start, stop) of the
+    flattened endpoint-by-role grid.
+    """
+    roles = list(spec["roles"].items())
+    if not roles:
+        return
+    endpoints = spec["endpoints"]
+    start, stop = cell_range or (0, len(endpoints) * len(roles))
+    first = start // len(roles)
+    cells = (
+        (index, ep, role, role_spec)
+        for index, ep in enumerate(endpoints[first:], first)
+        for role, role_spec in roles
+    )
+    for index, ep, role, role_spec in itertools.islice(cells, start - first * len(roles), stop - first * len(roles)):
+        name = ep.get("name") or ep["path"]
+        yield index, name, ep, role, role_spec, (ep.get("expect") or {}).get(role)
+
+
+def count_cells(spec: Dict[str, Any]) -> int:
+    """Number of cells in a spec's endpoint-by-role grid"""
+    return len(spec.get("endpoints", [])) * len(spec.get("roles", {}))
+
+
+def split_cell_ranges(total: int, parts: int) -> List[Tuple[int, int]]:
+    """Split ``total`` cells into at most ``parts`` contiguous, near-equal ranges"""
+    parts = max(1, min(parts, total))
+    size, extra = divmod(total, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        stop = start + size + (1 if i < extra else 0)
+        if stop > start:
+            ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def assemble_results(
+    spec: Dict[str, Any], cell_results: Dict[tuple, Dict[str, Any]], partial: bool = False
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Turn {(endpoint_index, role): result} into {endpoint: {role: result}}.
+
+    Rows are emitted in spec order and a repeated endpoint name keeps the
+    last row. With ``partial`` set, endpoints without any result are omitted.
+    """
+    roles = list(spec["roles"].keys())
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for index, ep in enumerate(spec["endpoints"]):
+        name = ep.get("name") or ep["path"]
+        row = {}
+        for role in roles:
+            if (index, role) in cell_results:
+                row[role] = cell_results[(index, role)]
+        if row or not partial:
+            results[name] = row
+    return results
+
+
+def evaluate_cell(
+    spec: Dict[str, Any],
+    ep: Dict[str, Any],
+    role_spec: Dict[str, Any],
+    expect: Dict[str, Any],
+    timeout: Optional[float] = None,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, Any]:
+    """Send the request for one cell and grade the response"""
+    return evaluate_template(build_template(spec, ep, role_spec), expect, timeout, session)
+
+
+def evaluate_template(
+    template: RequestTemplate,
+    expect: Dict[str, Any],
+    timeout: Optional[float] = None,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, Any]:
+    """Send a compiled cell request and grade the response"""
+    status_code, latency, error = send_template(template, timeout, session)
+    if error is not None:
+        return {"status": "FAIL", "error": error}
+    return grade_response(expect, status_code, latency)
+
+
+def send_template(
+    template: RequestTemplate,
+    timeout: Optional[float] = None,
+    session: Optional[requests.Session] = None,
+) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """Send a compiled request and return (status code, latency ms, error)"""
+    send = session.request if session is not None else requests.request
+
+    start = time.time()
+    try:
+        r = send(template.method, template.url, headers=template.headers, timeout=timeout)
+    except Exception as e:
+        return None, None, str(e)
+    return r.status_code, int((time.time() - start) * 1000), None
+
+
+class MatrixExecutor:
+    """Runs every cell of a spec on a bounded worker pool.
+
+    Args:
+        concurrency: Maximum number of requests in flight overall
+        per_host_limit: Maximum number of requests in flight per host
+        timeout: Per-request timeout in seconds (None waits forever)
+        pool_size: Keep-alive connections kept per (role, host) session;
+            defaults to ``per_host_limit``
+        sessions: Externally owned SessionPool to reuse across runs
+        dedupe: Send identical GET, HEAD and OPTIONS requests of an endpoint
+            once and grade the response for every role that shares it. The
+            request goes through the first such role's session.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        timeout: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        sessions: Optional[SessionPool] = None,
+        dedupe: bool = False,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if per_host_limit < 1:
+            raise ValueError("per_host_limit must be at least 1")
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.pool_size = pool_size or per_host_limit
+        self.sessions = sessions
+        self.dedupe = dedupe
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        """Get the semaphore limiting concurrent requests to a host"""
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def run(
+        self,
+        spec: Dict[str, Any],
+        on_result: Optional[ResultCallback] = None,
+        stop_event=None,
+        cell_range: Optional[Tuple[int, int]] = None,
+        compiled: Optional[CompiledSpec] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Run the matrix and return {endpoint: {role: result}}.
+
+        ``on_result`` is called as each cell finishes; it runs on a worker
+        thread, so it must be thread-safe. Setting ``stop_event`` stops
+        dispatching new cells; cells that never ran are left out of the
+        returned results. ``cell_range`` runs only a slice of the matrix
+        (see ``iter_cells``) and returns just the rows it touched. Pass
+        ``compiled`` to reuse the prepared headers of an unchanged spec.
+        """
+        if compiled is None:
+            compiled = CompiledSpec(spec)
+        cell_results: Dict[tuple, Dict[str, Any]] = {}
+        results_lock = threading.Lock()
+        errors = []
+        sessions = self.sessions if self.sessions is not None else SessionPool(self.pool_size)
+
+        def stopped() -> bool:
+            return stop_event is not None and stop_event.is_set()
+
+        def record(index: int, name: str, role: str, result: Dict[str, Any]):
+            with results_lock:
+                cell_results[(index, role)] = result
+            if on_result:
+                on_result(name, role, result)
+
+        # Keep at most two cells queued per worker so memory stays flat
+        # and a stop request takes effect quickly
+        window = threading.BoundedSemaphore(self.concurrency * 2)
+
+        def run_request(index, name, template, checks):
+            try:
+                if stopped():
+                    return
+                with self._host_slot(template.host):
+                    if stopped():
+                        return
+                    session = sessions.get_for_origin(checks[0][0], template.origin)
+                    outcome = send_template(template, self.timeout, session)
+                for role, result in grade_cells(checks, *outcome):
+                    record(index, name, role, result)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                window.release()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for index, name, template, cells in compiled.requests(cell_range, self.dedupe):
+                    if stopped():
+                        break
+                    checks = []
+                    for role, expect in cells:
+                        if expect:
+                            checks.append((role, expect))
+                        else:
+                            record(index, name, role, {"status": "SKIP"})
+                    if not checks:
+                        continue
+                    window.acquire()
+                    if stopped():
+                        window.release()
+                        break
+                    pool.submit(run_request, index, name, template, checks)
+        finally:
+            if sessions is not self.sessions:
+                sessions.close()
+
+        if errors:
+            raise errors[0]
+
+        return assemble_results(spec, cell_results, partial=stopped() or cell_range is not None)
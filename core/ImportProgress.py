@@ -0,0 +1,75 @@
+"""
+Progress reporting and cancellation for imports run off the GUI thread.
+
+An import function takes an ``ImportProgress``: it calls ``report`` as it
+goes and ``check`` at safe points, which raises ``ImportCancelled`` once
+someone has called ``cancel`` from another thread. ``ProgressReader`` does
+both for file reads, so streaming parsers get progress and cancellation
+without knowing about either.
+"""
+import os
+import threading
+from typing import IO, Callable, Optional
+
+
+class ImportCancelled(Exception):
+    """The import was cancelled before it finished"""
+
+
+class ImportProgress:
+    """Thread-safe progress and cancellation state for one import.
+
+    ``on_progress`` is called with a percentage each time it changes, on
+    the thread doing the work.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[int], None]] = None):
+        self._cancelled = threading.Event()
+        self._on_progress = on_progress
+        self._percent = -1
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Raise ImportCancelled if the import was cancelled"""
+        if self._cancelled.is_set():
+            raise ImportCancelled()
+
+    def report(self, done: int, total: int):
+        """Record that ``done`` of ``total`` units are finished"""
+        self.check()
+        percent = min(100, done * 100 // total) if total > 0 else 0
+        if percent != self._percent:
+            self._percent = percent
+            if self._on_progress is not None:
+                self._on_progress(percent)
+
+
+class ProgressReader:
+    """Binary file wrapper that reports bytes read and honours cancellation"""
+
+    def __init__(self, stream: IO[bytes], progress: ImportProgress):
+        self._stream = stream
+        self._progress = progress
+        self._total = os.fstat(stream.fileno()).st_size
+        self._done = 0
+
+    def read(self, size: int = -1) -> bytes:
+        return self._advance(self._stream.read(size))
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._advance(self._stream.readline(size))
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._done = self._stream.seek(offset, whence)
+        return self._done
+
+    def _advance(self, data: bytes) -> bytes:
+        self._done += len(data)
+        self._progress.report(self._done, self._total)
+        return data
@@ -0,0 +1,212 @@
+"""
+Postman collection to AuthMatrix conversion.
+
+The CLI, SpecStore and the import dialog all convert collections here. A
+collection is first turned into ``PostmanRequest`` tuples, either from a
+parsed document (``iter_requests``) or from a file as it streams
+(``core.PostmanStream``); ``read_requests`` then derives the endpoints and
+base URL in a single pass over them.
+
+URLs are read the way Postman reads them: a URL object's ``host``, ``port``
+and ``path`` take precedence over its ``raw`` string, and a raw URL without
+a protocol starts with its host (``{{baseUrl}}/users`` is ``/users``).
+Paths are kept as the collection defines them, trailing slashes and empty
+segments included, so the tool tests the same URLs; only the query string
+and fragment are dropped. Matching and de-duplication compare paths through
+core.EndpointIndex.normalize_path instead.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+# Bump whenever conversion output changes, so cached conversions are redone
+CONVERTER_VERSION = 2
+
+# A host that is only a collection variable, e.g. {{baseUrl}}
+_VARIABLE_HOST = re.compile(r"\{\{[^{}]*\}\}")
+
+
+class PostmanRequest(NamedTuple):
+    """One request item as found in a collection"""
+
+    name: Optional[str]
+    method: str
+    url: Any  # raw URL string or Postman URL object
+    auth: Optional[Dict[str, Any]]
+    folders: Tuple[str, ...]  # enclosing folder names, outermost first
+
+
+class ParsedUrl(NamedTuple):
+    """The parts of a request URL an import uses"""
+
+    base_url: Optional[str]  # scheme://host[:port], None if no usable host
+    path: str
+
+
+def _base_url(protocol: str, host: str, port: Any = None) -> Optional[str]:
+    if not host or _VARIABLE_HOST.fullmatch(host):
+        return None
+    return f"{protocol}://{host}:{port}" if port else f"{protocol}://{host}"
+
+
+def request_path(path: str) -> str:
+    """A request path without its query string or fragment, starting with a slash"""
+    path = path.split("#", 1)[0].split("?", 1)[0].strip()
+    return path if path.startswith("/") else "/" + path
+
+
+@lru_cache(maxsize=4096)
+def parse_raw_url(raw: str) -> ParsedUrl:
+    """Split a raw URL string into its base URL and request path"""
+    raw = raw.strip()
+    if "://" not in raw:
+        # No protocol: everything up to the first slash is the host
+        _, _, path = raw.partition("/")
+        return ParsedUrl(None, request_path(path))
+    try:
+        parsed = urlparse(raw)
+    except ValueError:  # e.g. an unbalanced IPv6 bracket
+        return ParsedUrl(None, "/")
+    return ParsedUrl(_base_url(parsed.scheme, parsed.netloc), request_path(parsed.path))
+
+
+def parse_url(url: Any) -> ParsedUrl:
+    """Base URL and request path of a request's ``url`` value"""
+    if isinstance(url, str):
+        return parse_raw_url(url)
+    if not isinstance(url, dict):
+        return ParsedUrl(None, "/")
+
+    raw = url.get("raw")
+    from_raw = parse_raw_url(raw) if isinstance(raw, str) else ParsedUrl(None, "/")
+
+    host = url.get("host")
+    if isinstance(host, list):
+        host = ".".join(str(part) for part in host)
+    if isinstance(host, str) and host:
+        base_url = _base_url(url.get("protocol") or "https", host, url.get("port"))
+    else:
+        base_url = from_raw.base_url
+
+    path = url.get("path")
+    if isinstance(path, list):
+        path = "/" + "/".join(str(segment) for segment in path)
+    elif isinstance(path, str):
+        path = request_path(path)
+    else:
+        path = from_raw.path
+    return ParsedUrl(base_url, path)
+
+
+def folder_path(folders: Iterable[str]) -> str:
+    """Folder names joined as ``outer/inner``; unnamed folders are skipped"""
+    return "/".join(folder for folder in folders if folder)
+
+
+def bearer_token(auth: Any) -> Optional[str]:
+    """Token of a Postman bearer auth block, or None if there is none"""
+    if not isinstance(auth, dict) or auth.get("type") != "bearer":
+        return None
+    bearer = auth.get("bearer")
+    if isinstance(bearer, dict):  # collection format v2.0
+        return bearer.get("token")
+    for entry in bearer or []:
+        if isinstance(entry, dict) and entry.get("key") == "token":
+            return entry.get("value", "")
+    return None
+
+
+def auth_config(auth: Any) -> Dict[str, Any]:
+    """AuthMatrix role auth for a Postman auth block"""
+    if isinstance(auth, dict) and auth.get("type") == "bearer":
+        return {"type": "bearer", "token": bearer_token(auth) or ""}
+    return {"type": "none"}
+
+
+def iter_requests(collection: Dict[str, Any], folders: Tuple[str, ...] = ()) -> Iterator[PostmanRequest]:
+    """Yield the requests of a parsed collection (or folder) in document order"""
+    items = collection.get("item")
+    for item in items if isinstance(items, list) else ():
+        if not isinstance(item, dict):
+            continue
+        name = item.get("name")
+        name = name if isinstance(name, str) else None
+        if "request" in item:
+            request = item["request"]
+            if isinstance(request, str):
+                # A bare URL string is shorthand for a GET request
+                request = {"url": request}
+            elif not isinstance(request, dict):
+                request = {}
+            yield PostmanRequest(
+                name, request.get("method") or "GET", request.get("url", {}), request.get("auth"), folders
+            )
+        elif "item" in item:
+            yield from iter_requests(item, folders + (name or "",))
+
+
+def read_requests(requests: Iterable[PostmanRequest]) -> Tuple[str, List[Dict[str, Any]]]:
+    """Base URL and endpoints (name, method, path, folder) for some requests.
+
+    The base URL is that of the first request naming a usable host.
+    """
+    base_url = None
+    endpoints = []
+    for request in requests:
+        url = parse_url(request.url)
+        if base_url is None:
+            base_url = url.base_url
+        method = str(request.method).upper()
+        name = request.name if request.name is not None else f"{method} {url.path}"
+        endpoint = {"name": name, "method": method, "path": url.path}
+        folder = folder_path(request.folders)
+        if folder:
+            endpoint["folder"] = folder
+        endpoints.append(endpoint)
+    return base_url or "", endpoints
+
+
+def build_spec(base_url: str, endpoints: List[Dict[str, Any]], auth: Any = None) -> Dict[str, Any]:
+    """AuthMatrix spec for converted endpoints.
+
+    Endpoints start without expectations; a collection-level bearer token
+    becomes an ``admin`` role next to ``guest``.
+    """
+    for endpoint in endpoints:
+        endpoint["expect"] = {}
+    spec = {
+        "base_url": base_url,
+        "default_headers": {"Accept": "application/json"},
+        "roles": {"guest": {"auth": {"type": "none"}}},
+        "endpoints": endpoints,
+    }
+    token = bearer_token(auth)
+    if token is not None:
+        spec["roles"]["admin"] = {"auth": {"type": "bearer", "token": token}}
+    return spec
+
+
+def collection_base_url(collection: Dict[str, Any]) -> str:
+    """Base URL of a parsed collection"""
+    for request in iter_requests(collection):
+        base_url = parse_url(request.url).base_url
+        if base_url is not None:
+            return base_url
+    return ""
+
+
+def collection_endpoints(collection: Dict[str, Any], path_prefix: str = "") -> List[Dict[str, Any]]:
+    """Spec endpoints, with empty expectations, for a parsed collection.
+
+    ``path_prefix`` is the folder path (``/outer/inner``) the collection or
+    folder sits in; its folders are put in front of each endpoint's folder.
+    """
+    folders = tuple(folder for folder in path_prefix.split("/") if folder)
+    return build_spec(*read_requests(iter_requests(collection, folders)))["endpoints"]
+
+
+def collection_to_spec(collection: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a parsed Postman collection to an AuthMatrix spec"""
+    base_url, endpoints = read_requests(iter_requests(collection))
+    return build_spec(base_url, endpoints, collection.get("auth"))
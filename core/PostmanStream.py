@@ -0,0 +1,312 @@
+"""
+Streaming Postman collection reader.
+
+Generated collections can be hundreds of megabytes, mostly request bodies
+and saved responses that AuthMatrix never looks at. Instead of parsing the
+whole document, ``PostmanCollectionStream`` walks a stream of JSON events
+and keeps only what an import needs: each request's name, method, URL,
+auth and folder path, plus the collection's ``info`` and ``auth``.
+Everything else is skipped as it goes by, so memory depends on how deeply
+the collection is nested rather than on its size.
+
+ijson is used for tokenizing when it is installed; otherwise a small
+stdlib tokenizer with the same event format is used.
+"""
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from .PostmanConvert import PostmanRequest, build_spec, read_requests
+
+try:
+    import ijson
+except ImportError:  # Optional dependency
+    ijson = None
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+
+# Request fields an import reads; bodies, headers and scripts are skipped
+_REQUEST_FIELDS = ("method", "url", "auth")
+
+Event = Tuple[str, Any]
+
+
+def iter_json_events(stream: IO, chunk_size: int = CHUNK_SIZE) -> Iterator[Event]:
+    """Yield ijson-style ``(event, value)`` pairs from a text or binary stream.
+
+    Events are start_map, map_key, end_map, start_array, end_array, string,
+    number, boolean and null.
+    """
+    if ijson is not None:
+        if isinstance(stream.read(0), str):
+            stream = _Utf8Reader(stream)
+        try:
+            yield from ijson.basic_parse(stream, use_float=True)
+        except ijson.JSONError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from None
+        return
+    yield from _iter_events(stream, chunk_size)
+
+
+class _Utf8Reader:
+    """Byte view of a text stream, for parsers that want bytes"""
+
+    def __init__(self, stream: IO):
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size).encode("utf-8")
+
+
+def _error(message: str, buf: str, pos: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, buf, pos)
+
+
+def _iter_events(stream: IO, chunk_size: int) -> Iterator[Event]:
+    # Values are tokenized strictly; separators are only skipped, so a
+    # missing comma or colon is tolerated rather than reported
+    decoder = None
+    if not isinstance(stream.read(0), str):
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill(min_size: int = chunk_size) -> bool:
+        """Append at least ``min_size`` more characters; False at end of input"""
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        data = stream.read(max(min_size, chunk_size))
+        if decoder is not None:
+            raw = data
+            data = decoder.decode(raw, final=not raw)
+            while raw and not data:
+                # The chunk ended inside a multi-byte character
+                raw = stream.read(chunk_size)
+                data = decoder.decode(raw, final=not raw)
+        if not data:
+            eof = True
+            return False
+        buf = buf[pos:] + data
+        pos = 0
+        return True
+
+    # Each open container is [is_map, expecting_key]
+    stack: List[list] = []
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if fill():
+                continue
+            if stack:
+                raise _error("Unexpected end of JSON input", buf, pos)
+            return
+
+        c = buf[pos]
+        if c == ",":
+            pos += 1
+            if stack and stack[-1][0]:
+                stack[-1][1] = True
+        elif c == ":":
+            pos += 1
+        elif c == "{":
+            pos += 1
+            stack.append([True, True])
+            yield "start_map", None
+        elif c == "}":
+            if not stack or not stack[-1][0]:
+                raise _error("Unexpected '}'", buf, pos)
+            pos += 1
+            stack.pop()
+            yield "end_map", None
+        elif c == "[":
+            pos += 1
+            stack.append([False, False])
+            yield "start_array", None
+        elif c == "]":
+            if not stack or stack[-1][0]:
+                raise _error("Unexpected ']'", buf, pos)
+            pos += 1
+            stack.pop()
+            yield "end_array", None
+        elif c == '"':
+            while True:
+                try:
+                    value, end = scanstring(buf, pos + 1)
+                    break
+                except json.JSONDecodeError:
+                    # Grow geometrically so a huge string is rescanned O(log n) times
+                    if not fill(len(buf) - pos):
+                        raise
+            pos = end
+            if stack and stack[-1][0] and stack[-1][1]:
+                stack[-1][1] = False
+                yield "map_key", value
+            else:
+                yield "string", value
+        elif c in _LITERALS:
+            word, value = _LITERALS[c]
+            while len(buf) - pos < len(word) and fill():
+                pass
+            if buf.startswith(word, pos):
+                pos += len(word)
+                yield ("null" if value is None else "boolean"), value
+            else:
+                raise _error("Expecting value", buf, pos)
+        else:
+            # Find where the token ends before validating it, so a number cut
+            # off at the end of the buffer is not mistaken for a shorter one
+            end = _NUMBER_CHARS.match(buf, pos).end()
+            while end == len(buf) and fill():
+                end = _NUMBER_CHARS.match(buf, pos).end()
+            text = buf[pos:end]
+            if not _NUMBER.fullmatch(text):
+                raise _error("Expecting value", buf, pos)
+            pos = end
+            is_float = "." in text or "e" in text or "E" in text
+            yield "number", float(text) if is_float else int(text)
+
+
+def _build(events: Iterator[Event], event: str, value: Any) -> Any:
+    """Materialize the JSON value that starts with (event, value)"""
+    if event == "start_map":
+        obj = {}
+        for event, key in events:
+            if event == "end_map":
+                return obj
+            obj[key] = _build(events, *next(events))
+    if event == "start_array":
+        arr = []
+        for event, value in events:
+            if event == "end_array":
+                return arr
+            arr.append(_build(events, event, value))
+    return value
+
+
+def _skip(events: Iterator[Event], event: str):
+    """Consume the rest of a value that starts with ``event``"""
+    if event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if not depth:
+                return
+
+
+class PostmanCollectionStream:
+    """Single-pass reader over a Postman collection file object.
+
+    Iterate ``requests()`` to get every request in document order;
+    ``info`` and ``auth`` hold the collection-level values once they have
+    been read (always after the iteration finishes).
+    """
+
+    def __init__(self, stream: IO, chunk_size: int = CHUNK_SIZE):
+        self._events = iter_json_events(stream, chunk_size)
+        self.info: Dict[str, Any] = {}
+        self.auth: Optional[Dict[str, Any]] = None
+        self.is_collection = False
+
+    def requests(self) -> Iterator[PostmanRequest]:
+        events = self._events
+        event, _ = next(events, ("end", None))
+        if event != "start_map":
+            raise ValueError("A Postman collection must be a JSON object")
+        seen = set()
+        for event, key in events:
+            if event == "end_map":
+                break
+            event, value = next(events)
+            seen.add(key)
+            if key == "item" and event == "start_array":
+                yield from self._items(())
+            elif key == "info":
+                self.info = _build(events, event, value)
+            elif key == "auth":
+                self.auth = _build(events, event, value)
+            else:
+                _skip(events, event)
+        self.is_collection = {"info", "item"} <= seen
+
+    def _items(self, folders: Tuple[str, ...]) -> Iterator[PostmanRequest]:
+        events = self._events
+        for event, _ in events:
+            if event == "end_array":
+                return
+            if event != "start_map":
+                _skip(events, event)
+                continue
+            yield from self._item(folders)
+
+    def _item(self, folders: Tuple[str, ...]) -> Iterator[PostmanRequest]:
+        events = self._events
+        name = None
+        request = None
+        pending: List[PostmanRequest] = []  # children read before the folder's name
+        for event, key in events:
+            if event == "end_map":
+                break
+            event, value = next(events)
+            if key == "name" and event == "string":
+                name = value
+            elif key == "request":
+                request = self._request(event, value)
+            elif key == "item" and event == "start_array":
+                if name is None:
+                    pending.extend(self._items(folders + (None,)))
+                else:
+                    yield from self._items(folders + (name,))
+            else:
+                _skip(events, event)
+
+        if request is not None:
+            yield PostmanRequest(name, request.get("method") or "GET", request.get("url", {}), request.get("auth"), folders)
+        else:
+            depth = len(folders)
+            for child in pending:
+                child_folders = child.folders[:depth] + (name or "",) + child.folders[depth + 1:]
+                yield child._replace(folders=child_folders)
+
+    def _request(self, event: str, value: Any) -> Dict[str, Any]:
+        events = self._events
+        if event == "string":
+            # A bare URL string is shorthand for a GET request
+            return {"url": value}
+        if event != "start_map":
+            _skip(events, event)
+            return {}
+        request = {}
+        for event, key in events:
+            if event == "end_map":
+                return request
+            event, value = next(events)
+            if key in _REQUEST_FIELDS:
+                request[key] = _build(events, event, value)
+            else:
+                _skip(events, event)
+        return request
+
+
+def convert_collection(stream: IO, chunk_size: int = CHUNK_SIZE) -> Tuple[Dict[str, Any], bool]:
+    """Convert a Postman collection file object to an AuthMatrix spec.
+
+    Returns the spec and whether the document was a collection (has both
+    ``info`` and ``item``).
+    """
+    collection = PostmanCollectionStream(stream, chunk_size)
+    base_url, endpoints = read_requests(collection.requests())
+    return build_spec(base_url, endpoints, collection.auth), collection.is_collection
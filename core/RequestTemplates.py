@@ -0,0 +1,172 @@
+"""
+Request templates prepared once per run.
+
+Preparing a cell's request used to copy the default headers, check the
+role's auth type, format the bearer header and join the URL for every
+cell, then parse that URL again to find its host and session. A
+``CompiledSpec`` prepares each role's headers and the base URL once per
+spec; the headers are shared read-only by all of the role's cells. Each
+endpoint's URL, host and origin are then worked out once for all roles,
+as runners walk ``CompiledSpec.cells`` and dispatch. Rows are built as
+they are walked, so a run holds only the rows in flight.
+
+Roles whose prepared headers are identical, such as several
+unauthenticated roles or roles sharing a token, share one template per
+endpoint. ``CompiledSpec.requests`` can use that to coalesce their cells
+into a single request (the opt-in dedupe mode).
+"""
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Only requests without side effects are coalesced; sending one POST for
+# several roles would change what the server sees
+COALESCE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# (role, expect) of each cell that shares a request
+CellCheck = Tuple[str, Optional[Dict[str, Any]]]
+
+
+class RequestTemplate(NamedTuple):
+    """Everything needed to send one cell's request"""
+
+    method: str
+    url: str
+    headers: Mapping[str, str]  # read-only, shared by every cell of the role
+    host: str  # lower-cased host[:port], for per-host limits
+    origin: str  # lower-cased scheme://host[:port], for session pooling
+
+
+class CompiledRow(NamedTuple):
+    """One endpoint's cells, in role order"""
+
+    name: str
+    templates: Tuple[RequestTemplate, ...]
+    expects: Tuple[Optional[Dict[str, Any]], ...]
+
+
+def prepare_headers(spec: Dict[str, Any], role_spec: Dict[str, Any]) -> Mapping[str, str]:
+    """Default headers plus the role's auth header, as a read-only mapping"""
+    headers = dict(spec.get("default_headers", {}))
+    auth = role_spec.get("auth", {})
+    if auth.get("type") == "bearer":
+        headers["Authorization"] = f"Bearer {auth.get('token')}"
+    return MappingProxyType(headers)
+
+
+def _target(url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    return host, f"{parts.scheme.lower()}://{host}"
+
+
+def build_template(spec: Dict[str, Any], ep: Dict[str, Any], role_spec: Dict[str, Any]) -> RequestTemplate:
+    """Template for a single cell; use CompiledSpec for whole runs"""
+    url = spec["base_url"].rstrip("/") + ep["path"]
+    return RequestTemplate(ep.get("method", "GET"), url, prepare_headers(spec, role_spec), *_target(url))
+
+
+class CompiledSpec:
+    """Role headers and base URL of a spec, prepared for building its cells.
+
+    The spec must not change while it is compiled; compile it again after
+    an edit.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.roles: Tuple[str, ...] = tuple(spec["roles"])
+        # Each row makes one template per distinct headers; role columns point into them
+        self._headers, self._columns = _shared_headers(
+            prepare_headers(spec, role_spec) for role_spec in spec["roles"].values()
+        )
+        self._base_url = spec["base_url"].rstrip("/")
+        self._base_target = _target(self._base_url)
+        self._endpoints = spec["endpoints"]
+
+    def __len__(self) -> int:
+        """Number of cells"""
+        return len(self._endpoints) * len(self.roles)
+
+    def row(self, index: int) -> CompiledRow:
+        """The templates and expectations of one endpoint, in role order"""
+        ep = self._endpoints[index]
+        method = ep.get("method", "GET")
+        path = ep["path"]
+        url = self._base_url + path
+        # A path starting with "/" cannot change the host of a base URL that has one
+        host, origin = self._base_target if path[:1] == "/" and self._base_target[0] else _target(url)
+        make = RequestTemplate._make
+        made = [make((method, url, role_headers, host, origin)) for role_headers in self._headers]
+        expect = ep.get("expect") or {}
+        return CompiledRow(
+            ep.get("name") or path,
+            tuple([made[column] for column in self._columns]),
+            tuple([expect.get(role) for role in self.roles]),
+        )
+
+    def cells(
+        self, cell_range: Optional[Tuple[int, int]] = None
+    ) -> Iterator[Tuple[int, str, str, RequestTemplate, Optional[Dict[str, Any]]]]:
+        """Yield (index, name, role, template, expect) for every cell in spec order.
+
+        ``cell_range`` limits the walk to the cells in [start, stop) of the
+        flattened endpoint-by-role grid, as in core.Executor.iter_cells.
+        """
+        width = len(self.roles)
+        if not width:
+            return
+        start, stop = cell_range or (0, len(self))
+        stop = min(stop, len(self))
+        roles = self.roles
+        row = self.row
+        for index in range(start // width, (stop + width - 1) // width):
+            name, templates, expects = row(index)
+            first = max(start - index * width, 0)
+            last = min(stop - index * width, width)
+            for column in range(first, last):
+                yield index, name, roles[column], templates[column], expects[column]
+
+    def requests(
+        self, cell_range: Optional[Tuple[int, int]] = None, coalesce: bool = False
+    ) -> Iterator[Tuple[int, str, RequestTemplate, Tuple[CellCheck, ...]]]:
+        """Yield (index, name, template, cells) for every request to send.
+
+        Without ``coalesce`` each cell is its own request. With it, the
+        cells of an endpoint that share a template and a method from
+        COALESCE_METHODS are yielded once, together, in role order.
+        """
+        if not coalesce:
+            for index, name, role, template, expect in self.cells(cell_range):
+                yield index, name, template, ((role, expect),)
+            return
+
+        row_index, row_name, groups = None, None, {}
+        for index, name, role, template, expect in self.cells(cell_range):
+            if index != row_index:
+                for shared, cells in groups.values():
+                    yield row_index, row_name, shared, tuple(cells)
+                row_index, row_name, groups = index, name, {}
+            key = id(template) if template.method.upper() in COALESCE_METHODS else (id(template), role)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = (template, [(role, expect)])
+            else:
+                group[1].append((role, expect))
+        for shared, cells in groups.values():
+            yield row_index, row_name, shared, tuple(cells)
+
+
+def _shared_headers(prepared: Iterator[Mapping[str, str]]) -> Tuple[List[Mapping[str, str]], Tuple[int, ...]]:
+    # Identical headers become one object, so identical requests share a template
+    unique: Dict[tuple, int] = {}
+    headers: List[Mapping[str, str]] = []
+    columns = []
+    for role_headers in prepared:
+        try:
+            column = unique.setdefault(tuple(role_headers.items()), len(headers))
+        except TypeError:  # unhashable header values are never shared
+            column = len(headers)
+        if column == len(headers):
+            headers.append(role_headers)
+        columns.append(column)
+    return headers, tuple(columns)
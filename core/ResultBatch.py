@@ -0,0 +1,126 @@
+"""
+Batched, compact result messages for streaming runs.
+
+Sending one pickled dict per cell makes queue overhead dominate large runs.
+Workers instead buffer finished cells and ship them as a single
+``("BATCH", None, None, entries)`` message, where each entry is a flat
+``(endpoint_index, role_index, status, http, latency_ms, error, extra)``
+tuple. ``extra`` is None unless the result has other keys, such as
+``coalesced``; it then holds those keys as a dict. Both sides derive the
+indexes from the same spec with ``result_keys``.
+"""
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_BATCH_DELAY = 0.05  # seconds
+
+# (endpoint_index, role_index, status, http, latency_ms, error, extra)
+PackedResult = Tuple[int, int, str, Optional[int], Optional[int], Optional[str], Optional[Dict[str, Any]]]
+
+# Result keys with a slot of their own; any others travel in ``extra``
+PACKED_KEYS = frozenset({"status", "http", "latency_ms", "error"})
+
+
+def result_keys(spec: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Get the (endpoint names, roles) that batch entries are indexed by.
+
+    Endpoint names are de-duplicated in spec order, matching the rows of
+    the results table.
+    """
+    names = dict.fromkeys(ep.get("name") or ep["path"] for ep in spec.get("endpoints", []))
+    return list(names), list(spec.get("roles", {}))
+
+
+def pack_result(endpoint_index: int, role_index: int, result: Dict[str, Any]) -> PackedResult:
+    """Encode one cell result as a flat tuple"""
+    extra = None
+    if not PACKED_KEYS.issuperset(result):
+        extra = {key: value for key, value in result.items() if key not in PACKED_KEYS}
+    return (
+        endpoint_index,
+        role_index,
+        result.get("status", ""),
+        result.get("http"),
+        result.get("latency_ms"),
+        result.get("error"),
+        extra,
+    )
+
+
+def unpack_results(
+    entries: Sequence[PackedResult], names: Sequence[str], roles: Sequence[str]
+) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """Decode batch entries into (endpoint_name, role, result) triples"""
+    decoded = []
+    for endpoint_index, role_index, status, http, latency_ms, error, extra in entries:
+        result: Dict[str, Any] = {"status": status}
+        if http is not None:
+            result["http"] = http
+        if latency_ms is not None:
+            result["latency_ms"] = latency_ms
+        if error is not None:
+            result["error"] = error
+        if extra:
+            result.update(extra)
+        decoded.append((names[endpoint_index], roles[role_index], result))
+    return decoded
+
+
+class ResultBatcher:
+    """Collects cell results and sends them in size- or time-bounded batches.
+
+    ``send`` receives each ``("BATCH", None, None, entries)`` message. A batch
+    goes out once it holds ``max_size`` entries or ``max_delay`` seconds after
+    its first entry, whichever comes first. ``add`` is thread-safe.
+    """
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        send: Callable[[tuple], None],
+        max_size: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_BATCH_DELAY,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        names, roles = result_keys(spec)
+        self._endpoint_index = {name: i for i, name in enumerate(names)}
+        self._role_index = {role: i for i, role in enumerate(roles)}
+        self._send = send
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._entries: List[PackedResult] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, endpoint_name: str, role: str, result: Dict[str, Any]):
+        """Buffer one finished cell"""
+        entry = pack_result(self._endpoint_index[endpoint_name], self._role_index[role], result)
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) >= self.max_size:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self._send(("BATCH", None, None, batch))
+
+    def flush(self):
+        """Send whatever is buffered right away"""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._send(("BATCH", None, None, batch))
+
+    def _take(self) -> List[PackedResult]:
+        # Caller holds the lock
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._entries = self._entries, []
+        return batch
@@ -0,0 +1,73 @@
+"""
+Pooled HTTP sessions for matrix runs.
+
+Each (role, host) pair gets its own keep-alive requests.Session so TCP and
+TLS connections are reused across the whole run. Sessions reject every
+cookie, so like a stateless request each cell is judged only by its own
+credentials: a Set-Cookie from one cell is never replayed on a later one.
+"""
+import http.cookiejar
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = 8
+
+
+class SessionPool:
+    """Hands out one pooled session per (role, host).
+
+    Args:
+        pool_size: Maximum number of keep-alive connections kept per session
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self._sessions: Dict[Tuple[str, str], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, role: str, url: str) -> requests.Session:
+        """Get the session used for a role's requests to a URL's host"""
+        parts = urlsplit(url)
+        return self.get_for_origin(role, f"{parts.scheme.lower()}://{parts.netloc.lower()}")
+
+    def get_for_origin(self, role: str, origin: str) -> requests.Session:
+        """Like ``get``, for an already normalized ``scheme://host[:port]``"""
+        key = (role, origin)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[key] = session
+        return session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def close(self):
+        """Close every session and its pooled connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,79 @@
+"""
+Hand a spec to worker processes once, through a memory-mapped file.
+
+Sending the spec with every job pickles it again for each slice and pushes
+every copy through a pipe. ``SharedSpec`` pickles it once into a temporary
+file, and only a small ``SpecHandle`` travels with the jobs. Workers map
+the file read-only and unpickle straight from the page cache.
+
+A file is used rather than ``multiprocessing.shared_memory`` because
+running out of space while writing it raises OSError, whereas overfilling
+a small /dev/shm (64 MB in default containers) kills the process.
+"""
+import gc
+import mmap
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+from typing import Any, NamedTuple, Optional
+
+
+class SpecHandle(NamedTuple):
+    """What a worker needs to load a shared spec; unique per SharedSpec"""
+
+    path: str
+    size: int
+
+
+class SharedSpec:
+    """A spec pickled once into a temporary file for workers to map"""
+
+    def __init__(self, spec: Any, directory: Optional[str] = None):
+        fd, path = tempfile.mkstemp(prefix="authmatrix-spec-", suffix=".pickle", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f, _gc_paused():
+                pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+        except BaseException:
+            _remove(path)
+            raise
+        self.spec = spec
+        self.handle = SpecHandle(path, size)
+
+    def close(self):
+        """Delete the file; workers that already mapped it are unaffected"""
+        _remove(self.handle.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_shared_spec(handle: SpecHandle) -> Any:
+    """Unpickle a shared spec from its mapped file"""
+    with open(handle.path, "rb") as f:
+        with mmap.mmap(f.fileno(), handle.size, access=mmap.ACCESS_READ) as view, _gc_paused():
+            return pickle.loads(view)
+
+
+@contextmanager
+def _gc_paused():
+    # A spec is hundreds of thousands of acyclic records, so garbage
+    # collection passes triggered by the allocations are wasted work
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:  # already gone, or still open by a worker on Windows
+        pass
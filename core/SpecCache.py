@@ -0,0 +1,182 @@
+"""
+On-disk cache of converted specs.
+
+Opening a large collection means parsing and converting it again every
+time. ``SpecCache`` keeps the converted result keyed by a hash of the file
+content and ``CONVERTER_VERSION``, so an unchanged file loads straight from
+the cache and a converter change invalidates every entry at once.
+
+Entries are stored with ``marshal``, which loads plain JSON values much
+faster than ``json`` and, unlike ``pickle``, cannot run code from a
+tampered cache file. The cache is bounded in size and evicts the least
+recently used entries first. A small per-path record of the file's size,
+modification time and hash lets a repeated open skip re-hashing the file;
+these records count towards the size limit and are evicted the same way.
+"""
+import gc
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from typing import Any, Callable, Optional
+
+from .PostmanConvert import CONVERTER_VERSION
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_DIR_ENV = "AUTHMATRIX_CACHE_DIR"
+
+_ENTRY_SUFFIX = ".spec"
+_STAT_SUFFIX = ".stat"
+_HASH_CHUNK = 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory, overridable with AUTHMATRIX_CACHE_DIR"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "AuthMatrix", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "authmatrix")
+
+
+class SpecCache:
+    """Content-addressed, size-bounded LRU cache of converted spec files.
+
+    Values must be marshal-able: plain JSON values, tuples and booleans.
+    Any problem reading or writing the cache counts as a miss, so the cache
+    can never stop a file from loading.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def load(
+        self, file_path: str, convert: Callable[[str], Any], keep: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """Cached ``convert(file_path)``, converting and storing on a miss.
+
+        ``keep`` can veto storing a converted value, e.g. one that holds
+        credentials.
+        """
+        key = self.key_for(file_path)
+        value = self.get(key)
+        if value is None:
+            value = convert(file_path)
+            if keep is None or keep(value):
+                self.put(key, value)
+        return value
+
+    def key_for(self, file_path: str) -> str:
+        """Cache key for a file: a hash of its content and the converter version"""
+        st = os.stat(file_path)
+        stamp = f"{st.st_size}:{st.st_mtime_ns}:"
+        stat_path = self._path(hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest(), _STAT_SUFFIX)
+        try:
+            with open(stat_path, "r", encoding="ascii") as f:
+                record = f.read()
+            if record.startswith(stamp):
+                os.utime(stat_path)  # Mark as recently used
+                return record[len(stamp):]
+        except OSError:
+            pass
+
+        digest = hashlib.sha256(f"{CONVERTER_VERSION}:{marshal.version}:".encode())
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+        key = digest.hexdigest()
+        if self._write(stat_path, (stamp + key).encode("ascii")):
+            self._evict()
+        return key
+
+    def get(self, key: str) -> Any:
+        """Cached value for ``key``, or None"""
+        path = self._path(key, _ENTRY_SUFFIX)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+
+        # Loading creates only acyclic containers, so garbage collection
+        # passes triggered by the allocations would be wasted work
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def put(self, key: str, value: Any):
+        """Store ``value`` under ``key`` and evict old entries past the size limit"""
+        try:
+            data = marshal.dumps(value)
+        except ValueError:  # not a plain value; leave it uncached
+            return
+        if len(data) > self.max_bytes:
+            return
+        if self._write(self._path(key, _ENTRY_SUFFIX), data):
+            self._evict()
+
+    def clear(self):
+        """Remove every cache entry"""
+        for name in self._names():
+            self._remove(os.path.join(self.directory, name))
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _names(self):
+        try:
+            return [n for n in os.listdir(self.directory) if n.endswith((_ENTRY_SUFFIX, _STAT_SUFFIX))]
+        except OSError:
+            return []
+
+    def _write(self, path: str, data: bytes) -> bool:
+        # Written to a temporary file and renamed, so readers never see a partial entry
+        try:
+            # Private to the user, like the entries mkstemp creates
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            return True
+        except OSError:
+            self._remove(tmp)
+            return False
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = []
+        for name in self._names():
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
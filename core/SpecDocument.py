@@ -0,0 +1,659 @@
+"""
+Qt-free AuthMatrix spec document.
+
+``SpecDocument`` holds a spec and every edit, import and export operation
+on it, so the CLI, CI jobs and servers can work with specs without loading
+PySide6. Each edit reports a typed change notification through ``_emit``;
+the GUI's ``SpecStore`` subclasses it to turn those into Qt signals.
+"""
+import codecs
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import json
+
+from .EndpointIndex import EndpointIndex, merge_endpoints
+from .ImportProgress import ImportProgress, ProgressReader
+from .PostmanConvert import collection_base_url, collection_endpoints, collection_to_spec
+from .PostmanStream import convert_collection
+from .SpecCache import SpecCache
+
+AUTHMATRIX_SHEBANG = "#!AUTHMATRIX"
+_SHEBANG_BYTES = AUTHMATRIX_SHEBANG.encode()
+
+# A batch touching more endpoint rows than this is reported as one endpointsReset
+BATCH_ROW_LIMIT = 64
+
+
+# Default header names containing one of these usually carry a credential
+_SECRET_HEADER_WORDS = ("auth", "token", "key", "secret", "cookie", "session")
+
+
+def _cacheable(result: Tuple[bool, Dict[str, Any]]) -> bool:
+    # Credentials must not be copied into the cache directory, so a spec or
+    # collection holding a token or a credential header is read directly
+    _, spec = result
+    if not isinstance(spec, dict):
+        return False
+    for role in (spec.get("roles") or {}).values():
+        auth = role.get("auth") or {} if isinstance(role, dict) else {}
+        if auth.get("type", "none") != "none" or auth.get("token"):
+            return False
+    headers = spec.get("default_headers") or {}
+    return not any(word in str(name).lower() for name in headers for word in _SECRET_HEADER_WORDS)
+
+
+class SpecDocument:
+    """An AuthMatrix spec with its edit, import and export operations.
+
+    Notifications: specReset, baseUrlChanged(url), headersChanged,
+    roleChanged(role), endpointAdded(row), endpointRemoved(row),
+    endpointUpdated(row), endpointsReset, expectationChanged(row, role),
+    each followed by specChanged.
+    """
+
+    def __init__(self):
+        self.spec: Dict[str, Any] = {
+            "base_url": "",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {
+                "guest": {"auth": {"type": "none"}}  # Default guest role
+            },  # role -> {"auth": {"type": "bearer"/"none", "token": str}}
+            "endpoints": [],  # list of {name, path, method, expect: role->{"status": int|[int], "contains": [str], "not_contains": [str]}}
+        }
+        self._original_postman_data = None  # Store original Postman data for export
+        self._original_postman_path = None  # or the file it streamed from, re-read on export
+        self.spec_cache: Optional[SpecCache] = SpecCache()  # None disables caching
+        self._endpoint_index: Optional[EndpointIndex] = None
+        self._batch_depth = 0
+        self._pending: List[Tuple[str, tuple]] = []
+
+    def load_spec_from_content(self, content: str) -> bool:
+        """Load spec from JSON content, auto-detecting format"""
+        try:
+            # Check for shebang
+            lines = content.splitlines()
+            has_shebang = lines and lines[0].strip() == AUTHMATRIX_SHEBANG
+
+            if has_shebang:
+                # AuthMatrix format - skip shebang and parse
+                json_content = "\n".join(lines[1:])
+                self.load_spec(json.loads(json_content))
+            else:
+                # Try to parse as JSON
+                data = json.loads(content)
+
+                # Check if it's a Postman collection
+                if self.is_postman_collection(data):
+                    self.load_spec(self.convert_postman_to_authmatrix(data), postman_data=data)
+                else:
+                    # Assume it's AuthMatrix format without shebang
+                    self.load_spec(data)
+            return True
+
+        except Exception as e:
+            print(f"Error loading spec: {e}")
+            return False
+
+    def load_spec_from_file(self, file_path: str) -> bool:
+        """Load spec from a file, auto-detecting format"""
+        try:
+            is_collection, spec = self.read_spec_file(file_path)
+            self.load_spec(spec, postman_path=file_path if is_collection else None)
+            return True
+
+        except Exception as e:
+            print(f"Error loading spec: {e}")
+            return False
+
+    def read_spec_file(
+        self, file_path: str, progress: Optional[ImportProgress] = None
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """Parse a spec file without changing the store.
+
+        Returns (is Postman collection, AuthMatrix spec). Postman collections
+        are streamed, so request bodies and saved responses are never held in
+        memory; the file is re-read on export. Parsed files are kept in
+        ``spec_cache`` so reopening them is fast, unless they carry a token
+        or a credential header. Safe to call from a worker thread; pass the
+        result to ``load_spec`` on the GUI thread.
+        """
+        if self.spec_cache is None:
+            return self._read_spec_file(file_path, progress)
+        return self.spec_cache.load(file_path, lambda path: self._read_spec_file(path, progress), _cacheable)
+
+    @staticmethod
+    def _read_spec_file(
+        file_path: str, progress: Optional[ImportProgress] = None
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """Parse a spec file; returns (is Postman collection, AuthMatrix spec)"""
+        with open(file_path, "rb") as raw:
+            f = ProgressReader(raw, progress) if progress is not None else raw
+            # Bounded so a minified collection is not read whole
+            first_line = f.readline(len(codecs.BOM_UTF8) + len(_SHEBANG_BYTES) + 8)
+            # Compared as bytes: the cut may fall inside a multibyte character
+            if first_line.startswith(codecs.BOM_UTF8):
+                first_line = first_line[len(codecs.BOM_UTF8):]
+            if first_line.strip() == _SHEBANG_BYTES:
+                return False, json.load(f)
+
+            f.seek(0)
+            spec, is_collection = convert_collection(f)
+            if is_collection:
+                return True, spec
+
+            # Assume it's AuthMatrix format without shebang
+            f.seek(0)
+            return False, json.load(f)
+
+    def load_spec(
+        self, spec: Dict[str, Any], postman_data: dict = None, postman_path: str = None
+    ):
+        """Replace the whole spec with an already parsed one"""
+        self.spec = spec
+        self._original_postman_data = postman_data
+        self._original_postman_path = postman_path
+
+        # Ensure required fields exist
+        self.spec.setdefault("base_url", "")
+        self.spec.setdefault("default_headers", {"Accept": "application/json"})
+        self.spec.setdefault("roles", {"guest": {"auth": {"type": "none"}}})
+        self.spec.setdefault("endpoints", [])
+
+        self._notify("specReset")
+
+    def has_postman_source(self) -> bool:
+        """Whether the spec was imported from a Postman collection"""
+        return bool(self._original_postman_data or self._original_postman_path)
+
+    def is_postman_collection(self, data: dict) -> bool:
+        """Check if data is a Postman collection"""
+        return isinstance(data, dict) and "info" in data and "item" in data
+
+    def convert_postman_to_authmatrix(self, postman_data: dict) -> dict:
+        """Convert Postman collection to AuthMatrix format"""
+        return collection_to_spec(postman_data)
+
+    def extract_base_url_from_postman(self, postman_data: dict) -> str:
+        """Extract base URL from postman collection"""
+        return collection_base_url(postman_data)
+
+    def extract_requests_from_postman(
+        self, postman_data: dict, path_prefix: str = ""
+    ) -> List[dict]:
+        """Extract requests from postman collection recursively"""
+        return collection_endpoints(postman_data, path_prefix)
+
+    def export_as_authmatrix(self) -> str:
+        """Export current spec as AuthMatrix format with shebang"""
+        json_content = json.dumps(self.spec, indent=2)
+        return f"{AUTHMATRIX_SHEBANG}\n{json_content}"
+
+    def export_as_postman(self) -> str:
+        """Export as Postman collection format"""
+        if self.has_postman_source():
+            # If we have original Postman data, update it with current changes
+            return json.dumps(self._update_postman_collection(), indent=2)
+        else:
+            # Convert from AuthMatrix to Postman format
+            return json.dumps(self._convert_authmatrix_to_postman(), indent=2)
+
+    def _update_postman_collection(self) -> dict:
+        """Update original Postman collection with current auth and endpoint changes"""
+        # Create a copy of the original data
+        if self._original_postman_data:
+            updated_collection = json.loads(json.dumps(self._original_postman_data))
+        else:
+            with open(self._original_postman_path, "rb") as f:
+                updated_collection = json.load(f)
+
+        # Remove any auth configuration - auth is handled by AuthMatrix only
+        if "auth" in updated_collection:
+            del updated_collection["auth"]
+
+        # TODO: Could update endpoints/items here if needed in the future
+        # For now, we keep the original structure but remove auth
+
+        return updated_collection
+
+    def _convert_authmatrix_to_postman(self) -> dict:
+        """Convert current AuthMatrix spec to Postman collection format"""
+        postman_collection = {
+            "info": {
+                "name": "AuthMatrix Export",
+                "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+            },
+            "item": [],
+        }
+
+        # Note: We deliberately do NOT include auth in the Postman export
+        # Auth handling is purely an AuthMatrix responsibility
+        # This keeps the Postman collection clean and importable by both Postman and AuthMatrix
+
+        # Convert endpoints to Postman items
+        for endpoint in self.spec.get("endpoints", []):
+            item = {
+                "name": endpoint.get("name", endpoint.get("path", "")),
+                "request": {
+                    "method": endpoint.get("method", "GET"),
+                    "url": {
+                        "raw": f"{self.spec.get('base_url', '')}{endpoint.get('path', '')}",
+                        "host": self.spec.get("base_url", "")
+                        .replace("https://", "")
+                        .replace("http://", "")
+                        .split("/")[0]
+                        .split("."),
+                        "path": (
+                            endpoint.get("path", "/").strip("/").split("/")
+                            if endpoint.get("path", "/") != "/"
+                            else []
+                        ),
+                    },
+                    "header": [],
+                },
+            }
+
+            # Add default headers (but not auth headers)
+            for key, value in self.spec.get("default_headers", {}).items():
+                if key.lower() != "authorization":  # Skip auth headers
+                    item["request"]["header"].append({"key": key, "value": value})
+
+            postman_collection["item"].append(item)
+
+        return postman_collection
+
+    def export_as_postman_collections(self) -> Dict[str, str]:
+        """
+        Export as multiple Postman collections, one per role.
+
+        Each collection includes:
+        - Role-specific authentication configuration
+        - Only endpoints that expect success (2xx status) for that role
+
+        Returns:
+            Dict mapping role names to JSON collection strings
+        """
+        collections = {}
+
+        for role_name, role_config in self.spec.get("roles", {}).items():
+            # Create collection for this role
+            collection_name = f"{role_name.capitalize()} Collection"
+            postman_collection = {
+                "info": {
+                    "name": collection_name,
+                    "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+                },
+                "item": [],
+            }
+
+            # Add role-specific authentication
+            auth_config = role_config.get("auth", {})
+            if auth_config.get("type") == "bearer":
+                postman_collection["auth"] = {
+                    "type": "bearer",
+                    "bearer": [
+                        {
+                            "key": "token",
+                            "value": auth_config.get("token", ""),
+                            "type": "string",
+                        }
+                    ],
+                }
+            # If auth type is "none", we don't add auth field
+
+            # Add endpoints that expect success for this role
+            for endpoint in self.spec.get("endpoints", []):
+                # Check if this endpoint has an expectation for this role
+                expectations = endpoint.get("expect", {})
+                role_expectation = expectations.get(role_name)
+
+                # Include endpoint if:
+                # 1. There's an expectation for this role AND
+                # 2. The expected status is a success code (2xx)
+                if role_expectation:
+                    expected_status = role_expectation.get("status")
+                    # Handle both single status code and list of status codes
+                    if expected_status is not None:
+                        # Ensure status_list is always a list of integers
+                        if isinstance(expected_status, int):
+                            status_list = [expected_status]
+                        elif isinstance(expected_status, list):
+                            status_list = expected_status
+                        else:
+                            # Skip invalid status types
+                            continue
+
+                        # Include if any expected status is in 2xx range
+                        if any(200 <= s < 300 for s in status_list):
+                            item = {
+                                "name": endpoint.get("name", endpoint.get("path", "")),
+                                "request": {
+                                    "method": endpoint.get("method", "GET"),
+                                    "url": {
+                                        "raw": f"{self.spec.get('base_url', '')}{endpoint.get('path', '')}",
+                                        "host": self.spec.get("base_url", "")
+                                        .replace("https://", "")
+                                        .replace("http://", "")
+                                        .split("/")[0]
+                                        .split("."),
+                                        "path": (
+                                            endpoint.get("path", "/")
+                                            .strip("/")
+                                            .split("/")
+                                            if endpoint.get("path", "/") != "/"
+                                            else []
+                                        ),
+                                    },
+                                    "header": [],
+                                },
+                            }
+
+                            # Add default headers (but not auth headers - auth is at collection level)
+                            for key, value in self.spec.get(
+                                "default_headers", {}
+                            ).items():
+                                if key.lower() != "authorization":
+                                    item["request"]["header"].append(
+                                        {"key": key, "value": value}
+                                    )
+
+                            postman_collection["item"].append(item)
+
+            # Only add collection if it has at least one endpoint
+            if postman_collection["item"]:
+                collections[role_name] = json.dumps(postman_collection, indent=2)
+
+        return collections
+
+    # change notifications
+    @contextmanager
+    def batch(self):
+        """Group several edits into one consolidated change notification.
+
+        Typed signals raised inside the block are buffered, coalesced when
+        the outermost batch exits, and followed by a single specChanged.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_batch()
+
+    def _notify(self, signal: str, *args):
+        """Emit a typed change notification followed by specChanged"""
+        if self._batch_depth:
+            self._pending.append((signal, args))
+            return
+        self._emit(signal, *args)
+        self._emit("specChanged")
+
+    def _emit(self, signal: str, *args):
+        """Deliver one change notification; the Qt SpecStore emits it as a signal"""
+
+    def _flush_batch(self):
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        changes: Dict[str, List[tuple]] = {}
+        for signal, args in pending:
+            changes.setdefault(signal, []).append(args)
+
+        if "specReset" in changes:
+            self._emit("specReset")
+        else:
+            if "baseUrlChanged" in changes:
+                self._emit("baseUrlChanged", self.spec["base_url"])
+            if "headersChanged" in changes:
+                self._emit("headersChanged")
+            for role in dict.fromkeys(args[0] for args in changes.get("roleChanged", [])):
+                self._emit("roleChanged", role)
+
+            # Row inserts and removals shift indexes, so report them as a reset
+            rows = dict.fromkeys(
+                args[0]
+                for signal in ("endpointUpdated", "expectationChanged")
+                for args in changes.get(signal, [])
+            )
+            if changes.keys() & {"endpointsReset", "endpointAdded", "endpointRemoved"} or len(rows) > BATCH_ROW_LIMIT:
+                self._emit("endpointsReset")
+            else:
+                for row in rows:
+                    self._emit("endpointUpdated", row)
+        self._emit("specChanged")
+
+    # project
+    def set_base_url(self, url: str):
+        self.spec["base_url"] = (url or "").strip()
+        self._notify("baseUrlChanged", self.spec["base_url"])
+
+    def set_header(self, key: str, val: str):
+        k = (key or "").strip()
+        if not k:
+            return
+        self.spec["default_headers"][k] = val
+        self._notify("headersChanged")
+
+    def remove_header(self, key: str):
+        self.spec["default_headers"].pop(key, None)
+        self._notify("headersChanged")
+
+    def remove_all_headers(self):
+        """Remove all headers except the default Accept header."""
+        self.spec["default_headers"] = {"Accept": "application/json"}
+        self._notify("headersChanged")
+
+    # endpoints (bulk parse + table edits)
+    def parse_endpoints_text(self, text: str) -> List[Tuple[str, str, str]]:
+        """
+        Accept lines like:
+          /users
+          GET /users
+          POST /login Login
+        Returns list of tuples: (name, method, path)
+        """
+        out: List[Tuple[str, str, str]] = []
+        for raw in (text or "").splitlines():
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = line.split()
+            method = "GET"
+            path = ""
+            name = ""
+
+            if len(parts) == 1:
+                path = parts[0]
+                name = parts[0]
+            else:
+                # If first token looks like an HTTP verb, treat it as method
+                if parts[0].upper() in {"GET", "POST", "PUT", "PATCH", "DELETE"}:
+                    method = parts[0].upper()
+                    path = parts[1] if len(parts) >= 2 else ""
+                    name = " ".join(parts[2:]) if len(parts) >= 3 else (path or "")
+                else:
+                    # No method: first token is path, rest is name
+                    path = parts[0]
+                    name = " ".join(parts[1:]) if len(parts) >= 2 else parts[0]
+
+            if not path.startswith("/"):
+                # be forgiving: add leading slash if omitted
+                path = "/" + path
+            if not name:
+                name = path
+            out.append((name, method, path))
+        return out
+
+    @property
+    def endpoint_index(self) -> EndpointIndex:
+        """Lookup tables over spec["endpoints"], rebuilt if the list was replaced"""
+        if self._current_index() is None:
+            self._endpoint_index = EndpointIndex(self.spec["endpoints"])
+        return self._endpoint_index
+
+    def _current_index(self) -> Optional[EndpointIndex]:
+        index = self._endpoint_index
+        return index if index is not None and index.is_current(self.spec["endpoints"]) else None
+
+    def find_endpoint(self, method: str, path: str) -> Optional[int]:
+        """Index of the first endpoint with this method and (normalized) path."""
+        return self.endpoint_index.find(method, path)
+
+    def set_endpoints(self, rows: List[Tuple[str, str, str]]):
+        self.spec["endpoints"] = [
+            {"name": n, "method": m, "path": p, "expect": {}} for (n, m, p) in rows
+        ]
+        self._notify("endpointsReset")
+
+    def update_endpoint_row(self, index: int, name: str, method: str, path: str):
+        if 0 <= index < len(self.spec["endpoints"]):
+            endpoint_index = self._current_index()
+            self.spec["endpoints"][index].update(
+                {"name": name, "method": method, "path": path}
+            )
+            if endpoint_index is not None:
+                endpoint_index.update(index)
+            self._notify("endpointUpdated", index)
+
+    def add_endpoint(self, name: str, method: str, path: str, expect: Dict[str, Any] = None):
+        """Add a new endpoint to the list."""
+        endpoint_index = self._current_index()
+        endpoint = {"name": name, "method": method, "path": path, "expect": expect or {}}
+        self.spec["endpoints"].append(endpoint)
+        if endpoint_index is not None:
+            endpoint_index.add(len(self.spec["endpoints"]) - 1)
+        self._notify("endpointAdded", len(self.spec["endpoints"]) - 1)
+
+    def add_endpoints(self, endpoints: Iterable[Dict[str, Any]]):
+        """Append several endpoint dicts with a single change notification."""
+        with self.batch():
+            for ep in endpoints:
+                self.add_endpoint(ep["name"], ep.get("method", "GET"), ep["path"], expect=ep.get("expect"))
+
+    def merge_endpoints(self, endpoints: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """Merge endpoint dicts by method and path.
+
+        Endpoints already in the spec get the incoming expectations layered
+        over theirs; new ones are appended. Returns (added, updated) counts.
+        """
+        added, updated = merge_endpoints(self.spec["endpoints"], endpoints, self.endpoint_index)
+        with self.batch():
+            for row in added:
+                self._notify("endpointAdded", row)
+            for row in updated:
+                self._notify("endpointUpdated", row)
+        return len(added), len(dict.fromkeys(updated))
+
+    def delete_endpoint(self, index: int):
+        """Delete an endpoint by index."""
+        if 0 <= index < len(self.spec["endpoints"]):
+            endpoint_index = self._current_index()
+            del self.spec["endpoints"][index]
+            if endpoint_index is not None:
+                endpoint_index.remove(index)
+            self._notify("endpointRemoved", index)
+
+    # roles/tokens
+    def add_role(self, role: str, auth_type: str, token: str):
+        rid = (role or "").strip()
+        if not rid:
+            return False, "Role/Name is required"
+
+        # role auth
+        auth = {}
+        if "bearer" in (auth_type or "").lower():
+            auth = {"type": "bearer", "token": token}
+        else:
+            auth = {"type": "none"}
+
+        # upsert role auth
+        self.spec["roles"][rid] = {"auth": auth}
+
+        self._notify("roleChanged", rid)
+        return True, None
+
+    def remove_role(self, rid: str):
+        if rid in self.spec["roles"]:
+            with self.batch():
+                del self.spec["roles"][rid]
+                for index, ep in enumerate(self.spec["endpoints"]):
+                    if "expect" in ep and rid in ep["expect"]:
+                        del ep["expect"][rid]
+                        self._notify("expectationChanged", index, rid)
+                self._notify("roleChanged", rid)
+
+    def remove_roles(self, rids: Iterable[str]):
+        """Remove several roles with a single change notification."""
+        with self.batch():
+            for rid in list(rids):
+                self.remove_role(rid)
+
+    # endpoint expectations
+    def set_endpoint_expectation(
+        self,
+        endpoint_index: int,
+        role: str,
+        status: Any = None,
+        contains: List[str] = None,
+        not_contains: List[str] = None,
+    ):
+        """Set expectation for a specific role on a specific endpoint."""
+        if not (0 <= endpoint_index < len(self.spec["endpoints"])):
+            return False, "Invalid endpoint index"
+
+        if role not in self.spec["roles"]:
+            return False, f"Role '{role}' does not exist"
+
+        ep = self.spec["endpoints"][endpoint_index]
+        ep.setdefault("expect", {})
+        ep["expect"][role] = {}
+
+        if status is not None:
+            ep["expect"][role]["status"] = status
+        if contains:
+            ep["expect"][role]["contains"] = contains
+        if not_contains:
+            ep["expect"][role]["not_contains"] = not_contains
+
+        self._notify("expectationChanged", endpoint_index, role)
+        return True, None
+
+    def set_endpoint_expectations(self, endpoint_index: int, expect: Dict[str, Any]):
+        """Replace every expectation of an endpoint at once."""
+        if not (0 <= endpoint_index < len(self.spec["endpoints"])):
+            return False, "Invalid endpoint index"
+
+        self.spec["endpoints"][endpoint_index]["expect"] = expect
+        self._notify("endpointUpdated", endpoint_index)
+        return True, None
+
+    def set_expectations(self, entries: Iterable[Tuple[int, str, Dict[str, Any]]]) -> int:
+        """Set many (endpoint index, role, expectation) entries at once.
+
+        Entries with an unknown endpoint or role are skipped; returns how
+        many were applied.
+        """
+        applied = 0
+        with self.batch():
+            for endpoint_index, role, expectation in entries:
+                success, _ = self.set_endpoint_expectation(endpoint_index, role, **expectation)
+                applied += success
+        return applied
+
+    def clear_all_expectations(self):
+        """Remove the expectations of every endpoint."""
+        for ep in self.spec["endpoints"]:
+            ep["expect"] = {}
+        self._notify("endpointsReset")
+
+    def remove_endpoint_expectation(self, endpoint_index: int, role: str):
+        """Remove expectation for a specific role on a specific endpoint."""
+        if not (0 <= endpoint_index < len(self.spec["endpoints"])):
+            return False, "Invalid endpoint index"
+
+        ep = self.spec["endpoints"][endpoint_index]
+        if "expect" in ep and role in ep["expect"]:
+            del ep["expect"][role]
+
+        self._notify("expectationChanged", endpoint_index, role)
+        return True, None
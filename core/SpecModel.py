@@ -0,0 +1,225 @@
+"""
+Compact, read-only in-memory model of an AuthMatrix spec.
+
+A JSON spec becomes nested dicts: one per endpoint plus one per role
+expectation, so large specs cost kilobytes per endpoint and are slow to
+pickle for worker processes. ``SpecModel.from_dict`` converts a spec into
+slotted records instead. Identical expectation sets are stored once and
+shared across endpoints, and key tuples are shared by every record with
+the same layout.
+
+Records are ``Mapping`` objects, so the executor reads a model exactly like
+the dict spec (``spec["endpoints"]``, ``(ep.get("expect") or {}).get(role)``).
+``to_dict`` gives back the original JSON structure, key order included.
+"""
+import marshal
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+
+class Record(Mapping):
+    """Immutable mapping stored as a shared keys tuple and a values tuple"""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: Tuple[str, ...], values: Tuple[Any, ...]):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(zip(self._keys, self._values))!r})"
+
+    def __reduce__(self):
+        return type(self), (self._keys, self._values)
+
+
+class Expectation(Record):
+    """What one role should get from one endpoint: status, contains, not_contains"""
+
+    __slots__ = ()
+
+    @property
+    def status(self):
+        return self.get("status")
+
+
+class ExpectationSet(Record):
+    """Role name -> Expectation for one endpoint; shared by identical endpoints"""
+
+    __slots__ = ()
+
+
+class Role(Record):
+    """A role and its auth settings"""
+
+    __slots__ = ()
+
+    @property
+    def auth(self) -> Mapping:
+        return self.get("auth", {})
+
+
+class Endpoint(Record):
+    """One endpoint: name, method, path, expect and any extra keys"""
+
+    __slots__ = ()
+
+    @property
+    def name(self) -> str:
+        return self.get("name") or self["path"]
+
+    @property
+    def method(self) -> str:
+        return self.get("method", "GET")
+
+    @property
+    def path(self) -> str:
+        return self["path"]
+
+    @property
+    def expect(self) -> ExpectationSet:
+        return self.get("expect") or EMPTY_EXPECTATIONS
+
+
+EMPTY_EXPECTATIONS = ExpectationSet((), ())
+
+
+def to_plain(value: Any) -> Any:
+    """Convert records (and lists holding them) back to plain JSON values"""
+    if isinstance(value, Mapping):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(v) for v in value]
+    return value
+
+
+class _Interner:
+    """Shares key tuples and identical expectations during one conversion"""
+
+    def __init__(self):
+        self._keys: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._expectations: Dict[bytes, Expectation] = {}
+        self._sets: Dict[bytes, ExpectationSet] = {}
+
+    def keys(self, mapping: Mapping) -> Tuple[str, ...]:
+        keys = tuple(mapping)
+        return self._keys.setdefault(keys, keys)
+
+    def record(self, cls, mapping: Mapping, values: Tuple[Any, ...]) -> Record:
+        return cls(self.keys(mapping), values)
+
+    def value(self, value: Any) -> Any:
+        """Copy a nested JSON value, turning objects into records"""
+        if isinstance(value, dict):
+            return self.record(Record, value, tuple(self.value(v) for v in value.values()))
+        if isinstance(value, list):
+            return [self.value(v) for v in value]
+        return value
+
+    # The marshal encoding of a parsed JSON value is an exact fingerprint:
+    # it keeps key order and tells 1, 1.0 and True apart. Version 2 has no
+    # back-references, so equal values always encode the same way.
+    def expectation(self, expect: Dict[str, Any]) -> Expectation:
+        fingerprint = marshal.dumps(expect, 2)
+        shared = self._expectations.get(fingerprint)
+        if shared is None:
+            values = tuple(self.value(v) for v in expect.values())
+            shared = self._expectations[fingerprint] = self.record(Expectation, expect, values)
+        return shared
+
+    def expectation_set(self, expect: Dict[str, Any]) -> ExpectationSet:
+        fingerprint = marshal.dumps(expect, 2)
+        shared = self._sets.get(fingerprint)
+        if shared is None:
+            # A role mapped to null has no expectation; keep it as None
+            values = tuple(None if e is None else self.expectation(e) for e in expect.values())
+            shared = self._sets[fingerprint] = self.record(ExpectationSet, expect, values)
+        return shared
+
+    def endpoint(self, ep: Dict[str, Any]) -> Endpoint:
+        values = []
+        for key, value in ep.items():
+            if key == "expect" and value is not None:
+                value = self.expectation_set(value)
+            elif not isinstance(value, str):
+                value = self.value(value)
+            values.append(value)
+        return self.record(Endpoint, ep, tuple(values))
+
+    def role(self, role: Dict[str, Any]) -> Role:
+        return self.record(Role, role, tuple(self.value(v) for v in role.values()))
+
+
+def _restore_spec(keys, values, layouts, rows):
+    """Unpickle a SpecModel whose endpoints were packed by __reduce__"""
+    endpoints = tuple(Endpoint(layouts[layout], ep_values) for layout, ep_values in rows)
+    values = tuple(endpoints if key == "endpoints" else value for key, value in zip(keys, values))
+    return SpecModel(keys, values)
+
+
+class SpecModel(Record):
+    """Read-only spec: base_url, default_headers, roles and endpoints.
+
+    ``roles`` is a mapping of Role records and ``endpoints`` a tuple of
+    Endpoint records; any other top-level keys are kept as they are.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, spec: Mapping) -> "SpecModel":
+        """Build a model from a spec in AuthMatrix JSON form"""
+        interner = _Interner()
+        values = []
+        for key, value in spec.items():
+            if key == "endpoints":
+                value = tuple(interner.endpoint(ep) for ep in value)
+            elif key == "roles":
+                value = interner.record(Record, value, tuple(interner.role(r) for r in value.values()))
+            else:
+                value = interner.value(value)
+            values.append(value)
+        return cls(tuple(spec), tuple(values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the AuthMatrix JSON structure"""
+        return to_plain(self)
+
+    def __reduce__(self):
+        # Pickle endpoints column-wise: their shared key layouts once, then
+        # one plain values tuple per endpoint
+        layouts: Dict[Tuple[str, ...], int] = {}
+        rows = [
+            (layouts.setdefault(ep._keys, len(layouts)), ep._values)
+            for ep in self.endpoints
+        ]
+        values = tuple(None if key == "endpoints" else value for key, value in zip(self._keys, self._values))
+        return _restore_spec, (self._keys, values, list(layouts), rows)
+
+    @property
+    def base_url(self) -> str:
+        return self.get("base_url", "")
+
+    @property
+    def roles(self) -> Mapping:
+        return self.get("roles", {})
+
+    @property
+    def endpoints(self) -> Tuple[Endpoint, ...]:
+        return self.get("endpoints", ())
+
+    def expectation_sets(self) -> int:
+        """Number of distinct expectation sets shared by the endpoints"""
+        return len({id(ep.expect) for ep in self.endpoints})
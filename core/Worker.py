@@ -0,0 +1,126 @@
+"""
+Entry point for streaming worker processes.
+
+GUI runs start their workers with the ``spawn`` start method, and a spawned
+child imports the module that defines its target before it can run it.
+Keeping the target here, away from the widget code, means a worker loads
+the HTTP engine and result batching only, not PySide6 and the views.
+
+Where available, workers are forked from a fork server that has already
+imported this module, so they skip interpreter start-up and imports too.
+``pool_worker_function`` is run by core.WorkerPool, which keeps its
+processes and connections between runs and hands specs over through
+core.SharedSpec.
+"""
+import multiprocessing
+import sys
+import time
+from typing import Callable, Optional, Tuple
+
+from .Executor import MatrixExecutor
+from .RequestTemplates import CompiledSpec
+from .ResultBatch import ResultBatcher
+from .Sessions import SessionPool
+from .SharedSpec import load_shared_spec
+
+
+def worker_context():
+    """Multiprocessing context for streaming workers.
+
+    POSIX uses a fork server preloaded with this module. Windows and frozen
+    builds spawn a fresh interpreter, which only imports this module.
+    """
+    if getattr(sys, "frozen", False) or "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def warm_up(context):
+    """Start the fork server ahead of the first run; a no-op for spawn"""
+    if context.get_start_method() == "forkserver":
+        from multiprocessing import forkserver
+
+        forkserver.ensure_running()
+
+
+class JobStop:
+    """Stop flag for one pool job: set once the job's id has been cancelled.
+
+    The pool shares one counter holding the highest cancelled job id, so
+    cancelling a job needs no per-job synchronization object.
+    """
+
+    __slots__ = ("_cancelled", "_job_id")
+
+    def __init__(self, cancelled, job_id: int):
+        self._cancelled = cancelled
+        self._job_id = job_id
+
+    def is_set(self) -> bool:
+        return self._cancelled.value >= self._job_id
+
+
+def pool_worker_function(job_queue, result_queue, error_queue, cancelled, started_at: Optional[float] = None):
+    """Long-lived worker that runs jobs until it receives None.
+
+    Jobs are ``(job_id, spec_handle, cell_range)``. Every message is sent
+    as ``(job_id, message)`` and every error as ``(job_id, text)``, so the
+    parent can drop output from jobs it has moved on from. READY is sent
+    with the first job only. Sessions outlive jobs, so keep-alive
+    connections are reused by the next run, and the last loaded spec and
+    its request templates are kept for jobs that share its handle.
+    """
+    loaded_handle, spec, compiled = None, None, None
+    with SessionPool() as sessions:
+        while True:
+            job = job_queue.get()
+            if job is None:
+                return
+            job_id, handle, cell_range = job
+
+            def send(message, job_id=job_id):
+                result_queue.put((job_id, message))
+
+            if started_at is not None:
+                send(("READY", None, None, time.time() - started_at))
+                started_at = None
+            stop_event = JobStop(cancelled, job_id)
+            if stop_event.is_set():
+                # Skip loading the spec of a job that is already stopped
+                send(("STOPPED", None, None, None))
+                continue
+            try:
+                if handle != loaded_handle:
+                    loaded_handle, spec, compiled = None, None, None  # free the old spec first
+                    spec = load_shared_spec(handle)
+                    compiled = CompiledSpec(spec)
+                    loaded_handle = handle
+                _run_slice(spec, send, stop_event, cell_range, sessions, compiled)
+            except Exception as e:
+                error_queue.put((job_id, str(e)))
+
+
+def _run_slice(
+    spec,
+    send: Callable,
+    stop_event,
+    cell_range: Optional[Tuple[int, int]] = None,
+    sessions: Optional[SessionPool] = None,
+    compiled: Optional[CompiledSpec] = None,
+):
+    """Run one slice of the matrix, ending with DONE or STOPPED"""
+    batcher = ResultBatcher(spec, send)
+    executor = MatrixExecutor(timeout=30, sessions=sessions)
+    try:
+        executor.run(spec, on_result=batcher.add, stop_event=stop_event, cell_range=cell_range, compiled=compiled)
+    finally:
+        batcher.flush()
+
+    if stop_event.is_set():
+        send(("STOPPED", None, None, None))
+        return
+
+    # Signal completion
+    send(("DONE", None, None, None))
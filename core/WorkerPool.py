@@ -0,0 +1,118 @@
+"""
+Long-lived pool of streaming worker processes for GUI runs.
+
+Starting processes and opening connections used to dominate quick
+edit-and-rerun cycles. ``WorkerPool`` starts its workers with the first
+job and keeps them, and their keep-alive connections, until ``close``.
+Jobs travel over one shared queue as slices of the matrix, so any idle
+worker picks up the next slice; output comes back tagged with the job id
+(see core.Worker.pool_worker_function). The spec itself is written once
+per distinct spec object to a core.SharedSpec file that workers map, so a
+job descriptor is just a handle and a cell range.
+"""
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from .SharedSpec import SharedSpec
+from .Worker import pool_worker_function, worker_context
+
+
+class WorkerPool:
+    """Worker processes that take jobs over a queue until closed.
+
+    ``result_queue`` carries ``(job_id, message)`` and ``error_queue``
+    ``(job_id, text)``; readers should ignore job ids they did not submit.
+    """
+
+    def __init__(self, size: int, context=None):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.context = context or worker_context()
+        self.processes: List = []
+        self.job_queue = None
+        self.result_queue = None
+        self.error_queue = None
+        self._cancelled = None  # highest cancelled job id, shared with workers
+        self._last_job = 0
+        self._shared: Optional[SharedSpec] = None
+
+    @property
+    def running(self) -> bool:
+        return any(process.is_alive() for process in self.processes)
+
+    def submit(self, spec, cell_ranges: Sequence[Optional[Tuple[int, int]]]) -> int:
+        """Queue one job as a slice per cell range and return its job id.
+
+        Starts the workers on first use and replaces any that have died.
+        Each slice ends with its own DONE or STOPPED message. Submitting the
+        same spec object again reuses its shared copy, and workers reuse
+        the spec they already loaded from it.
+        """
+        self._ensure_workers()
+        if self._shared is None or self._shared.spec is not spec:
+            self._release_spec()
+            self._shared = SharedSpec(spec)
+        self._last_job += 1
+        job_id = self._last_job
+        for cell_range in cell_ranges:
+            self.job_queue.put((job_id, self._shared.handle, cell_range))
+        return job_id
+
+    def cancel(self, job_id: int):
+        """Stop a job; its running slices report STOPPED, queued ones stop at once"""
+        if self._cancelled is not None and self._cancelled.value < job_id:
+            self._cancelled.value = job_id
+
+    def close(self, timeout: float = 1.0):
+        """Stop every worker and release the queues"""
+        if self.job_queue is None:
+            return
+        self.cancel(self._last_job)
+        for _ in self.processes:
+            self.job_queue.put(None)
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.processes = []
+
+        for channel in (self.job_queue, self.result_queue, self.error_queue):
+            # Unread messages must not block interpreter exit
+            channel.cancel_join_thread()
+            channel.close()
+        self.job_queue = self.result_queue = self.error_queue = None
+        self._cancelled = None
+        self._release_spec()
+
+    def _release_spec(self):
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _ensure_workers(self):
+        context = self.context
+        if self.job_queue is None:
+            self.job_queue = context.Queue()
+            self.result_queue = context.Queue()
+            self.error_queue = context.Queue()
+            self._cancelled = context.Value("q", self._last_job)
+
+        alive = [process for process in self.processes if process.is_alive()]
+        started_at = time.time()
+        for _ in range(self.size - len(alive)):
+            process = context.Process(
+                target=pool_worker_function,
+                args=(self.job_queue, self.result_queue, self.error_queue, self._cancelled, started_at),
+                daemon=True,
+            )
+            process.start()
+            alive.append(process)
+        self.processes = alive
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
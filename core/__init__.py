@@ -0,0 +1,61 @@
+"""Core (Qt-free) engine package for Auth Matrix.
+
+The HTTP engine (Executor, Sessions) pulls in requests, so its names are
+imported on first use; loading and converting specs stays cheap.
+"""
+
+from importlib import import_module
+
+from .AccessAnalysis import AccessAnalysis
+from .EndpointIndex import EndpointIndex, endpoint_key, normalize_path
+from .ImportProgress import ImportCancelled, ImportProgress
+from .PostmanConvert import collection_to_spec, parse_url
+from .PostmanStream import PostmanCollectionStream, convert_collection
+from .SpecCache import SpecCache
+from .SpecDocument import SpecDocument, AUTHMATRIX_SHEBANG
+from .SpecModel import SpecModel
+from .ResultBatch import ResultBatcher, result_keys, unpack_results
+
+_LAZY = {
+    'MatrixExecutor': '.Executor',
+    'evaluate_cell': '.Executor',
+    'DEFAULT_CONCURRENCY': '.Executor',
+    'DEFAULT_PER_HOST_LIMIT': '.Executor',
+    'SessionPool': '.Sessions',
+    'DEFAULT_POOL_SIZE': '.Sessions',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'AccessAnalysis',
+    'MatrixExecutor',
+    'evaluate_cell',
+    'DEFAULT_CONCURRENCY',
+    'DEFAULT_PER_HOST_LIMIT',
+    'EndpointIndex',
+    'endpoint_key',
+    'normalize_path',
+    'ImportCancelled',
+    'ImportProgress',
+    'collection_to_spec',
+    'parse_url',
+    'PostmanCollectionStream',
+    'convert_collection',
+    'SpecCache',
+    'SpecDocument',
+    'AUTHMATRIX_SHEBANG',
+    'SessionPool',
+    'DEFAULT_POOL_SIZE',
+    'SpecModel',
+    'ResultBatcher',
+    'result_keys',
+    'unpack_results',
+]
@@ -0,0 +1,110 @@
+"""
+Microbenchmark: per-cell request preparation with and without compiled templates.
+
+Builds a synthetic spec and walks every cell the way MatrixExecutor does,
+minus the HTTP call, thread pool and host slots, so only the preparation
+overhead is timed:
+
+    before   rebuilds the request for every cell as the executor used to
+             (twice: once for the host slot and once to send, plus a URL
+             parse for the session)
+    after    compiles the spec with core.RequestTemplates and dispatches
+             from it, as every run does
+
+Timings vary by machine; compare the ratio.
+
+    python scripts/bench_templates.py --cells 100000 --roles 4
+"""
+import argparse
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Executor import iter_cells  # noqa: E402
+from core.RequestTemplates import CompiledSpec  # noqa: E402
+from core.Sessions import SessionPool  # noqa: E402
+
+
+def make_spec(cells: int, roles: int):
+    role_names = [f"role{r}" for r in range(roles)]
+    return {
+        "base_url": "https://api.example.com/",
+        "default_headers": {"Accept": "application/json", "User-Agent": "AuthMatrix"},
+        "roles": {role: {"auth": {"type": "bearer", "token": f"{role}-token"}} for role in role_names},
+        "endpoints": [
+            {
+                "name": f"Endpoint {i}",
+                "method": "GET",
+                "path": f"/items/{i}",
+                "expect": {role: {"status": 200} for role in role_names},
+            }
+            for i in range(cells // roles)
+        ],
+    }
+
+
+def build_request(spec, ep, role_spec):
+    # The per-cell request builder the executor used before templates
+    url = spec["base_url"].rstrip("/") + ep["path"]
+    headers = dict(spec.get("default_headers", {}))
+    auth = role_spec.get("auth", {})
+    if auth.get("type") == "bearer":
+        headers["Authorization"] = f"Bearer {auth.get('token')}"
+    return ep.get("method", "GET"), url, headers
+
+
+def before(spec, sessions, send):
+    for index, name, ep, role, role_spec, expect in iter_cells(spec):
+        if not expect:
+            continue
+        _, url, _ = build_request(spec, ep, role_spec)
+        urlsplit(url).netloc.lower()  # host slot
+        session = sessions.get(role, url)
+        method, url, headers = build_request(spec, ep, role_spec)
+        send(session, method, url, headers)
+
+
+def after(spec, sessions, send):
+    for index, name, role, template, expect in CompiledSpec(spec).cells():
+        if not expect:
+            continue
+        template.host  # host slot
+        session = sessions.get_for_origin(role, template.origin)
+        send(session, template.method, template.url, template.headers)
+
+
+def best_of(repeat, fn, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cells", type=int, default=100_000)
+    parser.add_argument("--roles", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = make_spec(args.cells, args.roles)
+    cells = len(spec["endpoints"]) * len(spec["roles"])
+
+    def send(session, method, url, headers):
+        pass
+
+    with SessionPool() as sessions:
+        results = [(label, best_of(args.repeat, fn, spec, sessions, send)) for label, fn in (("before", before), ("after", after))]
+
+    print(f"{cells} cells, best of {args.repeat}")
+    for label, seconds in results:
+        print(f"  {label:<7} {seconds * 1000:8.1f} ms total  {seconds / cells * 1e6:6.2f} us/cell")
+    print(f"  speedup {results[0][1] / results[1][1]:.2f}x")
+
+if __name__ == "__main__":
+    main()
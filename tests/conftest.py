@@ -8,6 +8,7 @@ tests that mock PySide6. UI tests will automatically enable pytest-qt
 when needed.
 """
 
+import os
 import pytest
 import sys
 
@@ -18,6 +19,12 @@ def pytest_configure(config):
     pass
 
 
+@pytest.fixture(scope='session', autouse=True)
+def spec_cache_dir(tmp_path_factory):
+    """Keep converted-spec caching out of the user's cache directory"""
+    os.environ["AUTHMATRIX_CACHE_DIR"] = str(tmp_path_factory.mktemp("spec-cache"))
+
+
 @pytest.fixture(scope='session')
 def qapp(request):
     """Session-wide QApplication instance for UI tests"""
@@ -0,0 +1,88 @@
+"""
+Test suite for the incremental authorization-pattern analysis
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AccessAnalysis import AccessAnalysis
+
+
+def endpoints(*paths):
+    return [{"name": path, "method": "GET", "path": path} for path in paths]
+
+
+@pytest.fixture
+def analysis():
+    analysis = AccessAnalysis()
+    analysis.add_collection("admin", endpoints("/users", "/admin", "/items"), "bearer")
+    analysis.add_collection("user", endpoints("/users", "/items", "/items"))
+    return analysis
+
+
+class TestAccessAnalysis:
+    """Test incremental updates of the path -> roles grouping"""
+
+    def test_patterns_group_paths_by_roles(self, analysis):
+        assert analysis.patterns() == [(("admin", "user"), 2), (("admin",), 1)]
+        assert analysis.paths(["user", "admin"]) == ["/items", "/users"]
+        assert analysis.paths(["admin"]) == ["/admin"]
+        assert analysis.roles_for("/users") == {"admin", "user"}
+        assert len(analysis) == 3
+
+    def test_paths_match_in_normalized_form(self, analysis):
+        analysis.add_collection("guest", endpoints("/users/", "/items?page=2"))
+
+        assert analysis.roles_for("/users") == {"admin", "user", "guest"}
+        assert analysis.roles_for("/items/") == {"admin", "user", "guest"}
+
+    def test_roles_summary(self, analysis):
+        assert analysis.roles() == [("admin", 3, "bearer"), ("user", 3, "none")]
+
+    def test_remove_collection(self, analysis):
+        analysis.remove_collection("admin")
+
+        assert analysis.patterns() == [(("user",), 2)]
+        assert analysis.roles_for("/admin") == frozenset()
+        assert len(analysis) == 2
+
+        analysis.remove_collection("missing")  # ignored
+
+    def test_readding_role_replaces_collection(self, analysis):
+        analysis.add_collection("user", endpoints("/admin"))
+
+        assert analysis.roles()[-1] == ("user", 1, "none")
+        assert analysis.patterns() == [(("admin", "user"), 1), (("admin",), 2)]
+
+    def test_matches_full_recomputation(self):
+        collections = {
+            f"role{r}": endpoints(*(f"/api/{i}" for i in range(r, 60, r + 1)))
+            for r in range(6)
+        }
+        analysis = AccessAnalysis()
+        for role, eps in collections.items():
+            analysis.add_collection(role, eps)
+        analysis.remove_collection("role2")
+        del collections["role2"]
+
+        expected = {}
+        for role, eps in collections.items():
+            for endpoint in eps:
+                expected.setdefault(endpoint["path"], set()).add(role)
+
+        assert {path: set(analysis.roles_for(path)) for path in expected} == expected
+        assert sum(count for _, count in analysis.patterns()) == len(expected) == len(analysis)
+
+    def test_clear(self, analysis):
+        analysis.clear()
+        assert analysis.roles() == []
+        assert analysis.patterns() == []
+        assert len(analysis) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
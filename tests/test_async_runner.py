@@ -0,0 +1,292 @@
+"""
+Test suite for the asyncio matrix runner and its stdlib HTTP client
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AsyncRunner import StdlibHttpClient, run_spec_async, run_spec_asyncio
+from Firesand_Auth_Matrix import parse_run_options, run_spec
+
+
+class MatrixHandler(BaseHTTPRequestHandler):
+    """Answers 200 for the admin token and 403 for everyone else"""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    hits = 0
+
+    def do_GET(self):
+        MatrixHandler.connections.add(self.client_address)
+        MatrixHandler.hits += 1
+        authorized = self.headers.get("Authorization") == "Bearer admin-token"
+        status = 200 if authorized or self.path == "/public" else 403
+        if self.path == "/chunked":
+            self.send_response(status)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in (b"hello ", b"world"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        MatrixHandler.connections.add(self.client_address)
+        MatrixHandler.hits += 1
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.send_response(411)
+        else:
+            self.rfile.read(int(length))
+            self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    MatrixHandler.connections = set()
+    MatrixHandler.hits = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MatrixHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestStdlibHttpClient:
+    """Test the fallback HTTP/1.1 client"""
+
+    def test_reuses_connections(self, server_url):
+        async def scenario():
+            client = StdlibHttpClient()
+            try:
+                statuses = [await client.request("GET", server_url + "/public", {}) for _ in range(5)]
+            finally:
+                await client.close()
+            return statuses
+
+        assert asyncio.run(scenario()) == [200] * 5
+        # All five sequential requests travel over a single keep-alive connection
+        assert len(MatrixHandler.connections) == 1
+
+    def test_chunked_response(self, server_url):
+        async def scenario():
+            client = StdlibHttpClient()
+            try:
+                first = await client.request("GET", server_url + "/chunked", {})
+                second = await client.request("GET", server_url + "/public", {})
+            finally:
+                await client.close()
+            return first, second
+
+        assert asyncio.run(scenario()) == (403, 200)
+
+    def test_pool_size_caps_idle_connections(self, server_url):
+        async def scenario():
+            client = StdlibHttpClient(pool_size=2)
+            try:
+                await asyncio.gather(*(client.request("GET", server_url + "/public", {}) for _ in range(5)))
+                return [len(idle) for idle in client._idle.values()]
+            finally:
+                await client.close()
+
+        assert asyncio.run(scenario()) == [2]
+
+    def test_bodiless_post_sends_content_length(self, server_url):
+        async def scenario():
+            client = StdlibHttpClient()
+            try:
+                return [
+                    await client.request("POST", server_url + "/items", {}),
+                    await client.request("POST", server_url + "/items", {"content-length": "0"}),
+                ]
+            finally:
+                await client.close()
+
+        assert asyncio.run(scenario()) == [201, 201]
+
+    @pytest.mark.parametrize("method, resent", [("GET", True), ("POST", False)])
+    def test_dropped_pooled_connection_retries_safe_methods_only(self, method, resent):
+        received = []
+
+        async def handle(reader, writer):
+            # Answer the first request on each connection, then drop the
+            # connection after reading the next one without responding
+            answered = False
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                received.append(request.split(b" ", 1)[0])
+                if answered:
+                    writer.close()
+                    return
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+                answered = True
+
+        async def scenario():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/items"
+            client = StdlibHttpClient()
+            try:
+                first = await client.request(method, url, {})
+                try:
+                    second = await client.request(method, url, {})
+                except Exception as e:
+                    second = e
+            finally:
+                await client.close()
+                server.close()
+                await server.wait_closed()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first == 200
+        if resent:
+            assert second == 200
+            assert len(received) == 3
+        else:
+            assert isinstance(second, Exception)
+            assert len(received) == 2
+
+    def test_aiohttp_client_keeps_no_cookies(self):
+        aiohttp = pytest.importorskip("aiohttp")
+        from core.AsyncRunner import AiohttpClient
+
+        async def scenario():
+            client = AiohttpClient(4, 2)
+            try:
+                return client._session.cookie_jar
+            finally:
+                await client.close()
+
+        assert isinstance(asyncio.run(scenario()), aiohttp.DummyCookieJar)
+
+    def test_unsupported_scheme(self):
+        async def scenario():
+            return await StdlibHttpClient().request("GET", "ftp://example.com/", {})
+
+        with pytest.raises(Exception, match="Unsupported URL scheme"):
+            asyncio.run(scenario())
+
+
+class TestRunSpecAsync:
+    """Test the asyncio matrix runner"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, server_url):
+        """guest may only reach /public; admin may reach everything"""
+        self.spec = {
+            "base_url": server_url,
+            "default_headers": {"Accept": "application/json"},
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {"name": "/public", "method": "GET", "path": "/public", "expect": {"guest": {"status": 403}, "admin": {"status": 200}}},
+                {"name": "/admin", "method": "GET", "path": "/admin", "expect": {"guest": {"status": 403}, "admin": {"status": 200}}},
+                {"name": "/chunked", "method": "GET", "path": "/chunked", "expect": {"guest": {"status": 403}, "admin": {"status": 200}}},
+            ],
+        }
+
+    def test_matrix_results(self):
+        results = asyncio.run(run_spec_async(self.spec, concurrency=4, client=StdlibHttpClient()))
+
+        assert list(results.keys()) == ["/public", "/admin", "/chunked"]
+        assert results["/admin"]["admin"]["status"] == "PASS"
+        assert results["/admin"]["guest"]["status"] == "PASS"
+        assert results["/public"]["guest"] == {"status": "FAIL", "http": 200}
+        assert "latency_ms" in results["/chunked"]["admin"]
+
+    def test_skip_and_connection_errors(self):
+        spec = {
+            "base_url": "http://127.0.0.1:1",
+            "roles": {"guest": {"auth": {"type": "none"}}, "admin": {"auth": {"type": "bearer", "token": "admin-token"}}},
+            "endpoints": [{"name": "/down", "method": "GET", "path": "/down", "expect": {"admin": {"status": 200}}}],
+        }
+
+        results = run_spec_asyncio(spec, concurrency=2, timeout=5)
+
+        assert results["/down"]["guest"] == {"status": "SKIP"}
+        assert results["/down"]["admin"]["status"] == "FAIL"
+        assert results["/down"]["admin"]["error"]
+
+    def test_pool_size_is_passed_through(self):
+        with pytest.raises(ValueError, match="pool_size"):
+            run_spec(self.spec, engine="asyncio", pool_size=0)
+
+    def test_matches_thread_engine(self):
+        assert _without_latency(run_spec(self.spec, engine="asyncio")) == _without_latency(run_spec(self.spec))
+
+    def test_post_grades_like_thread_engine(self):
+        spec = dict(self.spec, endpoints=[
+            {"name": "/items", "method": "POST", "path": "/items", "expect": {"guest": {"status": 201}, "admin": {"status": 201}}},
+        ])
+
+        results = _without_latency(run_spec(spec, engine="asyncio"))
+
+        assert results == _without_latency(run_spec(spec))
+        assert results["/items"]["guest"] == {"status": "PASS", "http": 201}
+
+    def test_dedupe_sends_shared_requests_once(self, server_url):
+        spec = {
+            "base_url": server_url,
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "anonymous": {"auth": {"type": "none"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {
+                    "name": path,
+                    "method": "GET",
+                    "path": path,
+                    "expect": {"guest": {"status": 403}, "anonymous": {"status": 403}, "admin": {"status": 200}},
+                }
+                for path in ("/public", "/admin", "/chunked")
+            ],
+        }
+
+        results = run_spec_asyncio(spec, concurrency=4, dedupe=True)
+
+        assert MatrixHandler.hits == 6
+        assert results["/admin"]["anonymous"] == {"status": "PASS", "http": 403, "latency_ms": results["/admin"]["guest"]["latency_ms"], "coalesced": True}
+        assert "coalesced" not in results["/admin"]["guest"]
+        assert _without_latency(results) == {
+            ep: {role: dict(cell, coalesced=True) if role == "anonymous" else cell for role, cell in row.items()}
+            for ep, row in _without_latency(run_spec(spec)).items()
+        }
+
+    def test_engine_option(self):
+        assert parse_run_options(["spec.json", "--engine", "asyncio"]) == (["spec.json"], {"engine": "asyncio"})
+        with pytest.raises(ValueError):
+            parse_run_options(["--engine", "fibers"])
+
+
+def _without_latency(results):
+    return {
+        ep: {role: {k: v for k, v in cell.items() if k != "latency_ms"} for role, cell in row.items()}
+        for ep, row in results.items()
+    }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+"""
+Test suite for the endpoint lookup index
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.EndpointIndex import EndpointIndex, endpoint_key, merge_endpoints, normalize_path
+
+
+def make_endpoints():
+    return [
+        {"name": "Users", "method": "GET", "path": "/users", "folder": "admin"},
+        {"name": "Create user", "method": "POST", "path": "/users/", "folder": "admin"},
+        {"name": "Users", "method": "get", "path": "users?page=2"},
+    ]
+
+
+class TestNormalization:
+    """Test endpoint key normalization"""
+
+    def test_normalize_path(self):
+        assert normalize_path("users//1/?x=1#top") == "/users/1"
+        assert normalize_path("") == "/"
+        assert normalize_path("/") == "/"
+
+    def test_endpoint_key(self):
+        assert endpoint_key("get", "/users/") == ("GET", "/users")
+        assert endpoint_key(None, "/a") == ("GET", "/a")
+
+
+class TestEndpointIndex:
+    """Test lookups and incremental maintenance"""
+
+    def test_lookups(self):
+        index = EndpointIndex(make_endpoints())
+
+        assert index.find("GET", "/users") == 0
+        assert index.rows("GET", "/users/") == [0, 2]
+        assert index.find("POST", "/users") == 1
+        assert index.find("DELETE", "/users") is None
+        assert index.named("Users") == [0, 2]
+        assert index.in_folder("admin") == [0, 1]
+        assert index.folders() == ["admin"]
+        assert index.duplicates() == {("GET", "/users"): [0, 2]}
+
+    def test_add_update_remove(self):
+        endpoints = make_endpoints()
+        index = EndpointIndex(endpoints)
+
+        endpoints.append({"name": "Orders", "method": "GET", "path": "/orders"})
+        index.add(3)
+        assert index.find("GET", "/orders") == 3
+        assert index.is_current(endpoints)
+
+        endpoints[0]["path"] = "/accounts"
+        index.update(0)
+        assert index.rows("GET", "/users") == [2]
+        assert index.find("GET", "/accounts") == 0
+
+        del endpoints[1]
+        index.remove(1)
+        assert index.find("POST", "/users") is None
+        assert index.find("GET", "/orders") == 2
+        assert index.named("Users") == [0, 1]
+
+    def test_add_only_appends(self):
+        index = EndpointIndex(make_endpoints())
+        with pytest.raises(IndexError):
+            index.add(0)
+
+    def test_is_current(self):
+        endpoints = make_endpoints()
+        index = EndpointIndex(endpoints)
+
+        assert not index.is_current(list(endpoints))
+        endpoints.append({"name": "Late", "method": "GET", "path": "/late"})
+        assert not index.is_current(endpoints)
+
+
+class TestMergeEndpoints:
+    """Test merging endpoint lists by method and path"""
+
+    def test_merge_layers_expectations_and_appends_new(self):
+        endpoints = [{"name": "Users", "method": "GET", "path": "/users", "expect": {"guest": {"status": 403}}}]
+        incoming = [
+            {"name": "Users again", "method": "GET", "path": "/users/", "expect": {"admin": {"status": 200}}},
+            {"name": "Orders", "method": "GET", "path": "/orders"},
+            {"name": "Orders", "method": "GET", "path": "/orders", "expect": {"admin": {"status": 200}}},
+        ]
+
+        added, updated = merge_endpoints(endpoints, incoming)
+
+        assert added == [1]
+        assert updated == [0, 1]
+        assert endpoints[0]["name"] == "Users"
+        assert endpoints[0]["expect"] == {"guest": {"status": 403}, "admin": {"status": 200}}
+        assert endpoints[1]["expect"] == {"admin": {"status": 200}}
+        # The incoming dicts are not shared with the merged list
+        assert "expect" not in incoming[1]
+
+    def test_merge_scales_linearly(self):
+        endpoints = [{"name": f"E{i}", "method": "GET", "path": f"/e/{i}"} for i in range(20000)]
+        incoming = [{"name": f"E{i}", "method": "GET", "path": f"/e/{i}/"} for i in range(10000, 30000)]
+
+        added, updated = merge_endpoints(endpoints, incoming)
+
+        assert len(added) == 10000
+        assert len(updated) == 10000
+        assert len(endpoints) == 30000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
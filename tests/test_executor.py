@@ -0,0 +1,388 @@
+"""
+Test suite for the concurrent matrix executor
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Executor import MatrixExecutor, count_coalesced, evaluate_cell, iter_cells, split_cell_ranges, status_matches
+from core.Sessions import SessionPool
+from Firesand_Auth_Matrix import parse_run_options
+
+
+def ok_response(status=200):
+    response = MagicMock()
+    response.status_code = status
+    return response
+
+
+class TestStatusMatches:
+    """Test expectation status matching"""
+
+    def test_single_status(self):
+        assert status_matches({"status": 200}, 200)
+        assert not status_matches({"status": 200}, 403)
+
+    def test_status_list(self):
+        assert status_matches({"status": [200, 201]}, 201)
+        assert not status_matches({"status": [200, 201]}, 500)
+
+
+class TestEvaluateCell:
+    """Test single cell evaluation"""
+
+    @patch('requests.Session.request')
+    def test_bearer_header_is_sent(self, mock_request):
+        mock_request.return_value = ok_response()
+        spec = {
+            "base_url": "https://api.test.com",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {"admin": {"auth": {"type": "bearer", "token": "admin-token"}}},
+            "endpoints": [{"name": "Endpoint 0", "method": "GET", "path": "/ep/0", "expect": {"admin": {"status": 200}}}],
+        }
+        ep = spec["endpoints"][0]
+
+        with SessionPool() as pool:
+            session = pool.get("admin", "https://api.test.com")
+            result = evaluate_cell(spec, ep, spec["roles"]["admin"], {"status": 200}, timeout=5, session=session)
+
+        assert result["status"] == "PASS"
+        args, kwargs = mock_request.call_args
+        assert args == ("GET", "https://api.test.com/ep/0")
+        assert kwargs["headers"]["Authorization"] == "Bearer admin-token"
+        assert kwargs["timeout"] == 5
+
+    @patch('requests.Session.request')
+    def test_request_error_is_reported(self, mock_request):
+        mock_request.side_effect = ConnectionError("boom")
+        spec = {
+            "base_url": "https://api.test.com",
+            "roles": {"guest": {"auth": {"type": "none"}}},
+            "endpoints": [{"name": "Endpoint 0", "method": "GET", "path": "/ep/0", "expect": {"guest": {"status": 200}}}],
+        }
+
+        result = evaluate_cell(spec, spec["endpoints"][0], spec["roles"]["guest"], {"status": 200})
+
+        assert result == {"status": "FAIL", "error": "boom"}
+
+
+class TestDedupe:
+    """Test coalescing identical requests across roles"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """guest and anonymous send no token; auditor shares admin's token"""
+        self.spec = {
+            "base_url": "https://api.test.com",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "anonymous": {"auth": {"type": "none"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+                "auditor": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {
+                    "name": f"Endpoint {i}",
+                    "method": "GET",
+                    "path": f"/ep/{i}",
+                    "expect": {
+                        "guest": {"status": 200},
+                        "anonymous": {"status": 200},
+                        "admin": {"status": 200},
+                        "auditor": {"status": 200},
+                    },
+                }
+                for i in range(3)
+            ],
+        }
+
+    @patch('requests.Session.request')
+    def test_identical_requests_are_sent_once(self, mock_request):
+        mock_request.return_value = ok_response()
+
+        results = MatrixExecutor(dedupe=True).run(self.spec)
+
+        assert mock_request.call_count == 6
+        assert count_coalesced(results) == 6
+        for row in results.values():
+            assert "coalesced" not in row["guest"] and "coalesced" not in row["admin"]
+            assert row["anonymous"]["coalesced"] and row["auditor"]["coalesced"]
+            assert all(cell["status"] == "PASS" for cell in row.values())
+
+    @patch('requests.Session.request')
+    def test_each_role_is_graded_against_its_own_expectation(self, mock_request):
+        mock_request.return_value = ok_response(403)
+        self.spec["endpoints"][0]["expect"]["anonymous"] = {"status": 403}
+        del self.spec["endpoints"][0]["expect"]["guest"]
+
+        row = MatrixExecutor(dedupe=True).run(self.spec)["Endpoint 0"]
+
+        assert row["guest"] == {"status": "SKIP"}
+        assert row["anonymous"]["status"] == "PASS" and "coalesced" not in row["anonymous"]
+        assert row["admin"] == {"status": "FAIL", "http": 403}
+        assert row["auditor"] == {"status": "FAIL", "http": 403, "coalesced": True}
+
+    @patch('requests.Session.request')
+    def test_errors_fan_out(self, mock_request):
+        mock_request.side_effect = ConnectionError("boom")
+
+        results = MatrixExecutor(dedupe=True).run(self.spec)
+
+        assert mock_request.call_count == 6
+        assert results["Endpoint 1"]["auditor"] == {"status": "FAIL", "error": "boom", "coalesced": True}
+
+    @patch('requests.Session.request')
+    def test_unsafe_methods_and_default_runs_are_not_coalesced(self, mock_request):
+        mock_request.return_value = ok_response()
+
+        MatrixExecutor().run(self.spec)
+        for ep in self.spec["endpoints"]:
+            ep["method"] = "POST"
+        MatrixExecutor(dedupe=True).run(self.spec)
+
+        assert mock_request.call_count == 24
+
+
+class TestMatrixExecutor:
+    """Test the concurrent matrix executor"""
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            MatrixExecutor(concurrency=0)
+        with pytest.raises(ValueError):
+            MatrixExecutor(per_host_limit=0)
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Five GET endpoints that every role may call"""
+        self.spec = {
+            "base_url": "https://api.test.com",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "user": {"auth": {"type": "bearer", "token": "user-token"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {
+                    "name": f"Endpoint {i}",
+                    "method": "GET",
+                    "path": f"/ep/{i}",
+                    "expect": {"guest": {"status": 200}, "user": {"status": 200}, "admin": {"status": 200}},
+                }
+                for i in range(5)
+            ],
+        }
+
+    @patch('requests.Session.request')
+    def test_results_keep_spec_order(self, mock_request):
+        mock_request.return_value = ok_response()
+
+        results = MatrixExecutor(concurrency=4).run(self.spec)
+
+        assert list(results.keys()) == [f"Endpoint {i}" for i in range(5)]
+        for row in results.values():
+            assert list(row.keys()) == ["guest", "user", "admin"]
+            assert all(cell["status"] == "PASS" for cell in row.values())
+
+    @patch('requests.Session.request')
+    def test_skip_cells_are_not_sent(self, mock_request):
+        mock_request.return_value = ok_response()
+        for ep in self.spec["endpoints"]:
+            del ep["expect"]["guest"]
+
+        results = MatrixExecutor().run(self.spec)
+
+        assert mock_request.call_count == 10
+        assert results["Endpoint 0"]["guest"] == {"status": "SKIP"}
+
+    @patch('requests.Session.request')
+    def test_per_host_limit_caps_in_flight_requests(self, mock_request):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_request(*args, **kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+            return ok_response()
+
+        mock_request.side_effect = slow_request
+
+        MatrixExecutor(concurrency=8, per_host_limit=2).run(self.spec)
+
+        assert mock_request.call_count == 15
+        assert max(peak) <= 2
+
+    @patch('requests.Session.request')
+    def test_on_result_called_for_every_cell(self, mock_request):
+        mock_request.return_value = ok_response()
+        seen = []
+
+        MatrixExecutor().run(self.spec, on_result=lambda name, role, res: seen.append((name, role)))
+
+        assert sorted(seen) == sorted(
+            (f"Endpoint {i}", role) for i in range(5) for role in ("guest", "user", "admin")
+        )
+
+    @patch('requests.Session.request')
+    def test_stop_event_prevents_dispatch(self, mock_request):
+        mock_request.return_value = ok_response()
+        stop_event = threading.Event()
+        stop_event.set()
+
+        results = MatrixExecutor().run(self.spec, stop_event=stop_event)
+
+        mock_request.assert_not_called()
+        assert results == {}
+
+
+class TestCellRanges:
+    """Test splitting a matrix across several workers"""
+
+    def test_split_covers_every_cell_once(self):
+        assert split_cell_ranges(10, 3) == [(0, 4), (4, 7), (7, 10)]
+        assert split_cell_ranges(2, 4) == [(0, 1), (1, 2)]
+        assert split_cell_ranges(0, 4) == []
+
+    def test_ranges_partition_the_grid(self):
+        spec = {
+            "base_url": "https://api.test.com",
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "user": {"auth": {"type": "bearer", "token": "user-token"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {"name": f"Endpoint {i}", "method": "GET", "path": f"/ep/{i}", "expect": {"admin": {"status": 200}}}
+                for i in range(5)
+            ],
+        }
+        every_cell = [(index, role) for index, _, _, role, _, _ in iter_cells(spec)]
+
+        sliced = [
+            (index, role)
+            for cell_range in split_cell_ranges(len(every_cell), 4)
+            for index, _, _, role, _, _ in iter_cells(spec, cell_range)
+        ]
+
+        assert sliced == every_cell
+
+
+class TestSessionPool:
+    """Test pooled per-role sessions"""
+
+    def test_one_session_per_role_and_host(self):
+        with SessionPool(pool_size=4) as pool:
+            admin = pool.get("admin", "https://api.test.com/a")
+            assert pool.get("admin", "https://API.test.com/b?x=1") is admin
+            assert pool.get("guest", "https://api.test.com/a") is not admin
+            assert pool.get("admin", "https://other.test.com/a") is not admin
+            assert len(pool) == 3
+        assert len(pool) == 0
+
+    def test_invalid_pool_size(self):
+        with pytest.raises(ValueError):
+            SessionPool(pool_size=0)
+
+    def test_cookies_are_not_replayed_on_later_cells(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class CookieHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(403 if self.path == "/private" and "sid=" not in self.headers.get("Cookie", "") else 200)
+                if self.path == "/login":
+                    self.send_header("Set-Cookie", "sid=guest-session; Path=/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CookieHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            spec = {
+                "base_url": f"http://127.0.0.1:{server.server_address[1]}",
+                "roles": {"guest": {"auth": {"type": "bearer", "token": "guest-token"}}},
+                "endpoints": [
+                    {"name": "login", "path": "/login", "expect": {"guest": {"status": 200}}},
+                    {"name": "private", "path": "/private", "expect": {"guest": {"status": 403}}},
+                ],
+            }
+
+            results = MatrixExecutor(concurrency=1).run(spec)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert results["private"]["guest"]["status"] == "PASS"
+
+    @patch('requests.Session.request')
+    def test_executor_routes_cells_through_role_sessions(self, mock_request):
+        mock_request.return_value = ok_response()
+        pool = SessionPool()
+        spec = {
+            "base_url": "https://api.test.com",
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {"name": "Users", "method": "GET", "path": "/users", "expect": {"guest": {"status": 200}, "admin": {"status": 200}}},
+                {"name": "Orders", "method": "GET", "path": "/orders", "expect": {"guest": {"status": 200}, "admin": {"status": 200}}},
+                {"name": "Admin", "method": "GET", "path": "/admin", "expect": {"guest": {"status": 200}, "admin": {"status": 200}}},
+                {"name": "Health", "method": "GET", "path": "/health", "expect": {"guest": {"status": 200}, "admin": {"status": 200}}},
+            ],
+        }
+
+        MatrixExecutor(sessions=pool).run(spec)
+
+        # The externally owned pool stays open for the next run
+        assert len(pool) == 2
+        assert mock_request.call_count == 8
+        pool.close()
+
+
+class TestRunOptions:
+    """Test command line run option parsing"""
+
+    def test_positional_only(self):
+        assert parse_run_options(["spec.json"]) == (["spec.json"], {})
+
+    def test_options_with_separate_and_inline_values(self):
+        args, options = parse_run_options(["--concurrency", "32", "spec.json", "--per-host=4"])
+        assert args == ["spec.json"]
+        assert options == {"concurrency": 32, "per_host_limit": 4}
+
+    def test_pool_size_option(self):
+        assert parse_run_options(["--pool-size", "12"]) == ([], {"pool_size": 12})
+
+    def test_dedupe_flag(self):
+        assert parse_run_options(["--dedupe", "spec.json"]) == (["spec.json"], {"dedupe": True})
+
+    def test_invalid_option_values(self):
+        with pytest.raises(ValueError):
+            parse_run_options(["--concurrency"])
+        with pytest.raises(ValueError):
+            parse_run_options(["--concurrency", "many"])
+        with pytest.raises(ValueError):
+            parse_run_options(["--per-host", "0"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -7,7 +7,7 @@ import json
 import sys
 import os
 import tempfile
-from unittest.mock import MagicMock
+from unittest.mock import patch, MagicMock
 
 
 # Mock PySide6
@@ -30,13 +30,13 @@ class MockQtCore:
 mock_pyside6 = MagicMock()
 mock_pyside6.QtCore = MockQtCore()
 
-sys.modules["PySide6"] = mock_pyside6
-sys.modules["PySide6.QtCore"] = MockQtCore()
-
 # Add the parent directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from UI.views.SpecStore import SpecStore
+# Import against the mocked PySide6 only; patch.dict restores sys.modules
+# afterwards so later test modules still get the real Qt bindings
+with patch.dict(sys.modules, {"PySide6": mock_pyside6, "PySide6.QtCore": MockQtCore()}):
+    from UI.views.SpecStore import SpecStore
 
 
 class TestExportDialogIntegration:
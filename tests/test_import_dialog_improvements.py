@@ -181,6 +181,23 @@ class TestImportDialogFileImport:
         # Check that endpoints were loaded
         assert len(store.spec.get('endpoints', [])) > 0
 
+    def test_import_multi_postman_merge_error(self, qtbot):
+        """Test that a failing merge is reported and leaves the spec alone"""
+        store = SpecStore()
+        dialog = ImportDialog(store)
+        qtbot.addWidget(dialog)
+        original_spec = dict(store.spec)
+
+        # A collection entry missing its endpoints cannot be merged
+        dialog.imported_collections = {"admin": {"base_url": "http://test.com", "auth_config": {"type": "none"}}}
+        with patch('PySide6.QtWidgets.QMessageBox.critical') as mock_msg:
+            dialog._import_multi_postman()
+
+        assert mock_msg.called
+        assert "endpoints" in mock_msg.call_args[0][2]
+        assert store.spec == original_spec
+        assert dialog.result() != QtWidgets.QDialog.Accepted
+
 
 @pytest.mark.ui
 class TestImportDialogWarningMessages:
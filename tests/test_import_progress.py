@@ -0,0 +1,159 @@
+"""
+Test suite for import progress reporting and cancellation
+"""
+
+import pytest
+import sys
+import os
+import json
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ImportProgress import ImportCancelled, ImportProgress, ProgressReader
+
+
+class MockSignal:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def emit(self, *args, **kwargs):
+        pass
+
+    def connect(self, slot):
+        pass
+
+
+class MockQtCore:
+    QObject = object
+    Signal = MockSignal
+
+
+with patch.dict(sys.modules, {"PySide6": MagicMock(QtCore=MockQtCore()), "PySide6.QtCore": MockQtCore()}):
+    from UI.views.SpecStore import SpecStore
+
+
+@pytest.fixture
+def collection_file(tmp_path):
+    collection = {
+        "info": {"name": "API", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+        "item": [
+            {"name": f"Item {i}", "request": {"method": "GET", "url": f"https://api.test.com/items/{i}"}}
+            for i in range(200)
+        ],
+    }
+    path = tmp_path / "collection.json"
+    path.write_text(json.dumps(collection))
+    return str(path)
+
+
+class TestImportProgress:
+    """Test progress reporting and cancellation"""
+
+    def test_report_emits_only_changed_percentages(self):
+        on_progress = MagicMock()
+        progress = ImportProgress(on_progress)
+
+        for done in range(0, 1001):
+            progress.report(done, 1000)
+
+        percents = [call.args[0] for call in on_progress.call_args_list]
+        assert percents == list(range(0, 101))
+
+    def test_report_with_unknown_total(self):
+        on_progress = MagicMock()
+        ImportProgress(on_progress).report(5, 0)
+        on_progress.assert_called_once_with(0)
+
+    def test_cancel_makes_check_and_report_raise(self):
+        progress = ImportProgress()
+        progress.check()
+        assert not progress.cancelled
+
+        progress.cancel()
+
+        assert progress.cancelled
+        with pytest.raises(ImportCancelled):
+            progress.check()
+        with pytest.raises(ImportCancelled):
+            progress.report(1, 2)
+
+
+class TestProgressReader:
+    """Test the progress-reporting file wrapper"""
+
+    def test_reports_bytes_read(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"x" * 400)
+        on_progress = MagicMock()
+
+        with open(path, "rb") as f:
+            reader = ProgressReader(f, ImportProgress(on_progress))
+            while reader.read(100):
+                pass
+
+        assert [call.args[0] for call in on_progress.call_args_list] == [25, 50, 75, 100]
+
+    def test_seek_rewinds_progress(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"line\n" * 10)
+
+        with open(path, "rb") as f:
+            reader = ProgressReader(f, ImportProgress())
+            assert reader.readline() == b"line\n"
+            assert reader.seek(0) == 0
+            assert reader.read() == b"line\n" * 10
+
+    def test_cancelled_read_raises(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"x" * 10)
+        progress = ImportProgress()
+        progress.cancel()
+
+        with open(path, "rb") as f:
+            with pytest.raises(ImportCancelled):
+                ProgressReader(f, progress).read(1)
+
+
+class TestSpecStoreReadWithProgress:
+    """Test reading spec files with progress, off the GUI thread"""
+
+    def test_read_spec_file_reports_progress(self, collection_file):
+        store = SpecStore()
+        store.spec_cache = None
+        on_progress = MagicMock()
+
+        is_collection, spec = store.read_spec_file(collection_file, ImportProgress(on_progress))
+
+        assert is_collection
+        assert len(spec["endpoints"]) == 200
+        assert on_progress.call_args_list[-1].args[0] == 100
+
+    def test_read_spec_file_does_not_change_store(self, collection_file):
+        store = SpecStore()
+        store.spec_cache = None
+        before = store.spec
+
+        store.read_spec_file(collection_file)
+
+        assert store.spec is before
+        assert not store.has_postman_source()
+
+    def test_cancelled_read_is_not_cached(self, collection_file, tmp_path):
+        from core.SpecCache import SpecCache
+
+        store = SpecStore()
+        store.spec_cache = SpecCache(str(tmp_path / "cache"))
+        progress = ImportProgress()
+        progress.cancel()
+
+        with pytest.raises(ImportCancelled):
+            store.read_spec_file(collection_file, progress)
+
+        assert store.load_spec_from_file(collection_file)
+        assert len(store.spec["endpoints"]) == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -21,6 +21,7 @@ from Firesand_Auth_Matrix import (
     load_and_convert_spec,
     run_spec,
     print_matrix,
+    print_dedupe_summary,
     show_help,
     main,
     __version__,
@@ -408,6 +409,21 @@ class TestRequestExtraction:
         assert len(result) == 1
         assert result[0]["path"] == "/"
 
+    def test_extract_requests_path_prefix_sets_folders(self):
+        """Test that the path prefix is the folder path the items sit in"""
+        postman_data = {
+            "item": [
+                {"name": "Top", "request": {"url": "https://api.example.com/top"}},
+                {"name": "Users", "item": [{"name": "List", "request": {"url": "https://api.example.com/users"}}]},
+            ]
+        }
+        result = extract_requests_from_postman(postman_data, "/Admin/")
+        assert [(ep["name"], ep["path"], ep["folder"]) for ep in result] == [
+            ("Top", "/top", "Admin"),
+            ("List", "/users", "Admin/Users"),
+        ]
+        assert "folder" not in extract_requests_from_postman(postman_data)[0]
+
 
 class TestSpecLoading:
     """Test specification loading functionality"""
@@ -584,7 +600,7 @@ class TestSpecLoadingEdgeCases:
 class TestRunSpec:
     """Test the run_spec function that executes API tests"""
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_run_spec_success(self, mock_request):
         """Test successful spec execution"""
         mock_response = MagicMock()
@@ -629,7 +645,7 @@ class TestRunSpec:
         assert guest_result["status"] == "FAIL"
         assert guest_result["http"] == 200
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_run_spec_with_list_status_codes(self, mock_request):
         """Test spec execution with list of acceptable status codes"""
         mock_response = MagicMock()
@@ -692,7 +708,7 @@ class TestRunSpec:
         assert admin_result["status"] == "FAIL"
         assert "error" in admin_result
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_run_spec_network_error(self, mock_request):
         """Test spec execution with network error"""
         mock_request.side_effect = ConnectionError("Network error")
@@ -817,6 +833,21 @@ class TestPrintMatrix:
         assert "GET /very/long/endpoint" in output
         assert "404" in output
 
+    @patch('sys.stdout', new_callable=io.StringIO)
+    def test_print_dedupe_summary(self, mock_stdout):
+        """Test the requests-saved line of a dedupe run"""
+        results = {
+            "GET /items": {
+                "guest": {"status": "PASS", "http": 403},
+                "anonymous": {"status": "PASS", "http": 403, "coalesced": True},
+                "admin": {"status": "SKIP"},
+            }
+        }
+
+        print_dedupe_summary(results)
+
+        assert "sent 1 requests for 2 checks (1 saved)" in mock_stdout.getvalue()
+
 
 class TestMainFunction:
     """Test the main function and command line interface"""
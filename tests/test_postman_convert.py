@@ -0,0 +1,141 @@
+"""
+Test suite for the shared Postman conversion
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.PostmanConvert import (
+    ParsedUrl,
+    auth_config,
+    bearer_token,
+    collection_base_url,
+    collection_to_spec,
+    iter_requests,
+    parse_url,
+    read_requests,
+)
+from core.PostmanStream import PostmanCollectionStream, convert_collection
+
+
+def make_collection():
+    return {
+        "info": {"name": "Shop"},
+        "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "shop-token"}]},
+        "item": [
+            {"name": "Health", "request": {"url": "{{baseUrl}}/health"}},
+            {
+                "name": "Orders",
+                "item": [
+                    {
+                        "name": "List orders",
+                        "request": {
+                            "method": "get",
+                            "url": {
+                                "raw": "https://shop.test.com/orders/?page=1",
+                                "host": ["shop", "test", "com"],
+                                "path": ["orders", ""],
+                            },
+                        },
+                    },
+                    {"item": [{"name": "Refund", "request": {"method": "POST", "url": "https://shop.test.com/refunds"}}]},
+                ],
+            },
+        ],
+    }
+
+
+class TestParseUrl:
+    """Test URL parsing"""
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("https://api.test.com/users/?x=1#top", ParsedUrl("https://api.test.com", "/users/")),
+            ("http://127.0.0.1:3000", ParsedUrl("http://127.0.0.1:3000", "/")),
+            ("{{baseUrl}}/users/:id", ParsedUrl(None, "/users/:id")),
+            ("https://{{host}}/users", ParsedUrl(None, "/users")),
+            ("api.test.com/users", ParsedUrl(None, "/users")),
+            ("not-a-valid-url", ParsedUrl(None, "/")),
+            ("http://[invalid:ipv6", ParsedUrl(None, "/")),
+            (None, ParsedUrl(None, "/")),
+        ],
+    )
+    def test_strings(self, url, expected):
+        assert parse_url(url) == expected
+
+    def test_url_object_fields_win_over_raw(self):
+        url = {
+            "raw": "https://raw.test.com/raw/path",
+            "protocol": "http",
+            "host": ["api", "test", "com"],
+            "port": "8080",
+            "path": ["v1", "", "users"],
+        }
+        assert parse_url(url) == ParsedUrl("http://api.test.com:8080", "/v1//users")
+
+    def test_paths_are_kept_as_defined(self):
+        # Only the query and fragment are dropped; matching uses normalize_path
+        assert parse_url("https://api.test.com/users/").path == "/users/"
+        assert parse_url({"host": "api.test.com", "path": ["users", ""]}).path == "/users/"
+        assert parse_url({"host": "api.test.com", "path": "users//1?x=1"}).path == "/users//1"
+        assert parse_url("{{baseUrl}}").path == "/"
+
+    def test_url_object_falls_back_to_raw(self):
+        assert parse_url({"raw": "https://api.test.com/users?page=2"}) == ParsedUrl("https://api.test.com", "/users")
+        assert parse_url({"host": "api.test.com", "path": "/users"}) == ParsedUrl("https://api.test.com", "/users")
+        assert parse_url({"host": []}) == ParsedUrl(None, "/")
+
+
+class TestAuth:
+    """Test auth extraction"""
+
+    def test_bearer_token(self):
+        assert bearer_token({"type": "bearer", "bearer": [{"key": "token", "value": "t"}]}) == "t"
+        assert bearer_token({"type": "bearer", "bearer": {"token": "v2"}}) == "v2"
+        assert bearer_token({"type": "bearer", "bearer": [{"key": "other", "value": "x"}]}) is None
+        assert bearer_token({"type": "basic"}) is None
+
+    def test_auth_config(self):
+        assert auth_config({"type": "bearer", "bearer": []}) == {"type": "bearer", "token": ""}
+        assert auth_config({"type": "apikey"}) == {"type": "none"}
+
+
+class TestConversion:
+    """Test that every entry point converts the same way"""
+
+    def test_read_requests(self):
+        base_url, endpoints = read_requests(iter_requests(make_collection()))
+
+        assert base_url == "https://shop.test.com"
+        assert endpoints == [
+            {"name": "Health", "method": "GET", "path": "/health"},
+            {"name": "List orders", "method": "GET", "path": "/orders/", "folder": "Orders"},
+            {"name": "Refund", "method": "POST", "path": "/refunds", "folder": "Orders"},
+        ]
+        assert collection_base_url(make_collection()) == base_url
+
+    def test_spec(self):
+        spec = collection_to_spec(make_collection())
+
+        assert spec["roles"]["admin"]["auth"] == {"type": "bearer", "token": "shop-token"}
+        assert all(ep["expect"] == {} for ep in spec["endpoints"])
+
+    def test_stream_and_document_agree(self):
+        text = json.dumps(make_collection())
+
+        streamed = list(PostmanCollectionStream(io.StringIO(text)).requests())
+        spec, _ = convert_collection(io.StringIO(text))
+
+        assert streamed == list(iter_requests(json.loads(text)))
+        assert spec == collection_to_spec(json.loads(text))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,152 @@
+"""
+Test suite for the streaming Postman collection reader
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Firesand_Auth_Matrix import convert_postman_to_authmatrix
+from core import PostmanStream
+from core.PostmanStream import PostmanCollectionStream, _build, convert_collection, iter_json_events
+
+
+def make_collection():
+    return {
+        "info": {"name": "Admin API", "schema": "v2.1"},
+        "item": [
+            {
+                "name": "Get users",
+                "request": {
+                    "method": "GET",
+                    "url": {"raw": "https://api.test.com/users", "host": ["api", "test", "com"], "path": ["users"]},
+                    "header": [{"key": "X-Trace", "value": "1"}],
+                },
+                "response": [{"name": "OK", "body": "[" + "{}," * 1000 + "{}]"}],
+            },
+            {
+                # The folder name comes after its items
+                "item": [
+                    {
+                        "name": "Create order",
+                        "request": {
+                            "method": "POST",
+                            "url": "https://api.test.com/orders?dry=1",
+                            "body": {"mode": "raw", "raw": "x" * 10000},
+                        },
+                    },
+                    {"name": "Empty", "item": [{"request": {"url": "https://api.test.com/ping"}}]},
+                ],
+                "name": "Orders",
+            },
+        ],
+        "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "admin-token"}]},
+    }
+
+
+def parse(text, chunk_size, binary):
+    stream = io.BytesIO(text.encode("utf-8")) if binary else io.StringIO(text)
+    events = iter_json_events(stream, chunk_size)
+    value = _build(events, *next(events))
+    assert next(events, None) is None
+    return value
+
+
+class TestJsonEvents:
+    """Test the stdlib event tokenizer"""
+
+    @pytest.fixture(autouse=True)
+    def stdlib_tokenizer(self):
+        with patch.object(PostmanStream, "ijson", None):
+            yield
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_matches_json_module(self, chunk_size, binary):
+        value = {
+            "text": 'héllo "q" \\n \U0001F600',
+            "numbers": [0, -1, 12345678901234, 2.5, -0.5e-7, 1E3],
+            "flags": [True, False, None],
+            "nested": {"": [[], {}], "kéy": {"a": [1, {"b": "c"}]}},
+        }
+        for text in (json.dumps(value), json.dumps(value, indent=2, ensure_ascii=False)):
+            assert parse(text, chunk_size, binary) == json.loads(text)
+
+    def test_utf8_bom_is_skipped(self):
+        stream = io.BytesIO(b"\xef\xbb\xbf" + json.dumps({"a": 1}).encode())
+        events = iter_json_events(stream, 2)
+        assert _build(events, *next(events)) == {"a": 1}
+
+    @pytest.mark.parametrize("text", ["{ invalid json", '{"a": tru}', '{"a": 1', '[1}', '"abc', "[-]"])
+    def test_invalid_json_raises(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_events(io.StringIO(text), 2))
+
+
+class TestCollectionStream:
+    """Test reading requests out of a collection"""
+
+    def test_requests_and_folders(self):
+        collection = PostmanCollectionStream(io.StringIO(json.dumps(make_collection())), 16)
+        requests = list(collection.requests())
+
+        assert [(r.name, r.method, r.folders) for r in requests] == [
+            ("Get users", "GET", ()),
+            ("Create order", "POST", ("Orders",)),
+            (None, "GET", ("Orders", "Empty")),
+        ]
+        assert requests[0].url["path"] == ["users"]
+        assert requests[2].url == "https://api.test.com/ping"
+        assert collection.info["name"] == "Admin API"
+        assert collection.auth["type"] == "bearer"
+        assert collection.is_collection
+
+    def test_string_request_is_a_get(self):
+        text = json.dumps({"info": {}, "item": [{"name": "Ping", "request": "https://api.test.com/ping"}]})
+        request = next(PostmanCollectionStream(io.StringIO(text)).requests())
+
+        assert (request.method, request.url) == ("GET", "https://api.test.com/ping")
+
+    def test_only_request_fields_are_kept(self):
+        collection = PostmanCollectionStream(io.StringIO(json.dumps(make_collection())))
+        first = next(collection.requests())
+
+        assert first.auth is None
+        assert "header" not in first.url
+
+    def test_non_collection(self):
+        collection = PostmanCollectionStream(io.StringIO(json.dumps({"base_url": "", "endpoints": []})))
+
+        assert list(collection.requests()) == []
+        assert not collection.is_collection
+
+    def test_top_level_must_be_object(self):
+        with pytest.raises(ValueError):
+            list(PostmanCollectionStream(io.StringIO("[]")).requests())
+
+
+class TestConvertCollection:
+    """Test conversion to an AuthMatrix spec"""
+
+    @pytest.mark.parametrize("chunk_size", [3, 65536])
+    def test_matches_dict_conversion(self, chunk_size):
+        collection = make_collection()
+        text = json.dumps(collection)
+
+        spec, is_collection = convert_collection(io.BytesIO(text.encode()), chunk_size)
+
+        assert is_collection
+        assert spec == convert_postman_to_authmatrix(json.loads(text))
+        assert spec["base_url"] == "https://api.test.com"
+        assert spec["roles"]["admin"]["auth"]["token"] == "admin-token"
+        assert [ep["path"] for ep in spec["endpoints"]] == ["/users", "/orders", "/ping"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
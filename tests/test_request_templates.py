@@ -0,0 +1,164 @@
+"""
+Test suite for compiled per-cell request templates
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Executor import build_request, iter_cells, split_cell_ranges
+from core.RequestTemplates import CompiledSpec, build_template
+
+
+class TestCompiledSpec:
+    """Test compiling a spec into request templates"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Endpoints alternate GET and POST; guest is unauthenticated"""
+        self.spec = {
+            "base_url": "https://API.test.com/",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "user": {"auth": {"type": "bearer", "token": "user-token"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {
+                    "name": f"Endpoint {i}",
+                    "method": "GET" if i % 2 == 0 else "POST",
+                    "path": f"/ep/{i}",
+                    "expect": {"guest": {"status": 403}, "user": {"status": 200}, "admin": {"status": 200}},
+                }
+                for i in range(5)
+            ],
+        }
+
+    def test_cells_match_the_per_cell_builder(self):
+        del self.spec["endpoints"][0]["expect"]["admin"]
+        compiled = CompiledSpec(self.spec)
+
+        cells = list(compiled.cells())
+        expected = list(iter_cells(self.spec))
+
+        assert len(cells) == len(compiled) == 15
+        for (index, name, role, template, expect), (e_index, e_name, ep, e_role, role_spec, e_expect) in zip(cells, expected):
+            assert (index, name, role, expect) == (e_index, e_name, e_role, e_expect)
+            method, url, headers = build_request(self.spec, ep, role_spec)
+            assert (template.method, template.url, dict(template.headers)) == (method, url, headers)
+
+    def test_ranges_match_iter_cells(self):
+        compiled = CompiledSpec(self.spec)
+
+        for cell_range in split_cell_ranges(15, 4) + [(0, 0), (14, 99)]:
+            assert [(index, role) for index, _, role, _, _ in compiled.cells(cell_range)] == [
+                (index, role) for index, _, _, role, _, _ in iter_cells(self.spec, cell_range)
+            ]
+
+    def test_role_headers_are_shared_and_read_only(self):
+        compiled = CompiledSpec(self.spec)
+
+        admin = [template for _, _, role, template, _ in compiled.cells() if role == "admin"]
+        assert all(template.headers is admin[0].headers for template in admin)
+        assert admin[0].headers["Authorization"] == "Bearer admin-token"
+        with pytest.raises(TypeError):
+            admin[0].headers["Authorization"] = "changed"
+        assert self.spec["default_headers"] == {"Accept": "application/json"}
+
+    def test_host_and_origin_are_normalized(self):
+        self.spec["endpoints"].append({"path": ".evil.test/x"})
+        compiled = CompiledSpec(self.spec)
+
+        first, last = compiled.row(0).templates[0], compiled.row(5).templates[0]
+        assert (first.host, first.origin) == ("api.test.com", "https://api.test.com")
+        assert last.url == "https://API.test.com.evil.test/x"
+        assert last.host == "api.test.com.evil.test"
+        assert compiled.row(5).name == ".evil.test/x"
+
+    def test_rows_are_built_as_they_are_walked(self):
+        self.spec["endpoints"].append({"name": "No path"})
+        compiled = CompiledSpec(self.spec)
+
+        assert len(list(compiled.cells((0, 15)))) == 15
+        with pytest.raises(KeyError):
+            list(compiled.cells())
+
+    def test_no_roles(self):
+        self.spec["roles"] = {}
+
+        assert list(CompiledSpec(self.spec).cells()) == []
+
+
+class TestCoalescing:
+    """Test grouping the cells of roles whose requests are identical"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """guest and anonymous send no token; endpoint 0 is a GET, endpoint 1 a POST"""
+        self.spec = {
+            "base_url": "https://api.test.com",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {
+                "guest": {"auth": {"type": "none"}},
+                "anonymous": {"auth": {"type": "none"}},
+                "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+            },
+            "endpoints": [
+                {
+                    "name": "List items",
+                    "method": "GET",
+                    "path": "/items",
+                    "expect": {"guest": {"status": 403}, "anonymous": {"status": 403}, "admin": {"status": 200}},
+                },
+                {
+                    "name": "Create item",
+                    "method": "POST",
+                    "path": "/items",
+                    "expect": {"guest": {"status": 403}, "anonymous": {"status": 403}, "admin": {"status": 201}},
+                },
+            ],
+        }
+
+    def test_identical_roles_share_a_template(self):
+        compiled = CompiledSpec(self.spec)
+
+        guest, anonymous, admin = [template for index, _, _, template, _ in compiled.cells() if index == 0]
+        assert guest is anonymous
+        assert admin is not guest
+
+    def test_requests_coalesce_safe_methods_only(self):
+        compiled = CompiledSpec(self.spec)
+
+        grouped = [(index, [role for role, _ in cells]) for index, _, _, cells in compiled.requests(coalesce=True)]
+        single = [(index, [role for role, _ in cells]) for index, _, _, cells in compiled.requests()]
+
+        assert grouped == [(0, ["guest", "anonymous"]), (0, ["admin"]), (1, ["guest"]), (1, ["anonymous"]), (1, ["admin"])]
+        assert single == [(0, ["guest"]), (0, ["anonymous"]), (0, ["admin"]), (1, ["guest"]), (1, ["anonymous"]), (1, ["admin"])]
+
+    def test_coalescing_stays_within_a_cell_range(self):
+        compiled = CompiledSpec(self.spec)
+
+        assert [[role for role, _ in cells] for *_, cells in compiled.requests((1, 3), coalesce=True)] == [["anonymous"], ["admin"]]
+
+
+class TestBuildRequest:
+    """Test the single-cell helpers built on templates"""
+
+    def test_build_request_returns_a_private_header_dict(self):
+        spec = {
+            "base_url": "https://api.test.com",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {"admin": {"auth": {"type": "bearer", "token": "admin-token"}}},
+            "endpoints": [{"name": "Users", "method": "GET", "path": "/users", "expect": {"admin": {"status": 200}}}],
+        }
+        ep = spec["endpoints"][0]
+        _, _, headers = build_request(spec, ep, spec["roles"]["admin"])
+
+        headers["X-Extra"] = "1"
+
+        assert "X-Extra" not in build_template(spec, ep, spec["roles"]["admin"]).headers
+        assert "X-Extra" not in spec["default_headers"]
@@ -0,0 +1,91 @@
+"""
+Test suite for batched result messages
+"""
+
+import pytest
+import sys
+import os
+import time
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ResultBatch import ResultBatcher, pack_result, result_keys, unpack_results
+
+
+SPEC = {
+    "roles": {"guest": {}, "admin": {}},
+    "endpoints": [
+        {"name": "Users", "path": "/users"},
+        {"path": "/health"},
+        {"name": "Users", "path": "/v2/users"},
+    ],
+}
+
+
+class TestEncoding:
+    """Test the compact result encoding"""
+
+    def test_result_keys_follow_table_rows(self):
+        assert result_keys(SPEC) == (["Users", "/health"], ["guest", "admin"])
+
+    def test_round_trip(self):
+        names, roles = result_keys(SPEC)
+        results = [
+            {"status": "PASS", "http": 200, "latency_ms": 12},
+            {"status": "FAIL", "http": 403},
+            {"status": "FAIL", "error": "Connection refused"},
+            {"status": "SKIP"},
+            {"status": "PASS", "http": 200, "latency_ms": 3, "coalesced": True},
+        ]
+        entries = [pack_result(i % 2, 1, result) for i, result in enumerate(results)]
+
+        decoded = unpack_results(entries, names, roles)
+
+        assert [result for _, _, result in decoded] == results
+        assert [(name, role) for name, role, _ in decoded] == [
+            ("Users", "admin"), ("/health", "admin"), ("Users", "admin"), ("/health", "admin"), ("Users", "admin"),
+        ]
+        assert [entry[-1] for entry in entries] == [None, None, None, None, {"coalesced": True}]
+
+
+class TestResultBatcher:
+    """Test size- and time-bounded batching"""
+
+    def test_flushes_when_full(self):
+        sent = []
+        batcher = ResultBatcher(SPEC, sent.append, max_size=3, max_delay=60)
+
+        for role in ("guest", "admin", "guest", "admin"):
+            batcher.add("Users", role, {"status": "PASS"})
+
+        assert len(sent) == 1
+        kind, _, _, entries = sent[0]
+        assert kind == "BATCH" and len(entries) == 3
+
+        batcher.flush()
+        assert len(sent) == 2 and len(sent[1][3]) == 1
+
+    def test_flushes_after_delay(self):
+        sent = []
+        batcher = ResultBatcher(SPEC, sent.append, max_size=100, max_delay=0.01)
+
+        batcher.add("/health", "guest", {"status": "FAIL", "http": 500})
+        deadline = time.time() + 2
+        while not sent and time.time() < deadline:
+            time.sleep(0.005)
+
+        assert sent == [("BATCH", None, None, [(1, 0, "FAIL", 500, None, None, None)])]
+
+    def test_empty_flush_sends_nothing(self):
+        sent = []
+        ResultBatcher(SPEC, sent.append).flush()
+        assert sent == []
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ResultBatcher(SPEC, print, max_size=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
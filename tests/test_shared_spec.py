@@ -0,0 +1,72 @@
+"""
+Test suite for handing specs to workers through a mapped file
+"""
+
+import pytest
+import sys
+import os
+import pickle
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.SharedSpec import SharedSpec, SpecHandle, load_shared_spec
+from core.SpecModel import SpecModel
+
+
+@pytest.fixture
+def spec():
+    """Fifty endpoints that only admin is expected to reach"""
+    return {
+        "base_url": "https://api.test.com",
+        "default_headers": {"Accept": "application/json"},
+        "roles": {
+            "guest": {"auth": {"type": "none"}},
+            "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+        },
+        "endpoints": [
+            {"name": f"Endpoint {i}", "method": "GET", "path": f"/ep/{i}", "expect": {"admin": {"status": 200}}}
+            for i in range(50)
+        ],
+    }
+
+
+class TestSharedSpec:
+    """Test writing, loading and releasing shared specs"""
+
+    def test_round_trip(self, tmp_path, spec):
+        model = SpecModel.from_dict(spec)
+
+        with SharedSpec(model, str(tmp_path)) as shared:
+            loaded = load_shared_spec(shared.handle)
+
+            assert isinstance(shared.handle, SpecHandle)
+            assert shared.handle.size == os.path.getsize(shared.handle.path)
+            assert loaded.to_dict() == spec
+            assert loaded is not model
+
+        assert os.listdir(tmp_path) == []
+
+    def test_handle_pickles_small(self, tmp_path, spec):
+        with SharedSpec(spec, str(tmp_path)) as shared:
+            assert len(pickle.dumps(shared.handle)) < 200
+
+    def test_closed_spec_cannot_be_loaded(self, tmp_path, spec):
+        shared = SharedSpec(spec, str(tmp_path))
+        shared.close()
+        shared.close()  # closing twice is harmless
+
+        with pytest.raises(FileNotFoundError):
+            load_shared_spec(shared.handle)
+
+    def test_failed_write_leaves_no_file(self, tmp_path, spec):
+        with patch("core.SharedSpec.pickle.dump", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                SharedSpec(spec, str(tmp_path))
+
+        assert os.listdir(tmp_path) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,144 @@
+"""
+Test suite for the on-disk converted spec cache
+"""
+
+import pytest
+import sys
+import os
+import importlib
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.SpecCache import SpecCache, default_cache_dir
+
+# The package re-exports the class under the module's name
+spec_cache_module = importlib.import_module("core.SpecCache")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SpecCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def spec_file(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps({"base_url": "https://api.test.com", "endpoints": []}))
+    return str(path)
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestSpecCache:
+    """Test cache hits, misses and invalidation"""
+
+    def test_second_load_is_a_hit(self, cache, spec_file):
+        convert = MagicMock(side_effect=read_json)
+
+        first = cache.load(spec_file, convert)
+        second = cache.load(spec_file, convert)
+
+        assert first == second == {"base_url": "https://api.test.com", "endpoints": []}
+        assert second is not first
+        assert convert.call_count == 1
+
+    def test_same_content_elsewhere_is_a_hit(self, cache, spec_file, tmp_path):
+        copy = tmp_path / "copy.json"
+        copy.write_bytes(open(spec_file, "rb").read())
+        convert = MagicMock(side_effect=read_json)
+
+        cache.load(spec_file, convert)
+        cache.load(str(copy), convert)
+
+        assert convert.call_count == 1
+
+    def test_changed_content_is_a_miss(self, cache, spec_file):
+        cache.load(spec_file, read_json)
+        with open(spec_file, "w") as f:
+            json.dump({"base_url": "https://changed.test.com"}, f)
+
+        assert cache.load(spec_file, read_json)["base_url"] == "https://changed.test.com"
+
+    def test_converter_version_change_invalidates(self, cache, spec_file):
+        convert = MagicMock(side_effect=read_json)
+        cache.load(spec_file, convert)
+
+        os.utime(spec_file, ns=(1, 1))  # drop the path's stat shortcut
+        with patch.object(spec_cache_module, "CONVERTER_VERSION", -1):
+            cache.load(spec_file, convert)
+
+        assert convert.call_count == 2
+
+    def test_corrupt_entry_is_a_miss(self, cache, spec_file):
+        key = cache.key_for(spec_file)
+        cache.put(key, {"a": 1})
+        with open(os.path.join(cache.directory, key + ".spec"), "wb") as f:
+            f.write(b"\x00garbage")
+
+        assert cache.get(key) is None
+
+    def test_unmarshalable_values_are_not_stored(self, cache):
+        cache.put("key", {"a": object()})
+        assert cache.get("key") is None
+
+    def test_lru_eviction(self, tmp_path):
+        cache = SpecCache(str(tmp_path / "cache"), max_bytes=2500)
+        cache.put("a", "a" * 1000)
+        cache.put("b", "b" * 1000)
+        past = time.time() - 60
+        os.utime(os.path.join(cache.directory, "a.spec"), (past, past))
+        os.utime(os.path.join(cache.directory, "b.spec"), (past - 60, past - 60))
+
+        assert cache.get("b") is not None  # b is now the most recently used
+        cache.put("c", "c" * 1000)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is not None
+
+    def test_stat_records_count_towards_the_limit(self, tmp_path):
+        cache = SpecCache(str(tmp_path / "cache"), max_bytes=1500)
+        files = []
+        for i in range(40):
+            path = tmp_path / f"spec{i}.json"
+            path.write_text(json.dumps({"n": i}))
+            files.append(str(path))
+            cache.key_for(str(path))
+
+        sizes = [os.path.getsize(os.path.join(cache.directory, name)) for name in os.listdir(cache.directory)]
+        assert sum(sizes) <= 1500
+        assert len(sizes) < len(files)
+
+    def test_keep_can_veto_storing(self, cache, spec_file):
+        convert = MagicMock(side_effect=read_json)
+
+        cache.load(spec_file, convert, keep=lambda value: False)
+        cache.load(spec_file, convert, keep=lambda value: False)
+
+        assert convert.call_count == 2
+        assert not [name for name in os.listdir(cache.directory) if name.endswith(".spec")]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    def test_directory_is_private(self, cache, spec_file):
+        cache.load(spec_file, read_json)
+        assert os.stat(cache.directory).st_mode & 0o777 == 0o700
+
+    def test_clear(self, cache, spec_file):
+        cache.load(spec_file, read_json)
+        cache.clear()
+        assert os.listdir(cache.directory) == []
+
+    def test_default_dir_follows_environment(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("AUTHMATRIX_CACHE_DIR", str(tmp_path))
+        assert default_cache_dir() == str(tmp_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+"""
+Test suite for the Qt-free spec document and headless imports
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.SpecDocument import SpecDocument
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RecordingDocument(SpecDocument):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def _emit(self, signal, *args):
+        self.events.append((signal, args))
+
+
+class TestSpecDocument:
+    """Test the document without any Qt bindings"""
+
+    def test_edits_without_listeners(self):
+        document = SpecDocument()
+        document.set_base_url(" https://api.test.com ")
+        document.add_role("admin", "bearer", "token")
+        document.add_endpoint("Users", "GET", "/users")
+        document.set_endpoint_expectation(0, "admin", status=200)
+
+        assert document.spec["base_url"] == "https://api.test.com"
+        assert document.spec["endpoints"][0]["expect"] == {"admin": {"status": 200}}
+        assert document.find_endpoint("get", "/users/") == 0
+
+    def test_notifications_go_through_emit(self):
+        document = RecordingDocument()
+        document.add_endpoint("Users", "GET", "/users")
+        with document.batch():
+            document.set_base_url("https://api.test.com")
+            document.add_role("admin", "none", "")
+
+        assert document.events == [
+            ("endpointAdded", (0,)),
+            ("specChanged", ()),
+            ("baseUrlChanged", ("https://api.test.com",)),
+            ("roleChanged", ("admin",)),
+            ("specChanged", ()),
+        ]
+
+
+class TestHeadlessImports:
+    """Test that command line and core imports stay free of Qt and HTTP engines"""
+
+    @pytest.mark.parametrize("module", ["core", "Firesand_Auth_Matrix"])
+    def test_import_loads_no_gui_or_engine(self, module):
+        code = (
+            f"import sys, {module}; "
+            "print(sorted(m for m in ('PySide6', 'requests', 'asyncio') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_engine_exports_resolve_lazily(self):
+        import core
+
+        assert core.MatrixExecutor.__name__ == "MatrixExecutor"
+        assert core.DEFAULT_POOL_SIZE > 0
+        with pytest.raises(AttributeError):
+            core.missing_name
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+"""
+Test suite for the compact read-only spec model
+"""
+
+import pytest
+import sys
+import os
+import copy
+import json
+import pickle
+from unittest.mock import patch, MagicMock
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Executor import MatrixExecutor
+from core.ResultBatch import result_keys
+from core.SpecModel import Endpoint, SpecModel
+
+
+@pytest.fixture
+def spec():
+    """A hundred endpoints; guest is denied and admin allowed on each"""
+    return {
+        "base_url": "https://api.test.com",
+        "default_headers": {"Accept": "application/json"},
+        "roles": {
+            "guest": {"auth": {"type": "none"}},
+            "admin": {"auth": {"type": "bearer", "token": "admin-token"}},
+        },
+        "endpoints": [
+            {
+                "name": f"Endpoint {i}",
+                "method": "GET",
+                "path": f"/ep/{i}",
+                "expect": {"guest": {"status": 403}, "admin": {"status": [200, 204]}},
+            }
+            for i in range(100)
+        ],
+    }
+
+
+class TestRoundTrip:
+    """Test lossless conversion to and from the JSON structure"""
+
+    def test_round_trip_keeps_everything(self, spec):
+        spec["version"] = 2
+        spec["endpoints"].append({"path": "/bare", "folder": "misc"})
+        spec["endpoints"].append(
+            {"expect": {"guest": {"status": True, "contains": ["a"]}}, "path": "/odd", "name": ""}
+        )
+        original = copy.deepcopy(spec)
+
+        restored = SpecModel.from_dict(spec).to_dict()
+
+        assert restored == original
+        assert json.dumps(restored) == json.dumps(original)
+        assert spec == original
+
+    @patch('requests.Session.request')
+    def test_null_expectations_round_trip_and_skip(self, mock_request, spec):
+        mock_request.return_value = MagicMock(status_code=403)
+        spec["endpoints"] = spec["endpoints"][:2]
+        spec["endpoints"][0]["expect"] = None
+        spec["endpoints"][1]["expect"] = {"guest": None, "admin": {"status": 403}}
+        original = copy.deepcopy(spec)
+
+        model = SpecModel.from_dict(spec)
+
+        assert model.to_dict() == original
+        assert model.endpoints[0].expect == {}
+        assert model.endpoints[1].expect["guest"] is None
+        results = MatrixExecutor().run(model)
+        assert results == MatrixExecutor().run(spec)
+        assert results["Endpoint 0"] == {"guest": {"status": "SKIP"}, "admin": {"status": "SKIP"}}
+        assert results["Endpoint 1"]["guest"] == {"status": "SKIP"}
+        assert results["Endpoint 1"]["admin"]["status"] == "PASS"
+
+    def test_model_does_not_share_mutable_input(self, spec):
+        model = SpecModel.from_dict(spec)
+
+        spec["endpoints"][0]["expect"]["admin"]["status"].append(500)
+        spec["default_headers"]["X-Test"] = "1"
+
+        assert model["endpoints"][0]["expect"]["admin"]["status"] == [200, 204]
+        assert "X-Test" not in model["default_headers"]
+
+    def test_pickle_round_trip(self, spec):
+        model = SpecModel.from_dict(spec)
+
+        restored = pickle.loads(pickle.dumps(model))
+
+        assert isinstance(restored, SpecModel)
+        assert isinstance(restored.endpoints[0], Endpoint)
+        assert restored.to_dict() == model.to_dict()
+        assert restored.endpoints[0].expect is restored.endpoints[-1].expect
+
+    def test_pickles_smaller_than_dicts(self, spec):
+        assert len(pickle.dumps(SpecModel.from_dict(spec))) < len(pickle.dumps(spec))
+
+
+class TestSharing:
+    """Test that identical definitions are stored once"""
+
+    def test_identical_expectations_are_shared(self, spec):
+        spec["endpoints"][5]["expect"] = {"guest": {"status": 200}, "admin": {"status": [200, 204]}}
+        model = SpecModel.from_dict(spec)
+
+        assert model.expectation_sets() == 2
+        first, odd = model.endpoints[0].expect, model.endpoints[5].expect
+        assert first["admin"] is odd["admin"]
+        assert first["guest"] is not odd["guest"]
+
+    def test_equal_values_of_different_types_are_not_merged(self, spec):
+        spec["endpoints"][1]["expect"] = {"guest": {"status": 403.0}, "admin": {"status": [200, 204]}}
+        model = SpecModel.from_dict(spec)
+
+        assert model.expectation_sets() == 2
+        assert isinstance(model.endpoints[1].expect["guest"]["status"], float)
+
+    def test_records_are_slotted(self, spec):
+        model = SpecModel.from_dict(spec)
+        endpoint = model.endpoints[0]
+
+        assert not hasattr(endpoint, "__dict__")
+        assert (endpoint.name, endpoint.method, endpoint.path) == ("Endpoint 0", "GET", "/ep/0")
+        assert endpoint.expect["admin"].status == [200, 204]
+        assert model.roles["admin"].auth["token"] == "admin-token"
+
+
+class TestExecutorReadsModel:
+    """Test that the engine runs a model the same way as a dict spec"""
+
+    @patch('requests.Session.request')
+    def test_executor_runs_model(self, mock_request, spec):
+        response = MagicMock()
+        response.status_code = 403
+        mock_request.return_value = response
+
+        results = MatrixExecutor().run(SpecModel.from_dict(spec))
+
+        assert results == MatrixExecutor().run(spec)
+        assert results["Endpoint 0"]["guest"]["status"] == "PASS"
+        assert results["Endpoint 0"]["admin"] == {"status": "FAIL", "http": 403}
+        sent_headers = [kwargs["headers"] for _, kwargs in mock_request.call_args_list]
+        assert {"Accept": "application/json", "Authorization": "Bearer admin-token"} in sent_headers
+
+    def test_result_keys_match(self, spec):
+        assert result_keys(SpecModel.from_dict(spec)) == result_keys(spec)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -34,13 +34,15 @@ class MockQtCore:
 mock_pyside6 = MagicMock()
 mock_pyside6.QtCore = MockQtCore()
 
-sys.modules["PySide6"] = mock_pyside6
-sys.modules["PySide6.QtCore"] = MockQtCore()
-
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from UI.views.SpecStore import SpecStore, AUTHMATRIX_SHEBANG
+# Import against the mocked PySide6 only; patch.dict restores sys.modules
+# afterwards so later test modules still get the real Qt bindings
+with patch.dict(sys.modules, {"PySide6": mock_pyside6, "PySide6.QtCore": MockQtCore()}):
+    from UI.views.SpecStore import SpecStore, AUTHMATRIX_SHEBANG
+
+from core.SpecCache import SpecCache
 
 
 class TestSpecStore:
@@ -130,6 +132,160 @@ class TestSpecStore:
         assert self.store.spec["base_url"] == "https://plain.api.com"
         assert "user" in self.store.spec["roles"]
 
+    def _write_temp(self, content):
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".json", encoding="utf-8") as f:
+            f.write(content)
+        return f.name
+
+    def test_load_spec_from_file_formats(self):
+        """Test loading AuthMatrix files with and without shebang"""
+        spec = {"base_url": "https://file.api.com", "roles": {"user": {"auth": {"type": "none"}}}, "endpoints": []}
+        for content in (f"{AUTHMATRIX_SHEBANG}\n{json.dumps(spec)}", json.dumps(spec)):
+            path = self._write_temp(content)
+            try:
+                assert self.store.load_spec_from_file(path)
+                assert self.store.spec["base_url"] == "https://file.api.com"
+                assert not self.store.has_postman_source()
+            finally:
+                os.unlink(path)
+
+    def test_load_spec_from_file_streams_postman(self):
+        """Test that a Postman file is converted and re-read on export"""
+        collection = {
+            "info": {"name": "Streamed"},
+            "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "t"}]},
+            "item": [
+                {
+                    "name": "Upload",
+                    "request": {
+                        "method": "POST",
+                        "url": "https://api.example.com/upload",
+                        "body": {"mode": "raw", "raw": "x" * 100000},
+                    },
+                }
+            ],
+        }
+        path = self._write_temp(json.dumps(collection))
+        try:
+            assert self.store.load_spec_from_file(path)
+            assert self.store.spec["base_url"] == "https://api.example.com"
+            assert self.store.spec["endpoints"][0]["path"] == "/upload"
+            assert "admin" in self.store.spec["roles"]
+            assert self.store.has_postman_source()
+            assert self.store._original_postman_data is None
+
+            exported = json.loads(self.store.export_as_postman())
+            assert exported["info"]["name"] == "Streamed"
+            assert "auth" not in exported
+        finally:
+            os.unlink(path)
+
+    def test_load_spec_from_file_non_ascii_collection(self):
+        """Test that a multibyte character cut by the shebang check is harmless"""
+        for name in ("Überprüfung", "xÜberprüfung"):
+            collection = {
+                "info": {"name": name},
+                "item": [{"name": "Prüfen", "request": {"url": "https://api.example.com/prüfen"}}],
+            }
+            path = self._write_temp(json.dumps(collection, ensure_ascii=False))
+            try:
+                assert self.store.load_spec_from_file(path)
+                assert self.store.has_postman_source()
+                assert self.store.spec["endpoints"][0]["name"] == "Prüfen"
+            finally:
+                os.unlink(path)
+
+    def test_load_spec_from_file_with_bom(self):
+        """Test that a byte order mark before the shebang is accepted"""
+        path = self._write_temp('\ufeff#!AUTHMATRIX\n{"base_url": "https://bom.api.com"}')
+        try:
+            assert self.store.load_spec_from_file(path)
+            assert self.store.spec["base_url"] == "https://bom.api.com"
+        finally:
+            os.unlink(path)
+
+    def test_load_spec_from_file_invalid(self):
+        """Test that an unreadable file leaves the spec alone"""
+        path = self._write_temp("{ invalid json")
+        try:
+            assert not self.store.load_spec_from_file(path)
+            assert self.store.spec["base_url"] == ""
+        finally:
+            os.unlink(path)
+        assert not self.store.load_spec_from_file(path)
+
+    def test_load_spec_from_file_reopens_from_cache(self):
+        """Test that reopening an unchanged collection skips conversion"""
+        collection = {
+            "info": {"name": "Cached"},
+            "item": [{"name": "Ping", "request": {"url": "https://api.example.com/ping"}}],
+        }
+        path = self._write_temp(json.dumps(collection))
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                self.store.spec_cache = SpecCache(cache_dir)
+                assert self.store.load_spec_from_file(path)
+                first = self.store.spec
+
+                with patch("core.SpecDocument.convert_collection", side_effect=AssertionError):
+                    assert self.store.load_spec_from_file(path)
+
+                assert self.store.spec == first
+                assert self.store.spec is not first
+                assert self.store.has_postman_source()
+        finally:
+            os.unlink(path)
+
+    def test_load_spec_from_file_caches_authmatrix_specs(self):
+        """Test that an AuthMatrix spec without credentials is cached too"""
+        spec = {
+            "base_url": "https://api.example.com",
+            "default_headers": {"Accept": "application/json"},
+            "roles": {"guest": {"auth": {"type": "none"}}},
+            "endpoints": [{"name": "Ping", "method": "GET", "path": "/ping", "expect": {"guest": {"status": 200}}}],
+        }
+        path = self._write_temp("#!AUTHMATRIX\n" + json.dumps(spec))
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                self.store.spec_cache = SpecCache(cache_dir)
+                assert self.store.load_spec_from_file(path)
+
+                with patch("core.SpecDocument.json.load", side_effect=AssertionError):
+                    assert self.store.load_spec_from_file(path)
+
+                assert self.store.spec == spec
+                assert any(name.endswith(".spec") for name in os.listdir(cache_dir))
+        finally:
+            os.unlink(path)
+
+    def test_load_spec_from_file_does_not_cache_tokens(self):
+        """Test that specs and collections carrying a credential stay out of the cache"""
+        authmatrix = "#!AUTHMATRIX\n" + json.dumps(
+            {"base_url": "https://api.example.com", "roles": {"admin": {"auth": {"type": "bearer", "token": "s3cret"}}}}
+        )
+        api_key = "#!AUTHMATRIX\n" + json.dumps(
+            {"base_url": "https://api.example.com", "default_headers": {"X-Api-Key": "s3cret"}, "roles": {}}
+        )
+        collection = {
+            "info": {"name": "Secret"},
+            "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "s3cret"}]},
+            "item": [{"name": "Ping", "request": {"url": "https://api.example.com/ping"}}],
+        }
+        paths = [self._write_temp(authmatrix), self._write_temp(api_key), self._write_temp(json.dumps(collection))]
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                self.store.spec_cache = SpecCache(cache_dir)
+                for path in paths:
+                    assert self.store.load_spec_from_file(path)
+                    assert "s3cret" in json.dumps(self.store.spec)
+
+                for name in os.listdir(cache_dir):
+                    with open(os.path.join(cache_dir, name), "rb") as f:
+                        assert b"s3cret" not in f.read()
+        finally:
+            for path in paths:
+                os.unlink(path)
+
     def test_is_postman_collection(self):
         """Test Postman collection detection"""
         # Valid Postman collection
@@ -597,6 +753,161 @@ admin/settings"""
         assert not success
         assert "Invalid endpoint index" in error
 
+    def test_typed_change_signals(self):
+        """Test that each edit emits its typed signal with the affected keys"""
+        self.store.add_role("admin", "Auth: bearer", "token")
+        self.store.spec["endpoints"] = [
+            {"name": "A", "method": "GET", "path": "/a", "expect": {"admin": {"status": 200}}},
+            {"name": "B", "method": "GET", "path": "/b", "expect": {}},
+        ]
+        names = [
+            "endpointAdded", "endpointRemoved", "endpointUpdated",
+            "expectationChanged", "roleChanged", "headersChanged", "baseUrlChanged",
+        ]
+        with patch.multiple(self.store, **{name: MagicMock() for name in names}):
+            self.store.add_endpoint("C", "POST", "/c", expect={"guest": {"status": 401}})
+            self.store.update_endpoint_row(0, "A2", "GET", "/a")
+            self.store.set_endpoint_expectation(1, "guest", status=200)
+            self.store.delete_endpoint(2)
+            self.store.set_header("X-Test", "1")
+            self.store.set_base_url("https://api.test.com")
+            self.store.remove_role("admin")
+
+            self.store.endpointAdded.emit.assert_called_once_with(2)
+            self.store.endpointRemoved.emit.assert_called_once_with(2)
+            self.store.expectationChanged.emit.assert_called_once_with(1, "guest")
+            # remove_role reports the endpoints it touched as updated rows
+            assert self.store.endpointUpdated.emit.call_args_list == [((0,),), ((0,),)]
+            self.store.headersChanged.emit.assert_called_once()
+            self.store.baseUrlChanged.emit.assert_called_once_with("https://api.test.com")
+            self.store.roleChanged.emit.assert_called_once_with("admin")
+
+        assert self.store.spec["endpoints"][0]["expect"] == {}
+
+    def test_set_and_clear_endpoint_expectations(self):
+        """Test replacing one endpoint's expectations and clearing all of them"""
+        self.store.spec["endpoints"] = [
+            {"name": "A", "method": "GET", "path": "/a", "expect": {}},
+            {"name": "B", "method": "GET", "path": "/b", "expect": {"guest": {"status": 200}}},
+        ]
+
+        with patch.object(self.store, "endpointUpdated") as updated:
+            assert self.store.set_endpoint_expectations(0, {"guest": {"status": 403}}) == (True, None)
+            updated.emit.assert_called_once_with(0)
+        assert self.store.set_endpoint_expectations(5, {})[0] is False
+
+        with patch.object(self.store, "endpointsReset") as reset:
+            self.store.clear_all_expectations()
+            reset.emit.assert_called_once()
+        assert all(ep["expect"] == {} for ep in self.store.spec["endpoints"])
+
+    def test_batch_emits_one_consolidated_change(self):
+        """Test that edits inside a batch are coalesced at the end"""
+        self.store.set_endpoints([("A", "GET", "/a"), ("B", "GET", "/b")])
+        names = ["specChanged", "endpointUpdated", "expectationChanged", "endpointsReset", "headersChanged"]
+        with patch.multiple(self.store, **{name: MagicMock() for name in names}):
+            with self.store.batch():
+                with self.store.batch():
+                    self.store.set_endpoint_expectation(0, "guest", status=200)
+                    self.store.set_endpoint_expectation(0, "guest", status=403)
+                self.store.set_header("X-Test", "1")
+                self.store.set_header("X-Other", "2")
+                self.store.specChanged.emit.assert_not_called()
+
+            self.store.specChanged.emit.assert_called_once()
+            self.store.endpointUpdated.emit.assert_called_once_with(0)
+            self.store.headersChanged.emit.assert_called_once()
+            self.store.expectationChanged.emit.assert_not_called()
+            self.store.endpointsReset.emit.assert_not_called()
+
+        assert self.store.spec["endpoints"][0]["expect"] == {"guest": {"status": 403}}
+
+    def test_batch_reports_structural_changes_as_reset(self):
+        """Test that inserts and removals in a batch become one endpointsReset"""
+        with patch.multiple(self.store, endpointAdded=MagicMock(), endpointsReset=MagicMock()):
+            self.store.add_endpoints(
+                {"name": f"E{i}", "method": "GET", "path": f"/{i}"} for i in range(3)
+            )
+
+            self.store.endpointAdded.emit.assert_not_called()
+            self.store.endpointsReset.emit.assert_called_once()
+        assert [ep["name"] for ep in self.store.spec["endpoints"]] == ["E0", "E1", "E2"]
+
+    def test_set_expectations_in_bulk(self):
+        """Test applying many expectations with a single notification"""
+        self.store.add_role("admin", "Auth: none", "")
+        self.store.set_endpoints([(f"E{i}", "GET", f"/{i}") for i in range(100)])
+        entries = [
+            (i, role, {"status": 200 if role == "admin" else 403})
+            for i in range(100)
+            for role in ("guest", "admin")
+        ]
+        entries.append((500, "guest", {"status": 200}))
+        entries.append((0, "missing", {"status": 200}))
+
+        with patch.multiple(self.store, specChanged=MagicMock(), endpointsReset=MagicMock()):
+            assert self.store.set_expectations(entries) == 200
+            self.store.specChanged.emit.assert_called_once()
+            # More rows than BATCH_ROW_LIMIT are reported as a reset
+            self.store.endpointsReset.emit.assert_called_once()
+
+        assert self.store.spec["endpoints"][99]["expect"] == {
+            "guest": {"status": 403}, "admin": {"status": 200},
+        }
+
+    def test_remove_roles_in_bulk(self):
+        """Test removing several roles at once"""
+        for role in ("admin", "user"):
+            self.store.add_role(role, "Auth: none", "")
+
+        with patch.object(self.store, "specChanged") as mock_signal:
+            self.store.remove_roles(["admin", "user"])
+            mock_signal.emit.assert_called_once()
+        assert list(self.store.spec["roles"]) == ["guest"]
+
+    def test_load_spec(self):
+        """Test loading an already parsed spec"""
+        with patch.object(self.store, "specReset") as mock_signal:
+            self.store.load_spec({"roles": {"admin": {"auth": {"type": "none"}}}})
+            mock_signal.emit.assert_called_once()
+        assert self.store.spec["endpoints"] == []
+        assert self.store.spec["base_url"] == ""
+        assert self.store._original_postman_data is None
+
+    def test_endpoint_index_follows_edits(self):
+        """Test that endpoint lookups stay consistent through store edits"""
+        self.store.set_endpoints([("Users", "GET", "/users"), ("Login", "POST", "/login")])
+        assert self.store.find_endpoint("get", "/users/") == 0
+
+        self.store.add_endpoint("Orders", "GET", "/orders")
+        self.store.update_endpoint_row(0, "Accounts", "GET", "/accounts")
+        self.store.delete_endpoint(1)
+
+        index = self.store.endpoint_index
+        assert self.store.find_endpoint("GET", "/users") is None
+        assert self.store.find_endpoint("GET", "/accounts") == 0
+        assert self.store.find_endpoint("GET", "/orders") == 1
+        assert index.named("Orders") == [1]
+
+        # Replacing the list directly is picked up on the next lookup
+        self.store.spec["endpoints"] = [{"name": "Only", "method": "GET", "path": "/only"}]
+        assert self.store.find_endpoint("GET", "/only") == 0
+
+    def test_merge_endpoints(self):
+        """Test merging re-imported endpoints into the spec"""
+        self.store.set_endpoints([("Users", "GET", "/users")])
+
+        with patch.object(self.store, "specChanged") as mock_signal:
+            added, updated = self.store.merge_endpoints([
+                {"name": "Users", "method": "GET", "path": "/users", "expect": {"guest": {"status": 403}}},
+                {"name": "Orders", "method": "GET", "path": "/orders"},
+            ])
+            mock_signal.emit.assert_called_once()
+
+        assert (added, updated) == (1, 1)
+        assert self.store.spec["endpoints"][0]["expect"] == {"guest": {"status": 403}}
+        assert self.store.find_endpoint("GET", "/orders") == 1
+
     def test_export_as_authmatrix(self):
         """Test exporting as AuthMatrix format"""
         self.store.spec["base_url"] = "https://api.test.com"
@@ -132,20 +132,57 @@ class TestSpinnerWidget:
         spinner.stop()
 
 
+class TestSpinnerClock:
+    """Test the shared animation clock and frame atlas"""
+
+    def test_clock_runs_only_while_subscribed(self, qtbot):
+        """Test that one timer serves every subscriber and stops when idle"""
+        from UI.components.SpinnerWidget import SpinnerClock
+
+        clock = SpinnerClock()
+        frames_a, frames_b = [], []
+        clock.subscribe(frames_a.append)
+        clock.subscribe(frames_b.append)
+        assert clock.isRunning()
+
+        qtbot.wait(200)
+        clock.unsubscribe(frames_a.append)
+        assert clock.isRunning()
+        clock.unsubscribe(frames_b.append)
+        assert not clock.isRunning()
+
+        assert frames_a and frames_a == frames_b[:len(frames_a)]
+
+    def test_shared_clock_is_a_singleton(self, qtbot):
+        """Test that every view gets the same clock"""
+        from UI.components.SpinnerWidget import SpinnerClock
+
+        assert SpinnerClock.shared() is SpinnerClock.shared()
+
+    def test_atlas_is_rendered_once(self, qtbot):
+        """Test that the frame atlas holds every frame and is cached"""
+        from UI.components.SpinnerWidget import FRAME_COUNT, spinner_atlas
+
+        atlas = spinner_atlas(16)
+        assert atlas.width() == 16 * FRAME_COUNT
+        assert atlas.height() == 16
+        assert spinner_atlas(16) is atlas
+
+
 class TestResultsSectionWithSpinner:
     """Test Results section with spinner integration"""
     
     def test_results_section_init(self, qtbot):
-        """Test ResultsSection initialization with spinner tracking"""
+        """Test ResultsSection initialization with an idle spinner delegate"""
         from UI.views.Results import ResultsSection
+        from UI.components.SpinnerWidget import SpinnerDelegate
         
         results = ResultsSection()
         qtbot.addWidget(results)
         
         assert results is not None
-        assert hasattr(results, '_spinners')
-        assert isinstance(results._spinners, dict)
-        assert len(results._spinners) == 0
+        assert isinstance(results.table.itemDelegate(), SpinnerDelegate)
+        assert not results.is_animating()
     
     def test_results_render_with_pending_status(self, qtbot):
         """Test rendering results with pending (spinner) status"""
@@ -169,17 +206,15 @@ class TestResultsSectionWithSpinner:
         qtbot.wait(50)
         
         # Verify table structure
-        assert results.table.rowCount() == 1
-        assert results.table.columnCount() == 3  # Endpoint + 2 roles
-        
-        # Verify spinners were created
-        assert len(results._spinners) == 2  # One for each role
-        assert (0, 1) in results._spinners  # admin column
-        assert (0, 2) in results._spinners  # user column
-        
-        # Verify spinners are running
-        for spinner in results._spinners.values():
-            assert spinner.isRunning()
+        assert results.model.rowCount() == 1
+        assert results.model.columnCount() == 3  # Endpoint + 2 roles
+        
+        # Verify both role cells are pending and animated by the shared clock
+        assert results.model.pending_count == 2
+        assert results.model.is_pending(results.model.index(0, 1))  # admin column
+        assert results.model.is_pending(results.model.index(0, 2))  # user column
+        assert results.is_animating()
+        assert results.table.indexWidget(results.model.index(0, 1)) is None
     
     def test_results_update_replaces_spinner(self, qtbot):
         """Test that updating a result replaces the spinner with actual result"""
@@ -201,7 +236,7 @@ class TestResultsSectionWithSpinner:
         qtbot.wait(50)
         
         # Verify spinner exists
-        assert (0, 1) in results._spinners
+        assert results.model.is_pending(results.model.index(0, 1))
         
         # Update with actual result
         results.update_result("GET /api/users", "admin", {
@@ -212,17 +247,17 @@ class TestResultsSectionWithSpinner:
         qtbot.wait(50)
         
         # Verify spinner was removed
-        assert (0, 1) not in results._spinners
+        assert not results.model.is_pending(results.model.index(0, 1))
+        assert results.is_animating()  # user cell is still pending
         
         # Verify result is displayed
-        item = results.table.item(0, 1)
-        assert item is not None
-        assert "✅" in item.text()
-        assert "200" in item.text()
-        assert "45ms" in item.text()
+        text = results.model.index(0, 1).data()
+        assert "✅" in text
+        assert "200" in text
+        assert "45ms" in text
     
     def test_results_cleanup_spinners(self, qtbot):
-        """Test that spinners are properly cleaned up"""
+        """Test that the clock is released once nothing is pending"""
         from UI.views.Results import ResultsSection
         
         results = ResultsSection()
@@ -238,19 +273,28 @@ class TestResultsSectionWithSpinner:
         # Render with pending status
         results.render(test_results)
         qtbot.wait(50)
-        
-        # Verify spinner exists and is running
-        assert len(results._spinners) == 1
-        spinner = list(results._spinners.values())[0]
-        assert spinner.isRunning()
+        assert results.is_animating()
         
         # Clear the table (simulating a new render)
         results.render({})
         qtbot.wait(50)
         
-        # Verify spinner was cleaned up
-        assert len(results._spinners) == 0
-        assert not spinner.isRunning()
+        # Verify the view stopped following the clock
+        assert results.model.pending_count == 0
+        assert not results.is_animating()
+
+    def test_results_stop_animating_when_last_result_arrives(self, qtbot):
+        """Test that streaming the last result releases the clock"""
+        from UI.views.Results import ResultsSection
+
+        results = ResultsSection()
+        qtbot.addWidget(results)
+        results.render({"GET /api/users": {"admin": {"status": "⏳"}}})
+
+        results.update_results([("GET /api/users", "admin", {"status": "FAIL", "http": 403})])
+
+        assert not results.is_animating()
+        assert results.model.index(0, 1).data() == "❌ 403"
     
     def test_results_mixed_status(self, qtbot):
         """Test rendering with mixed status (pending, pass, fail, skip)"""
@@ -277,19 +321,17 @@ class TestResultsSectionWithSpinner:
         results.render(test_results)
         qtbot.wait(50)
         
-        # Verify spinners were created only for pending status
-        assert len(results._spinners) == 2
-        assert (0, 1) in results._spinners  # Row 0 (users), Col 1 (admin)
-        assert (1, 3) in results._spinners  # Row 1 (admin), Col 3 (guest)
+        # Verify spinners are painted only for pending status
+        assert results.model.pending_count == 2
+        assert results.model.is_pending(results.model.index(0, 1))  # Row 0 (users), Col 1 (admin)
+        assert results.model.is_pending(results.model.index(1, 3))  # Row 1 (admin), Col 3 (guest)
         
-        # Verify non-pending results are displayed as items
-        user_item = results.table.item(0, 2)  # user for /api/users
-        assert user_item is not None
-        assert "✅" in user_item.text()
+        # Verify non-pending results are displayed as text
+        user_text = results.model.index(0, 2).data()  # user for /api/users
+        assert "✅" in user_text
         
-        skip_item = results.table.item(1, 2)  # user for /api/admin
-        assert skip_item is not None
-        assert "⏭️" in skip_item.text()
+        skip_text = results.model.index(1, 2).data()  # user for /api/admin
+        assert "⏭️" in skip_text
 
 
 if __name__ == "__main__":
@@ -222,7 +222,119 @@ class TestEndpointsSection:
         endpoints = EndpointsSection(store)
         qtbot.addWidget(endpoints)
         assert endpoints is not None
+
+    def test_endpoints_table_is_model_backed(self, qtbot):
+        """Test that rows come from the model without per-row cell widgets"""
+        from UI.views.Endpoints import EndpointsSection
+        from UI.views.SpecStore import SpecStore
+        from PySide6 import QtCore
+
+        store = SpecStore()
+        long_path = "/api/" + "segment/" * 10
+        store.spec["endpoints"] = [
+            {"name": "Users", "method": "GET", "path": "/users",
+             "expect": {"admin": {"status": 200}, "user": {"status": 200}, "guest": {"status": 401}}},
+            {"name": "Long", "method": "POST", "path": long_path},
+        ]
+        endpoints = EndpointsSection(store)
+        qtbot.addWidget(endpoints)
+        endpoints.refresh()
+        model = endpoints.model
+
+        assert model.rowCount() == 2
+        assert model.index(0, 3).data() == "Status 200 [admin, user] • Status 401 [guest]"
+        assert model.index(1, 3).data() == "Not configured"
+        assert model.index(1, 2).data().endswith("...")
+        assert model.index(1, 2).data(QtCore.Qt.ToolTipRole) == long_path
+        assert endpoints.table.indexWidget(model.index(0, 4)) is None
+
+    def test_action_buttons_request_edit_and_delete(self, qtbot):
+        """Test that clicks on the painted buttons are routed to the row"""
+        from UI.views.Endpoints import ActionsDelegate, EndpointsModel
+        from UI.views.SpecStore import SpecStore
+        from PySide6 import QtCore, QtGui, QtWidgets
+
+        store = SpecStore()
+        store.spec["endpoints"] = [{"name": f"E{i}", "method": "GET", "path": f"/{i}"} for i in range(3)]
+        table = QtWidgets.QTableView()
+        qtbot.addWidget(table)
+        model = EndpointsModel(store, table)
+        table.setModel(model)
+        actions = ActionsDelegate(table)
+        table.setItemDelegateForColumn(EndpointsModel.ACTIONS, actions)
+        table.setColumnWidth(EndpointsModel.ACTIONS, 150)
+        table.verticalHeader().setDefaultSectionSize(60)
+        table.resize(900, 400)
+        requests = []
+        actions.editRequested.connect(lambda row: requests.append(("edit", row)))
+        actions.deleteRequested.connect(lambda row: requests.append(("delete", row)))
+
+        index = model.index(1, EndpointsModel.ACTIONS)
+        option = QtWidgets.QStyleOptionViewItem()
+        option.rect = table.visualRect(index)
+        edit_rect, delete_rect = actions._button_rects(option.rect)
+        for target in (edit_rect, delete_rect):
+            for kind in (QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseButtonRelease):
+                event = QtGui.QMouseEvent(
+                    kind, QtCore.QPointF(target.center()), QtCore.QPointF(target.center()),
+                    QtCore.Qt.LeftButton, QtCore.Qt.LeftButton, QtCore.Qt.NoModifier,
+                )
+                actions.editorEvent(event, model, option, index)
+
+        assert requests == [("edit", 1), ("delete", 1)]
     
+    def test_model_follows_row_level_changes(self, qtbot):
+        """Test that store edits insert, remove and refresh single rows"""
+        from UI.views.Endpoints import EndpointsModel
+        from UI.views.SpecStore import SpecStore
+
+        store = SpecStore()
+        store.set_endpoints([(f"E{i}", "GET", f"/{i}") for i in range(3)])
+        model = EndpointsModel(store)
+        events = []
+        model.modelReset.connect(lambda: events.append("reset"))
+        model.rowsInserted.connect(lambda parent, first, last: events.append(("inserted", first)))
+        model.rowsRemoved.connect(lambda parent, first, last: events.append(("removed", first)))
+        model.dataChanged.connect(lambda tl, br: events.append(("changed", tl.row(), br.row())))
+
+        store.set_endpoint_expectation(2, "guest", status=200)
+        assert model.index(2, 3).data() == "Status 200 [guest]"
+        store.add_endpoint("New", "POST", "/new")
+        store.delete_endpoint(0)
+        store.set_endpoint_expectation(1, "guest", status=401)
+
+        assert events == [("changed", 2, 2), ("inserted", 3), ("removed", 0), ("changed", 1, 1)]
+        assert model.rowCount() == 3
+        assert model.index(1, 3).data() == "Status 401 [guest]"
+        assert model.index(2, 0).data() == "New"
+
+    def test_editing_a_row_notifies_once(self, qtbot):
+        """Test that saving the edit dialog reports one consolidated change"""
+        from unittest.mock import patch
+        from UI.views.Endpoints import EndpointsSection
+        from UI.views.SpecStore import SpecStore
+        from PySide6 import QtWidgets
+
+        store = SpecStore()
+        store.add_endpoint("Users", "GET", "/users", expect={"guest": {"status": 401}})
+        endpoints = EndpointsSection(store)
+        qtbot.addWidget(endpoints)
+        changes = []
+        store.specChanged.connect(lambda: changes.append("spec"))
+        store.endpointUpdated.connect(lambda row: changes.append(("updated", row)))
+
+        def accept(dialog):
+            dialog.findChild(QtWidgets.QLineEdit).setText("All users")
+            dialog.findChild(QtWidgets.QDialogButtonBox).button(QtWidgets.QDialogButtonBox.Ok).click()
+            return dialog.result()
+
+        with patch.object(QtWidgets.QDialog, "exec", accept):
+            endpoints._edit_endpoint_row(0)
+
+        assert changes == [("updated", 0), "spec"]
+        assert store.spec["endpoints"][0]["name"] == "All users"
+        assert store.spec["endpoints"][0]["expect"] == {"guest": {"status": 401}}
+
     def test_configure_all_endpoints_dialog_full_width(self, qtbot):
         """Test ConfigureAllEndpointsDialog uses full-width sizing"""
         from UI.views.Endpoints import ConfigureAllEndpointsDialog
@@ -278,6 +390,219 @@ class TestResultsSection:
         qtbot.addWidget(results)
         assert results is not None
 
+    def test_update_result_uses_current_render(self, qtbot):
+        """Test that updates land in the right cell after the matrix changes"""
+        from UI.views.Results import ResultsSection
+
+        results = ResultsSection()
+        qtbot.addWidget(results)
+        results.render({"Old": {"admin": {"status": "SKIP"}}})
+        results.render({
+            "Users": {"guest": {"status": "⏳"}, "admin": {"status": "⏳"}},
+            "Orders": {"guest": {"status": "⏳"}, "admin": {"status": "⏳"}},
+        })
+
+        results.update_result("Orders", "admin", {"status": "PASS", "http": 200})
+        results.update_result("Old", "admin", {"status": "PASS", "http": 200})
+
+        assert results.model.index(1, 2).data() == "✅ 200"
+        assert results.model.index(0, 2).data() == ""
+        assert not results.model.is_pending(results.model.index(1, 2))
+
+    def test_batch_signals_one_bounding_range(self, qtbot):
+        """Test that a batch of results repaints through a single dataChanged"""
+        from UI.views.Results import ResultsSection
+
+        results = ResultsSection()
+        qtbot.addWidget(results)
+        results.render({
+            name: {"guest": {"status": "⏳"}, "user": {"status": "⏳"}, "admin": {"status": "⏳"}}
+            for name in ("A", "B", "C", "D")
+        })
+        changed = []
+        results.model.dataChanged.connect(lambda top, bottom: changed.append(
+            (top.row(), top.column(), bottom.row(), bottom.column())))
+
+        results.update_results([
+            ("B", "user", {"status": "PASS", "http": 200}),
+            ("D", "guest", {"status": "PASS", "http": 200}),
+            ("Missing", "admin", {"status": "PASS", "http": 200}),
+            ("C", "user", {"status": "FAIL", "http": 500}),
+        ])
+        results.update_results([])
+
+        assert changed == [(1, 1, 3, 2)]
+        assert results.model.index(3, 1).data() == "✅ 200"
+        assert results.model.pending_count == 9
+
+    def test_stop_pending_ends_the_animation(self, qtbot):
+        """Test that cells left pending by a stopped run stop spinning"""
+        from UI.views.Results import ResultsSection, STOPPED
+
+        results = ResultsSection()
+        qtbot.addWidget(results)
+        results.render({"Users": {"guest": {"status": "⏳"}, "admin": {"status": "⏳"}}})
+        results.update_result("Users", "guest", {"status": "PASS", "http": 200})
+        assert results.is_animating()
+
+        results.stop_pending()
+
+        assert not results.is_animating()
+        assert results.model.pending_count == 0
+        assert results.model.status_at(0, 2) == STOPPED
+        assert results.model.index(0, 2).data() == "⏹️"
+        assert results.model.index(0, 1).data() == "✅ 200"
+
+    def test_model_only_signals_changed_cells(self, qtbot):
+        """Test that a streamed result repaints exactly one cell"""
+        from PySide6 import QtCore
+        from UI.views.Results import ResultsModel, PASS
+
+        model = ResultsModel()
+        model.set_matrix({
+            "Users": {"guest": {"status": "⏳"}, "admin": {"status": "⏳"}},
+            "Orders": {"guest": {"status": "SKIP"}, "admin": {"status": "FAIL", "error": "refused"}},
+        })
+        changed = []
+        model.dataChanged.connect(lambda top, bottom: changed.append(
+            (top.row(), top.column(), bottom.row(), bottom.column())))
+
+        model.set_result(0, 1, {"status": "PASS", "http": 200, "latency_ms": 7})
+
+        assert changed == [(0, 1, 0, 1)]
+        assert model.status_at(0, 1) == PASS
+        assert model.index(0, 1).data() == "✅ 200  7ms"
+        assert model.index(1, 1).data() == "⏭️"
+        assert model.index(1, 2).data(QtCore.Qt.ToolTipRole) == "refused"
+        assert model.pending_count == 1
+        assert model.headerData(2, QtCore.Qt.Horizontal) == "admin"
+
+
+class TestResultBridge:
+    """Test push-based delivery of worker results"""
+
+    def test_messages_are_delivered_without_polling(self, qtbot):
+        """Test that queued messages reach the GUI thread and exit is reported"""
+        import queue
+        from UI.UI import ResultBridge
+
+        result_queue, error_queue = queue.Queue(), queue.Queue()
+        bridge = ResultBridge(result_queue, error_queue, processes=[])
+        received, exited = [], []
+        bridge.messageReceived.connect(received.append)
+        bridge.workersExited.connect(lambda: exited.append(True))
+
+        result_queue.put(("RESULT", "Users", "admin", {"status": "PASS"}))
+        result_queue.put(("DONE", None, None, None))
+        bridge.start()
+        for _ in range(100):
+            if exited:
+                break
+            qtbot.wait(20)
+        bridge.stop()
+
+        assert received == [
+            ("RESULT", "Users", "admin", {"status": "PASS"}),
+            ("DONE", None, None, None),
+        ]
+        assert exited == [True]
+
+    def test_worker_error_is_reported(self, qtbot):
+        """Test that an error from a worker ends delivery"""
+        import queue
+        from UI.UI import ResultBridge
+
+        result_queue, error_queue = queue.Queue(), queue.Queue()
+        error_queue.put("boom")
+        bridge = ResultBridge(result_queue, error_queue, processes=[])
+        errors = []
+        bridge.workerFailed.connect(errors.append)
+
+        bridge.start()
+        for _ in range(100):
+            if errors:
+                break
+            qtbot.wait(20)
+        bridge.stop()
+
+        assert errors == ["boom"]
+
+    def test_other_jobs_are_ignored(self, qtbot):
+        """Test that a pool bridge only delivers its own job's messages"""
+        import queue
+        from UI.UI import ResultBridge
+
+        result_queue, error_queue = queue.Queue(), queue.Queue()
+        error_queue.put((1, "stale failure"))
+        result_queue.put((1, ("DONE", None, None, None)))
+        result_queue.put((2, ("DONE", None, None, None)))
+        bridge = ResultBridge(result_queue, error_queue, processes=[], job_id=2)
+        received, errors, exited = [], [], []
+        bridge.messageReceived.connect(received.append)
+        bridge.workerFailed.connect(errors.append)
+        bridge.workersExited.connect(lambda: exited.append(True))
+
+        bridge.start()
+        for _ in range(100):
+            if exited:
+                break
+            qtbot.wait(20)
+        bridge.stop()
+
+        assert received == [("DONE", None, None, None)]
+        assert errors == []
+
+    def test_killed_pool_worker_fails_the_run(self, qtbot):
+        """Test that one dead pool worker is reported while the others live on"""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from UI.UI import ResultBridge
+        from core.WorkerPool import WorkerPool
+
+        release = threading.Event()
+
+        class SlowHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                release.wait(10)
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        spec = {
+            "base_url": f"http://127.0.0.1:{server.server_address[1]}",
+            "roles": {"guest": {"auth": {"type": "none"}}},
+            "endpoints": [
+                {"name": f"e{i}", "method": "GET", "path": f"/e{i}", "expect": {"guest": {"status": 200}}}
+                for i in range(4)
+            ],
+        }
+        pool = WorkerPool(2)
+        try:
+            job_id = pool.submit(spec, [(0, 2), (2, 4)])
+            bridge = ResultBridge(pool.result_queue, pool.error_queue, pool.processes, job_id=job_id)
+            received, errors = [], []
+            bridge.messageReceived.connect(received.append)
+            bridge.workerFailed.connect(errors.append)
+            bridge.start()
+            qtbot.waitUntil(lambda: len(received) == 2, timeout=10000)  # both READY
+
+            pool.processes[0].kill()
+            qtbot.waitUntil(lambda: errors, timeout=10000)
+            bridge.stop()
+
+            assert "exited unexpectedly" in errors[0]
+            assert pool.processes[1].is_alive()
+        finally:
+            release.set()
+            pool.close()
+            server.shutdown()
+            server.server_close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
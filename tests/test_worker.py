@@ -0,0 +1,93 @@
+"""
+Test suite for the pool worker entry point
+"""
+
+import pytest
+import sys
+import os
+import multiprocessing
+import queue
+import subprocess
+import time
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.SharedSpec import SharedSpec
+from core.Worker import pool_worker_function, worker_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EMPTY_SPEC = {"base_url": "http://127.0.0.1:9", "roles": {}, "endpoints": []}
+
+
+def run_jobs(jobs, started_at=None):
+    """Run pool_worker_function in-process over ``jobs`` and return its queues"""
+    job_queue, result_queue, error_queue = queue.Queue(), queue.Queue(), queue.Queue()
+    for job in jobs:
+        job_queue.put(job)
+    job_queue.put(None)
+    pool_worker_function(job_queue, result_queue, error_queue, multiprocessing.Value("q", 0), started_at)
+    return result_queue, error_queue
+
+
+class TestPoolWorker:
+    """Test the worker's messages and bootstrap"""
+
+    def test_ready_reports_startup_with_the_first_job_only(self):
+        with SharedSpec(EMPTY_SPEC) as shared:
+            result_queue, error_queue = run_jobs(
+                [(1, shared.handle, None), (2, shared.handle, None)], started_at=time.time() - 0.25
+            )
+
+        job_id, (kind, _, _, startup) = result_queue.get_nowait()
+        assert (job_id, kind) == (1, "READY")
+        assert 0.25 <= startup < 5
+        assert [result_queue.get_nowait() for _ in range(2)] == [
+            (1, ("DONE", None, None, None)),
+            (2, ("DONE", None, None, None)),
+        ]
+        assert error_queue.empty()
+
+    def test_no_ready_without_start_time(self):
+        with SharedSpec(EMPTY_SPEC) as shared:
+            result_queue, _ = run_jobs([(1, shared.handle, None)])
+        assert result_queue.get_nowait() == (1, ("DONE", None, None, None))
+
+    def test_cancelled_job_is_skipped(self):
+        with SharedSpec(EMPTY_SPEC) as shared:
+            job_queue, result_queue, error_queue = queue.Queue(), queue.Queue(), queue.Queue()
+            job_queue.put((1, shared.handle, None))
+            job_queue.put(None)
+            pool_worker_function(job_queue, result_queue, error_queue, multiprocessing.Value("q", 1))
+
+        assert result_queue.get_nowait() == (1, ("STOPPED", None, None, None))
+
+    def test_worker_process_round_trip(self):
+        context = worker_context()
+        job_queue, result_queue, error_queue = context.Queue(), context.Queue(), context.Queue()
+        cancelled = context.Value("q", 0)
+        with SharedSpec(EMPTY_SPEC) as shared:
+            job_queue.put((1, shared.handle, None))
+            job_queue.put(None)
+            process = context.Process(
+                target=pool_worker_function,
+                args=(job_queue, result_queue, error_queue, cancelled, time.time()),
+            )
+            process.start()
+            try:
+                assert result_queue.get(timeout=30)[1][0] == "READY"
+                assert result_queue.get(timeout=30)[1][0] == "DONE"
+            finally:
+                process.join(timeout=10)
+
+    def test_entry_point_does_not_import_gui(self):
+        code = "import sys, core.Worker; print('PySide6' in sys.modules or 'UI' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,166 @@
+"""
+Test suite for the persistent worker pool
+"""
+
+import pytest
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the parent directory to the path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Executor import count_cells, split_cell_ranges
+from core.ResultBatch import result_keys, unpack_results
+from core.WorkerPool import WorkerPool
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    """Answers 200 with keep-alive and records client connections"""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def do_GET(self):
+        OkHandler.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    OkHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(2)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def spec(server_url):
+    """Twenty endpoints on the test server that guest may call"""
+    return {
+        "base_url": server_url,
+        "roles": {"guest": {"auth": {"type": "none"}}},
+        "endpoints": [
+            {"name": f"Endpoint {i}", "method": "GET", "path": f"/ep/{i}", "expect": {"guest": {"status": 200}}}
+            for i in range(20)
+        ],
+    }
+
+
+def collect(pool, job_id, slices):
+    """Messages of one job until every slice has finished"""
+    messages = []
+    finished = 0
+    while finished < slices:
+        msg_job, message = pool.result_queue.get(timeout=30)
+        assert msg_job == job_id
+        messages.append(message)
+        finished += message[0] in ("DONE", "STOPPED")
+    return messages
+
+
+def passed_cells(spec, messages):
+    names, roles = result_keys(spec)
+    return sorted(
+        (name, role)
+        for kind, _, _, entries in messages if kind == "BATCH"
+        for name, role, cell in unpack_results(entries, names, roles)
+        if cell["status"] == "PASS"
+    )
+
+
+class TestWorkerPool:
+    """Test job submission, reuse across runs and shutdown"""
+
+    def test_workers_start_lazily_and_are_reused(self, pool, spec):
+        ranges = split_cell_ranges(count_cells(spec), 2)
+        assert pool.processes == []
+
+        first = pool.submit(spec, ranges)
+        first_messages = collect(pool, first, len(ranges))
+        workers = list(pool.processes)
+        second = pool.submit(spec, ranges)
+        second_messages = collect(pool, second, len(ranges))
+
+        assert second > first
+        assert pool.processes == workers
+        assert [kind for kind, *_ in first_messages].count("READY") == 2
+        assert "READY" not in [kind for kind, *_ in second_messages]
+        expected = [(f"Endpoint {i}", "guest") for i in range(20)]
+        assert passed_cells(spec, first_messages) == sorted(expected)
+        assert passed_cells(spec, second_messages) == sorted(expected)
+
+    def test_connections_are_kept_between_jobs(self, spec):
+        with WorkerPool(1) as pool:
+            collect(pool, pool.submit(spec, [None]), 1)
+            opened = len(OkHandler.connections)
+            collect(pool, pool.submit(spec, [None]), 1)
+
+        assert len(OkHandler.connections) == opened
+
+    def test_cancelled_job_reports_stopped(self, pool, spec):
+        # Cancelled while the workers are still starting up
+        job_id = pool.submit(spec, [(0, 3), (3, 6)])
+        pool.cancel(job_id)
+        messages = collect(pool, job_id, 2)
+
+        assert [kind for kind, *_ in messages].count("STOPPED") == 2
+        assert passed_cells(spec, messages) == []
+
+    def test_spec_is_shared_once_per_spec_object(self, pool, server_url):
+        spec = {
+            "base_url": server_url,
+            "roles": {"guest": {"auth": {"type": "none"}}},
+            "endpoints": [
+                {"name": f"Endpoint {i}", "method": "GET", "path": f"/ep/{i}", "expect": {"guest": {"status": 200}}}
+                for i in range(6)
+            ],
+        }
+        collect(pool, pool.submit(spec, [None]), 1)
+        first_path = pool._shared.handle.path
+
+        collect(pool, pool.submit(spec, [None]), 1)
+        assert pool._shared.handle.path == first_path
+
+        changed = dict(spec, endpoints=spec["endpoints"][:2])
+        messages = collect(pool, pool.submit(changed, [None]), 1)
+        assert pool._shared.handle.path != first_path
+        assert not os.path.exists(first_path)
+        assert passed_cells(changed, messages) == [("Endpoint 0", "guest"), ("Endpoint 1", "guest")]
+
+    def test_close_stops_workers(self, spec):
+        pool = WorkerPool(2)
+        collect(pool, pool.submit(spec, [None]), 1)
+        workers = list(pool.processes)
+
+        pool.close()
+
+        assert not any(process.is_alive() for process in workers)
+        assert pool.processes == [] and pool.result_queue is None
+        assert pool._shared is None
+        pool.close()  # closing twice is harmless
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            WorkerPool(0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])